@@ -0,0 +1,305 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from csv import DictReader, DictWriter
+from glob import has_magic, iglob
+from hashlib import blake2b
+from json import dumps, loads
+from os import cpu_count, walk
+from os.path import isdir, isfile, join, splitext
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp')
+
+FIELDS = ('path', 'hash', 'words', 'wpm', 'time_saved_minutes', 'value_saved', 'cost_savings', 'error')
+
+
+def is_image(name):
+    return splitext(name)[1].lower() in IMAGE_EXTENSIONS
+
+
+def iter_images(sources):
+    """
+    Yield image paths from directories (walked recursively, in sorted
+    order), glob patterns (image files only) and plain file paths, without
+    listing everything up front.
+    """
+    for source in sources:
+        if isdir(source):
+            for directory, subdirectories, files in walk(source):
+                subdirectories.sort()
+                for name in sorted(files):
+                    if is_image(name):
+                        yield join(directory, name)
+        elif has_magic(source):
+            for path in iglob(source, recursive=True):
+                if isfile(path) and is_image(path):
+                    yield path
+        else:
+            yield source
+
+
+def file_digest(path):
+    """
+    Content hash of a file, so a renamed or copied screenshot is still
+    recognized as processed.
+    """
+    digest = blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    Append-only list of content hashes that were processed successfully.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hashes = set()
+        try:
+            with open(path, 'r') as f:
+                self.hashes = {line.strip() for line in f if line.strip()}
+        except FileNotFoundError:
+            pass
+        self.file = open(path, 'a')
+
+    def __contains__(self, digest):
+        return digest in self.hashes
+
+    def add(self, digest):
+        self.hashes.add(digest)
+        self.file.write(digest + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ResultWriter:
+    """
+    Appends result rows to a JSONL or CSV file as they arrive.
+    """
+
+    def __init__(self, path, format='jsonl'):
+        if format not in ('jsonl', 'csv'):
+            raise ValueError(f"Unknown output format: {format}")
+
+        self.path = path
+        self.format = format
+        self.file = open(path, 'a', newline='')
+        if format == 'csv':
+            self.writer = DictWriter(self.file, FIELDS)
+            # Resumed runs append to the existing table
+            if self.file.tell() == 0:
+                self.writer.writeheader()
+
+    def write(self, row):
+        if self.format == 'csv':
+            self.writer.writerow(row)
+        else:
+            self.file.write(dumps(row) + "\n")
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_results(path, format='jsonl'):
+    """
+    Stream the rows of a results file back, one at a time.
+    """
+    with open(path, 'r', newline='') as f:
+        if format == 'csv':
+            for row in DictReader(f):
+                yield {key: (None if value == '' else value) for key, value in row.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield loads(line)
+
+
+# Per-process state, set up once by init_worker
+_worker = {}
+
+
+def init_worker(settings, crop, backend, preprocess, templates):
+    from ocr_extractor import OCRExtractor
+    from calculator import SavingsCalculator
+
+    recognizer = None
+    if templates:
+        from digit_recognizer import DigitRecognizer
+        # Workers learn in memory only; concurrent saves would clobber the file
+        recognizer = DigitRecognizer(templates, autosave=False)
+
+    _worker['settings'] = settings
+    _worker['extractor'] = OCRExtractor(backend=backend, preprocess=preprocess, recognizer=recognizer)
+    _worker['calculator'] = SavingsCalculator()
+    if crop:
+        from window_capture import WindowCapture
+        _worker['capture'] = WindowCapture()
+
+
+def process_image(path, digest):
+    """
+    Crop, OCR and calculate one screenshot inside a worker process.
+    Return: result row dict (error is set when the image couldn't be read)
+    """
+    from PIL.Image import open
+
+    row = dict.fromkeys(FIELDS)
+    row.update(path=path, hash=digest)
+    try:
+        with open(path) as image:
+            image = image.convert('RGB')
+        if 'capture' in _worker:
+            image = _worker['capture'].capture_top_right_region(image)
+
+        words, wpm = _worker['extractor'].extract_metrics(image)
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        return row
+
+    if words is None or not wpm:
+        row['error'] = "metrics not found"
+        return row
+
+    settings = _worker['settings']
+    summary = _worker['calculator'].calculate_complete_savings(
+        words,
+        wpm,
+        settings['typing_wpm'],
+        settings['subscription_type'],
+        settings['hourly_rate'],
+        settings['daily_words'],
+    )['summary']
+    row.update(
+        words=words,
+        wpm=wpm,
+        time_saved_minutes=summary['time_saved_minutes'],
+        value_saved=summary['time_saved_minutes'] * settings['hourly_rate'] / 60,
+        cost_savings=summary['cost_savings'],
+    )
+    return row
+
+
+def summarize(rows):
+    """
+    Aggregate savings over result rows (failed rows are only counted).
+
+    Resumed runs retry failed images and append their rows again, so rows
+    are deduplicated by hash (path for unreadable files): an image counts
+    once, as processed if any of its rows succeeded.
+    """
+    summary = {'images': 0, 'failed': 0, 'words': 0, 'time_saved_minutes': 0.0, 'value_saved': 0.0,
+               'cost_savings': 0.0}
+    # Image -> whether it was read successfully
+    outcomes = {}
+    for row in rows:
+        image = row.get('hash') or row.get('path')
+        if row.get('error'):
+            outcomes.setdefault(image, False)
+            continue
+        if outcomes.get(image):
+            continue
+        outcomes[image] = True
+        summary['words'] += int(row['words'])
+        for key in ('time_saved_minutes', 'value_saved', 'cost_savings'):
+            summary[key] += float(row[key])
+
+    summary['images'] = sum(outcomes.values())
+    summary['failed'] = len(outcomes) - summary['images']
+    return summary
+
+
+def run_batch(sources, output, settings, format='jsonl', manifest_path=None, workers=None, crop=True,
+              backend='auto', preprocess=False, templates=None, max_pending=None, on_row=None):
+    """
+    Stream screenshots through crop -> OCR -> SavingsCalculator on a
+    process pool, appending each result to output as it completes.
+
+    Images whose content hash is in the manifest are skipped, so an
+    interrupted run picks up where it stopped. At most max_pending images
+    are in flight, which keeps memory flat however many files there are.
+    templates: optional DigitRecognizer file for the Tesseract-free path
+    Return: counts for this run (processed, skipped, failed)
+    """
+    workers = workers or cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    manifest = Manifest(manifest_path or f"{output}.manifest")
+    writer = ResultWriter(output, format)
+    counts = {'processed': 0, 'skipped': 0, 'failed': 0}
+    pending = set()
+
+    def collect(done):
+        rows = [future.result() for future in done]
+        for row in rows:
+            writer.write(row)
+            if on_row is not None:
+                on_row(row)
+
+        # Results first, then the manifest: a crash in between can only
+        # repeat a row, never lose one
+        writer.flush()
+        for row in rows:
+            if row['error']:
+                counts['failed'] += 1
+            else:
+                counts['processed'] += 1
+                manifest.add(row['hash'])
+        manifest.flush()
+
+    try:
+        with ProcessPoolExecutor(workers, initializer=init_worker,
+                                 initargs=(settings, crop, backend, preprocess, templates)) as pool:
+            for path in iter_images(sources):
+                try:
+                    digest = file_digest(path)
+                except OSError as e:
+                    # Missing or unreadable: record it and keep going
+                    row = dict.fromkeys(FIELDS)
+                    row.update(path=path, error=f"{type(e).__name__}: {e}")
+                    writer.write(row)
+                    if on_row is not None:
+                        on_row(row)
+                    counts['failed'] += 1
+                    continue
+
+                if digest in manifest:
+                    counts['skipped'] += 1
+                    continue
+
+                # Mark the hash as queued so duplicate files in this run are skipped too
+                manifest.hashes.add(digest)
+                pending.add(pool.submit(process_image, path, digest))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+
+            done, pending = wait(pending)
+            collect(done)
+    finally:
+        writer.close()
+        manifest.close()
+
+    # Failed images were never written to the manifest, so a later run retries them
+    return counts
+
+
+def format_summary(summary, counts=None):
+    output = ["📊 Batch summary"]
+    if counts is not None:
+        output.append(f"   This run: {counts['processed']:,} processed, {counts['skipped']:,} skipped "
+                      f"(already in manifest), {counts['failed']:,} failed")
+    output.extend([
+        f"   Images with metrics: {summary['images']:,} ({summary['failed']:,} failed)",
+        f"   Words: {summary['words']:,}",
+        f"   Time saved: {summary['time_saved_minutes']:,.1f} minutes ({summary['time_saved_minutes'] / 60:,.1f} hours)",
+        f"   Value of time saved: ${summary['value_saved']:,.2f}",
+        f"   Subscription-rate savings: ${summary['cost_savings']:,.4f}",
+    ])
+    return "\n".join(output)
@@ -0,0 +1,5 @@
+"""
+Standalone benchmark scripts. Run from the project root, e.g.:
+
+    python -m benchmarks.bench_batch_calculator
+"""
@@ -0,0 +1,77 @@
+from os import makedirs
+from os.path import join
+from resource import RUSAGE_SELF, getrusage
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from PIL.Image import new
+
+from batch import run_batch
+from digit_recognizer import DigitRecognizer
+from window_capture import WindowCapture
+from benchmarks.synthetic import make_corpus
+
+SETTINGS = {'typing_wpm': 90, 'subscription_type': 'student', 'hourly_rate': 50.49, 'daily_words': 500}
+
+
+def make_archive(directory, count, width=1920, height=1080):
+    """
+    Write count synthetic window screenshots with the stats where
+    WindowCapture's default box expects them.
+    Return: {file name: (words, wpm)}
+    """
+    left, top, right, bottom = WindowCapture().metrics_box(width, height)
+    truth = {}
+    for i, (crop, words, wpm) in enumerate(make_corpus(count, seed=5)):
+        screenshot = new('RGB', (width, height), (255, 255, 255))
+        screenshot.paste(crop.crop((0, 0, min(crop.width, right - left), min(crop.height, bottom - top))), (left, top))
+        name = f"shot{i:05}.png"
+        screenshot.save(join(directory, name))
+        truth[name] = (words, wpm)
+    return truth
+
+
+def train_templates(path):
+    recognizer = DigitRecognizer(path)
+    for crop, words, wpm in make_corpus(30, seed=1):
+        recognizer.learn(crop, words, wpm)
+
+
+def benchmark(count, worker_counts):
+    with TemporaryDirectory() as root:
+        archive = join(root, 'archive')
+        makedirs(archive)
+        truth = make_archive(archive, count)
+        templates = join(root, 'digits.npz')
+        train_templates(templates)
+
+        print(f"📊 Batch over {count} synthetic 1920x1080 screenshots (template recognizer, no Tesseract)")
+        for workers in worker_counts:
+            output = join(root, f'results_{workers}.jsonl')
+            misreads = []
+
+            def check(row):
+                name = row['path'].rsplit('/', 1)[-1]
+                if (row['words'], row['wpm']) != truth[name]:
+                    misreads.append(name)
+
+            start = perf_counter()
+            counts = run_batch([archive], output, SETTINGS, workers=workers, templates=templates, on_row=check)
+            elapsed = perf_counter() - start
+            print(f"   {workers} worker(s): {counts['processed'] / elapsed:>7.1f} images/s  "
+                  f"({counts['failed']} failed, {len(misreads)} misread)")
+
+            # A second run over the same archive only hashes files
+            start = perf_counter()
+            counts = run_batch([archive], output, SETTINGS, workers=workers, templates=templates)
+            print(f"   {'':<12}resume: {counts['skipped']} skipped in {(perf_counter() - start) * 1000:.0f} ms")
+
+        print(f"   Parent peak RSS: {getrusage(RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    benchmark(
+        count=int(argv[1]) if len(argv) > 1 else 200,
+        worker_counts=[int(workers) for workers in argv[2].split(',')] if len(argv) > 2 else [1, 2, 4],
+    )
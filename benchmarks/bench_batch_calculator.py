@@ -0,0 +1,66 @@
+from time import perf_counter
+from sys import argv
+import numpy as np
+
+from calculator import SavingsCalculator
+
+SUMMARY_KEYS = ('speaking_time_minutes', 'typing_time_minutes', 'time_saved_minutes', 'cost_savings',
+                'words_to_break_even', 'minutes_to_break_even', 'value_saved_per_word')
+ANNUAL_KEYS = ('daily_time_saved_minutes', 'daily_value_saved', 'annual_words', 'annual_time_saved_hours',
+               'annual_value_saved', 'annual_subscription_cost', 'net_annual_savings', 'roi_percentage')
+
+
+def make_fleet(rows, seed=0):
+    """
+    Build random columnar inputs for a fleet of users.
+    """
+    rng = np.random.default_rng(seed)
+    return {
+        'words_spoken': rng.integers(50, 5000, rows),
+        'speaking_wpm': rng.integers(60, 200, rows),
+        'typing_wpm': rng.integers(30, 130, rows),
+        'subscription_type': rng.choice(['student', 'pro_monthly', 'pro_annually'], rows),
+        'hourly_rate': rng.uniform(15, 150, rows).round(2),
+        'daily_words': rng.integers(100, 5000, rows),
+    }
+
+
+def run_loop(calculator, fleet):
+    columns = [fleet[key].tolist() for key in ('words_spoken', 'speaking_wpm', 'typing_wpm',
+                                              'subscription_type', 'hourly_rate', 'daily_words')]
+    return [calculator.calculate_complete_savings(*row) for row in zip(*columns)]
+
+
+def check_matches(loop_results, batch_results):
+    """
+    Verify the batch columns equal the scalar results row for row.
+    """
+    for i, result in enumerate(loop_results):
+        for key in SUMMARY_KEYS:
+            assert batch_results[key][i] == result['summary'][key], (i, key)
+        for key in ANNUAL_KEYS:
+            assert batch_results[key][i] == result['annual_data'][key], (i, key)
+
+
+def benchmark(rows):
+    calculator = SavingsCalculator()
+    fleet = make_fleet(rows)
+
+    start = perf_counter()
+    loop_results = run_loop(calculator, fleet)
+    loop_seconds = perf_counter() - start
+
+    start = perf_counter()
+    batch_results = calculator.calculate_batch_savings(**fleet)
+    batch_seconds = perf_counter() - start
+
+    check_matches(loop_results, batch_results)
+
+    print(f"📊 {rows:,} rows")
+    print(f"   Scalar loop: {rows / loop_seconds:>14,.0f} rows/s ({loop_seconds * 1000:.1f} ms)")
+    print(f"   Batch:       {rows / batch_seconds:>14,.0f} rows/s ({batch_seconds * 1000:.1f} ms)")
+    print(f"   Speedup:     {loop_seconds / batch_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark(int(argv[1]) if len(argv) > 1 else 100_000)
@@ -0,0 +1,37 @@
+from time import perf_counter
+from sys import argv
+
+from digit_recognizer import DigitRecognizer
+from benchmarks.synthetic import make_corpus
+
+
+def benchmark(count, train_count):
+    recognizer = DigitRecognizer()
+    # Known values stand in for frames Tesseract read successfully
+    learned = sum(recognizer.learn(image, words, wpm) for image, words, wpm in make_corpus(train_count, seed=1))
+    print(f"📊 Templates learned from {learned}/{train_count} frames (examples per digit: {recognizer.counts.tolist()})")
+
+    for scale in (1.0, 0.75, 1.5):
+        for theme in ('light', 'dark'):
+            corpus = make_corpus(count, seed=2, scales=(scale,), themes=(theme,))
+            correct = confident = confident_wrong = 0
+
+            start = perf_counter()
+            for image, words, wpm in corpus:
+                metrics, confidence = recognizer.recognize(image)
+                is_correct = metrics == (words, wpm)
+                correct += is_correct
+                if confidence >= recognizer.min_confidence:
+                    confident += 1
+                    confident_wrong += not is_correct
+            elapsed = (perf_counter() - start) / count
+
+            print(f"   scale {scale:<4} {theme:<5}  {elapsed * 1e6:6.0f} µs/crop  accuracy {correct / count * 100:5.1f}%  "
+                  f"fast path {confident / count * 100:5.1f}% (wrong but confident: {confident_wrong})")
+
+
+if __name__ == "__main__":
+    benchmark(
+        count=int(argv[1]) if len(argv) > 1 else 200,
+        train_count=int(argv[2]) if len(argv) > 2 else 30,
+    )
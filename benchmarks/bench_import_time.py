@@ -0,0 +1,58 @@
+from statistics import median
+from subprocess import DEVNULL, run
+from sys import argv, executable
+from time import perf_counter
+
+# Modules the calculator-only paths must not load
+HEAVY_MODULES = ('numpy', 'PIL', 'mss', 'pytesseract', 'pygetwindow', 'tesserocr')
+
+CALC_COMMAND = ['main.py', 'calc', '--words', '372', '--wpm', '124', '--inputs', 'computer_inputs.json']
+
+# Which heavy modules each entry point pulls in, checked in a fresh interpreter
+IMPORT_CHECK = """
+import sys
+{statement}
+print('heavy:' + ','.join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def wall_time(command, runs):
+    """
+    Median wall time of running a command in a fresh interpreter.
+    """
+    times = []
+    for _ in range(runs):
+        start = perf_counter()
+        run([executable, *command], stdout=DEVNULL, check=True)
+        times.append(perf_counter() - start)
+    return median(times)
+
+
+def heavy_imports(statement):
+    result = run([executable, '-c', IMPORT_CHECK.format(statement=statement, heavy=HEAVY_MODULES)],
+                 capture_output=True, text=True)
+    if result.returncode:
+        return f"failed ({result.stderr.strip().splitlines()[-1]})"
+    # The command's own output comes first; the module list is the last line
+    return result.stdout.rstrip('\n').rpartition('heavy:')[2] or "none"
+
+
+def benchmark(runs):
+    print(f"📊 Start-up time, median of {runs} runs")
+    interpreter = wall_time(['-c', 'pass'], runs)
+    calc = wall_time(CALC_COMMAND, runs)
+    print(f"   {'python -c pass':<28} {interpreter * 1000:>8.1f} ms")
+    print(f"   {'main.py calc':<28} {calc * 1000:>8.1f} ms  (+{(calc - interpreter) * 1000:.1f} ms over bare interpreter)")
+
+    print("📦 Heavy modules loaded")
+    for label, statement in (
+        ('import main', 'import main'),
+        ('main.py calc', "import main; main.main(" + repr(CALC_COMMAND[1:]) + ")"),
+        ('import calculator', 'import calculator'),
+        ('import ocr_extractor', 'import ocr_extractor'),
+    ):
+        print(f"   {label:<28} {heavy_imports(statement)}")
+
+
+if __name__ == "__main__":
+    benchmark(runs=int(argv[1]) if len(argv) > 1 else 10)
@@ -0,0 +1,40 @@
+from time import perf_counter
+from sys import argv
+
+from monitor import StatsMonitor
+from benchmarks.fakes import SyntheticFrameSource, FakeExtractor
+
+SETTINGS = {'typing_wpm': 90, 'subscription_type': 'student', 'hourly_rate': 50.49, 'daily_words': 500}
+
+
+def make_schedule(polls, change_every):
+    """
+    Counters that grow every change_every polls, like a day of dictation.
+    """
+    return [(372 + 25 * (i // change_every), 126) for i in range(polls)]
+
+
+def benchmark(polls, change_every, ocr_latency):
+    source = SyntheticFrameSource(make_schedule(polls, change_every), noise=3)
+    extractor = FakeExtractor(latency=ocr_latency)
+    slept = []
+    monitor = StatsMonitor(source, SETTINGS, extractor=extractor, on_result=lambda result: None, sleep=slept.append)
+
+    start = perf_counter()
+    stats = monitor.run(max_polls=polls)
+    elapsed = perf_counter() - start
+
+    print(f"📊 {polls} polls, counters change every {change_every} polls, {ocr_latency * 1000:.0f} ms per OCR")
+    print(f"   OCR runs: {extractor.calls} (without gating: {polls})")
+    print(f"   Results: {stats['results']}, unchanged frames skipped: {stats['unchanged']}")
+    print(f"   Work time: {elapsed * 1000:.1f} ms ({elapsed / polls * 1000:.2f} ms per poll)")
+    print(f"   Mean poll interval with backoff: {sum(slept) / polls:.1f} s "
+          f"(base {monitor.interval:.0f} s, max {monitor.max_interval:.0f} s)")
+
+
+if __name__ == "__main__":
+    benchmark(
+        polls=int(argv[1]) if len(argv) > 1 else 600,
+        change_every=int(argv[2]) if len(argv) > 2 else 60,
+        ocr_latency=float(argv[3]) if len(argv) > 3 else 0.02,
+    )
@@ -0,0 +1,59 @@
+from sys import argv
+from time import perf_counter
+from tracemalloc import get_traced_memory, reset_peak, start, stop
+import numpy as np
+
+from monte_carlo import MonteCarloROI
+
+SPECS = {
+    'daily_words': {'dist': 'normal', 'mean': 500, 'std': 150},
+    'speaking_wpm': {'dist': 'normal', 'mean': 125, 'std': 15},
+    'typing_wpm': {'dist': 'normal', 'mean': 90, 'std': 10},
+    'hourly_rate': {'dist': 'uniform', 'low': 30, 'high': 70},
+}
+
+
+def simulation(seed=42, chunk_size=250_000):
+    return MonteCarloROI(SPECS['daily_words'], SPECS['speaking_wpm'], SPECS['typing_wpm'], 'student',
+                         SPECS['hourly_rate'], seed=seed, chunk_size=chunk_size)
+
+
+def check_accuracy(draws):
+    """
+    Compare the streaming percentiles with np.percentile over the same
+    draws held in memory (one chunk, so both see identical samples).
+    """
+    result = simulation(chunk_size=draws).run(draws)
+    engine = simulation(chunk_size=draws)
+    rng = np.random.default_rng(engine.seed)
+    inputs = {name: sampler(rng, draws) for name, sampler in engine.samplers.items()}
+    exact = engine.calculator.calculate_batch_savings(inputs['daily_words'], inputs['speaking_wpm'],
+                                                      inputs['typing_wpm'], 'student', inputs['hourly_rate'],
+                                                      inputs['daily_words'])
+
+    print(f"🎯 Streaming vs exact percentiles, {draws:,} draws")
+    for metric in ('net_annual_savings', 'roi_percentage', 'words_to_break_even'):
+        estimated = [result['metrics'][metric][f'p{p}'] for p in (5, 50, 95)]
+        truth = np.percentile(exact[metric], [5, 50, 95])
+        error = max(abs(e - t) / max(abs(t), 1e-9) for e, t in zip(estimated, truth))
+        print(f"   {metric:<22} P5/P50/P95 {', '.join(f'{value:,.2f}' for value in estimated):<36} "
+              f"max relative error {error:.2e}")
+
+
+def benchmark(draw_counts):
+    print("📊 Monte Carlo ROI, 250k-draw chunks")
+    for draws in draw_counts:
+        start()
+        begin = perf_counter()
+        simulation().run(draws)
+        elapsed = perf_counter() - begin
+        _, peak = get_traced_memory()
+        reset_peak()
+        stop()
+        print(f"   {draws:>12,} draws  {elapsed:>7.2f} s  {draws / elapsed / 1e6:>6.2f} M draws/s  "
+              f"peak traced memory {peak / 2**20:>6.1f} MiB")
+    check_accuracy(1_000_000)
+
+
+if __name__ == "__main__":
+    benchmark([int(count) for count in argv[1].split(',')] if len(argv) > 1 else [100_000, 1_000_000, 10_000_000])
@@ -0,0 +1,43 @@
+from time import perf_counter
+from sys import argv
+
+from ocr_backends import PytesseractBackend, TesserocrBackend
+from benchmarks.synthetic import make_corpus
+
+
+def images_per_second(function, images):
+    start = perf_counter()
+    function(images)
+    return len(images) / (perf_counter() - start)
+
+
+def benchmark(count):
+    images = [image for image, _, _ in make_corpus(count)]
+    rows = []
+
+    try:
+        cold = PytesseractBackend()
+        cold.image_to_text(images[0])
+    except Exception as e:
+        print(f"❌ pytesseract unavailable ({e}); nothing to benchmark")
+        return
+
+    rows.append(("pytesseract single calls", images_per_second(lambda batch: [cold.image_to_text(i) for i in batch], images)))
+    rows.append((f"pytesseract batch ({cold.workers} workers)", images_per_second(cold.batch_to_text, images)))
+
+    try:
+        warm = TesserocrBackend()
+    except (ImportError, RuntimeError) as e:
+        print(f"ℹ️  tesserocr unavailable ({e}); skipping warm engine rows")
+    else:
+        rows.append(("tesserocr warm calls", images_per_second(lambda batch: [warm.image_to_text(i) for i in batch], images)))
+        rows.append((f"tesserocr batch ({warm.workers} workers)", images_per_second(warm.batch_to_text, images)))
+        warm.close()
+
+    print(f"📊 OCR throughput over {count} synthetic stats images")
+    for label, rate in rows:
+        print(f"   {label:<32} {rate:>8.1f} images/s")
+
+
+if __name__ == "__main__":
+    benchmark(int(argv[1]) if len(argv) > 1 else 50)
@@ -0,0 +1,80 @@
+from asyncio import run
+from time import perf_counter, sleep
+from sys import argv
+
+from calculator import SavingsCalculator
+from pipeline import CapturePipeline
+from benchmarks.fakes import SyntheticFrameSource, FakeExtractor
+
+SETTINGS = {'typing_wpm': 90, 'subscription_type': 'student', 'hourly_rate': 50.49, 'daily_words': 500}
+
+
+class SlowSource(SyntheticFrameSource):
+    """
+    Synthetic source whose grab() blocks like an mss grab.
+    """
+
+    def __init__(self, schedule, grab_latency):
+        super().__init__(schedule)
+        self.grab_latency = grab_latency
+
+    def grab(self):
+        sleep(self.grab_latency)
+        return super().grab()
+
+
+def schedule(frames):
+    return [(372 + i, 126) for i in range(frames)]
+
+
+def sequential(frames, grab_latency, ocr_latency):
+    """
+    The main.py shape: capture, then OCR, then calculate, one at a time.
+    """
+    source = SlowSource(schedule(frames), grab_latency)
+    extractor = FakeExtractor(ocr_latency)
+    calculator = SavingsCalculator()
+
+    start = perf_counter()
+    for _ in range(frames):
+        words, wpm = extractor.extract_metrics(source.grab())
+        calculator.calculate_complete_savings(words, wpm, **SETTINGS)
+    return frames / (perf_counter() - start)
+
+
+def pipelined(frames, grab_latency, ocr_latency, ocr_workers):
+    pipeline = CapturePipeline(
+        SlowSource(schedule(frames), grab_latency),
+        SETTINGS,
+        extractor_factory=lambda: FakeExtractor(ocr_latency),
+        ocr_workers=ocr_workers,
+    )
+    start = perf_counter()
+    stats = run(pipeline.run(max_frames=frames))
+    elapsed = perf_counter() - start
+    latency = sorted(result['latency'] for result in pipeline.results)
+    return stats, frames / elapsed, len(pipeline.results) / elapsed, latency[len(latency) // 2]
+
+
+def benchmark(frames, grab_latency, ocr_latency):
+    print(f"📊 {frames} frames, {grab_latency * 1000:.0f} ms per grab, {ocr_latency * 1000:.0f} ms per OCR")
+    print(f"   Sequential: {sequential(frames, grab_latency, ocr_latency):.1f} frames/s (every frame OCR'd)")
+
+    for workers in (1, 2, 4):
+        stats, capture_rate, result_rate, median_latency = pipelined(frames, grab_latency, ocr_latency, workers)
+        print(f"   Pipeline, {workers} OCR worker(s): capture {capture_rate:.1f} frames/s, "
+              f"results {result_rate:.1f}/s, median capture-to-result {median_latency * 1000:.0f} ms, "
+              f"stale frames dropped {stats['ocr']['dropped_stale']}")
+
+    print("   Stage stats (last run):")
+    for name, stage in stats.items():
+        print(f"     {name:<10} processed {stage['processed']:>4}  {stage['throughput_per_second']:>7.1f}/s  "
+              f"busy {stage['mean_busy_ms']:>6.1f} ms  max queue {stage['max_queue_depth']}")
+
+
+if __name__ == "__main__":
+    benchmark(
+        frames=int(argv[1]) if len(argv) > 1 else 100,
+        grab_latency=float(argv[2]) if len(argv) > 2 else 0.01,
+        ocr_latency=float(argv[3]) if len(argv) > 3 else 0.04,
+    )
@@ -0,0 +1,50 @@
+from time import perf_counter
+from sys import argv
+
+from ocr_backends import PytesseractBackend, tesseract_config
+from ocr_extractor import OCRExtractor
+from preprocess import STATS_WHITELIST, preprocess_stats_image
+from benchmarks.synthetic import make_corpus
+
+SCALES = (0.75, 1.0, 1.5, 2.0)
+THEMES = ('light', 'dark')
+
+
+def evaluate(extractor, corpus):
+    """
+    Return: (fraction of crops read exactly, mean ms per crop)
+    """
+    correct = 0
+    start = perf_counter()
+    for image, words, wpm in corpus:
+        correct += extractor.extract_metrics(image) == (words, wpm)
+    return correct / len(corpus), (perf_counter() - start) / len(corpus) * 1000
+
+
+def benchmark(count):
+    corpus = make_corpus(count, scales=SCALES, themes=THEMES)
+
+    start = perf_counter()
+    for image, _, _ in corpus:
+        preprocess_stats_image(image)
+    print(f"📊 {len(corpus)} synthetic crops, scales {SCALES}, themes {THEMES}")
+    print(f"   Preprocessing alone: {(perf_counter() - start) / len(corpus) * 1000:.2f} ms per crop")
+
+    try:
+        PytesseractBackend().image_to_text(corpus[0][0])
+    except Exception as e:
+        print(f"❌ tesseract unavailable ({e}); skipping accuracy comparison")
+        return
+
+    configurations = [
+        ("raw crop, --psm 6", OCRExtractor(backend=PytesseractBackend(config=tesseract_config(6)))),
+        ("preprocessed, --psm 7 + whitelist", OCRExtractor(
+            backend=PytesseractBackend(config=tesseract_config(7, STATS_WHITELIST)), preprocess=True)),
+    ]
+    for label, extractor in configurations:
+        accuracy, latency = evaluate(extractor, corpus)
+        print(f"   {label:<36} accuracy {accuracy * 100:5.1f}%  {latency:7.1f} ms per crop")
+
+
+if __name__ == "__main__":
+    benchmark(int(argv[1]) if len(argv) > 1 else 80)
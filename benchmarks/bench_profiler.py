@@ -0,0 +1,50 @@
+from time import perf_counter
+from sys import argv
+
+from profiler import PROFILER, span
+from window_capture import WindowCapture
+from benchmarks.fakes import FakeScreen, FakeWindow
+
+
+def per_call(function, iterations):
+    start = perf_counter()
+    for _ in range(iterations):
+        function()
+    return (perf_counter() - start) / iterations
+
+
+def empty_span():
+    with span('bench.empty'):
+        pass
+
+
+def benchmark(iterations):
+    print(f"📊 Span overhead, {iterations:,} calls")
+    bare = per_call(lambda: None, iterations)
+    PROFILER.disable()
+    disabled = per_call(empty_span, iterations)
+    PROFILER.enable()
+    enabled = per_call(empty_span, iterations)
+    PROFILER.reset()
+    print(f"   {'no span':<24} {bare * 1e9:>8.0f} ns")
+    print(f"   {'span, profiling off':<24} {disabled * 1e9:>8.0f} ns")
+    print(f"   {'span, profiling on':<24} {enabled * 1e9:>8.0f} ns")
+
+    screen = FakeScreen(2560, 1440)
+    window = FakeWindow(width=2560, height=1440)
+    capture = WindowCapture(screen_factory=screen, window_enumerator=lambda: [window])
+    capture.find_wisprflow_window()
+
+    frames = max(iterations // 1000, 20)
+    PROFILER.disable()
+    off = per_call(lambda: capture.capture_top_right_region(capture.capture_window()), frames)
+    PROFILER.enable()
+    on = per_call(lambda: capture.capture_top_right_region(capture.capture_window()), frames)
+    PROFILER.disable()
+
+    print(f"📊 Full-monitor capture, {frames} frames: {off * 1000:.2f} ms off, {on * 1000:.2f} ms on")
+    print(PROFILER.format_report())
+
+
+if __name__ == "__main__":
+    benchmark(iterations=int(argv[1]) if len(argv) > 1 else 200_000)
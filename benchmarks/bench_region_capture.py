@@ -0,0 +1,45 @@
+from time import perf_counter
+from sys import argv
+
+from window_capture import WindowCapture
+from benchmarks.fakes import FakeScreen, FakeWindow
+
+
+def run(label, capture_function, screen, window, iterations):
+    screen.bytes_grabbed = 0
+    window.state_changes = 0
+
+    start = perf_counter()
+    for _ in range(iterations):
+        region = capture_function()
+    elapsed = (perf_counter() - start) / iterations
+
+    print(f"   {label:<36} {elapsed * 1000:>8.2f} ms  "
+          f"{screen.bytes_grabbed / iterations / 1024:>9,.0f} KiB grabbed  "
+          f"{window.state_changes / iterations:.0f} window ops  (region {region.size[0]}x{region.size[1]})")
+
+
+def benchmark(iterations, wm_delay):
+    screen = FakeScreen(2560, 1440)
+    window = FakeWindow(width=2560, height=1440, minimized=True, wm_delay=wm_delay)
+    capture = WindowCapture(screen_factory=screen, window_enumerator=lambda: [window])
+    capture.find_wisprflow_window()
+
+    print(f"📊 Capture latency per frame, 2560x1440 fake monitor, {wm_delay * 1000:.0f} ms per window op")
+    run("full monitor + crop (current)",
+        lambda: capture.capture_top_right_region(capture.capture_window()), screen, window, iterations)
+    run("full monitor array + crop",
+        lambda: capture.capture_top_right_region(capture.capture_window_array()), screen, window, iterations)
+    run("region only, window minimized",
+        capture.capture_metrics_region, screen, window, iterations)
+
+    window.isMinimized = False
+    run("region only, window left alone",
+        capture.capture_metrics_region, screen, window, iterations)
+
+
+if __name__ == "__main__":
+    benchmark(
+        iterations=int(argv[1]) if len(argv) > 1 else 20,
+        wm_delay=float(argv[2]) if len(argv) > 2 else 0.05,
+    )
@@ -0,0 +1,95 @@
+from os.path import join
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import numpy as np
+
+from digit_recognizer import DigitRecognizer
+from frame_archive import FrameArchive, FrameArchiveWriter, ReplayCapture
+from monitor import FrameDiffer, StatsMonitor, WindowFrameSource
+from ocr_extractor import OCRExtractor
+from benchmarks.synthetic import make_corpus
+
+SETTINGS = {'typing_wpm': 90, 'subscription_type': 'student', 'hourly_rate': 50.49, 'daily_words': 500}
+
+
+def write_archive(path, count, frame_interval=0.5):
+    corpus = make_corpus(count, seed=3)
+    writer = FrameArchiveWriter(path, capacity=64)
+    for position, (image, _, _) in enumerate(corpus):
+        writer.append(image, timestamp=1_000_000 + position * frame_interval)
+    writer.close()
+    return [(words, wpm) for _, words, wpm in corpus]
+
+
+def expected_readings(truth):
+    # Consecutive identical readings are reported once by the monitor
+    return [reading for i, reading in enumerate(truth) if i == 0 or reading != truth[i - 1]]
+
+
+def replay_monitor(archive, recognizer):
+    """
+    Run StatsMonitor over the whole archive at maximum speed.
+    Return: (readings, elapsed seconds)
+    """
+    readings = []
+    monitor = StatsMonitor(
+        WindowFrameSource(ReplayCapture(archive)),
+        SETTINGS,
+        extractor=OCRExtractor(backend='pytesseract', recognizer=recognizer),
+        differ=FrameDiffer(threshold=0),
+        on_result=lambda result: readings.append((result['words'], result['wpm'])),
+        interval=0.0,
+        sleep=lambda seconds: None,
+    )
+    start = perf_counter()
+    monitor.run()
+    return readings, perf_counter() - start
+
+
+def benchmark(count):
+    with TemporaryDirectory() as root:
+        path = join(root, 'frames.wfa')
+        start = perf_counter()
+        truth = write_archive(path, count)
+        print(f"📊 Frame archive, {count} synthetic stats regions ({perf_counter() - start:.2f} s to record)")
+        archive = FrameArchive(path)
+
+        replay = ReplayCapture(archive)
+        start = perf_counter()
+        while (frame := replay.capture_metrics_array()) is not None:
+            pass
+        elapsed = perf_counter() - start
+        print(f"   {'array views (zero-copy)':<28} {count / elapsed:>12,.0f} frames/s")
+
+        replay = ReplayCapture(archive)
+        start = perf_counter()
+        while replay.capture_metrics_region() is not None:
+            pass
+        elapsed = perf_counter() - start
+        print(f"   {'PIL images':<28} {count / elapsed:>12,.0f} frames/s")
+        print(f"   view shares the mapping: {np.shares_memory(archive.frame(0), archive.frames)}")
+
+        recognizer = DigitRecognizer()
+        for image, words, wpm in make_corpus(30, seed=1):
+            recognizer.learn(image, words, wpm)
+
+        first, elapsed = replay_monitor(archive, recognizer)
+        second, _ = replay_monitor(archive, recognizer)
+        expected = expected_readings(truth)
+        print(f"   {'StatsMonitor + templates':<28} {count / elapsed:>12,.0f} frames/s  "
+              f"({'matches' if first == expected else 'DIFFERS from'} recorded values, "
+              f"{'deterministic' if first == second else 'NOT deterministic'})")
+
+        frames = min(count, 20)
+        replay = ReplayCapture(archive, speed=10.0)
+        start = perf_counter()
+        for _ in range(frames):
+            replay.capture_metrics_array()
+        expected_seconds = (archive.timestamps[frames - 1] - archive.timestamps[0]) / 10.0
+        print(f"   {'real-time pacing at 10x':<28} {perf_counter() - start:.3f} s for {frames} frames "
+              f"(recording spans {expected_seconds:.3f} s at 10x)")
+
+
+if __name__ == "__main__":
+    benchmark(count=int(argv[1]) if len(argv) > 1 else 500)
@@ -0,0 +1,92 @@
+from os.path import getsize, join
+from sys import argv
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import tracemalloc
+
+from calculator import SavingsCalculator
+from report_writer import CHUNK_SIZE, open_report, read_columnar
+from benchmarks.bench_batch_calculator import make_fleet
+
+FORMATS = (('csv', 'report.csv'), ('jsonl', 'report.jsonl'), ('columnar', 'report.wfr'))
+
+
+def write_report(path, format, rows, chunk_size=CHUNK_SIZE):
+    """
+    Calculate and stream `rows` results to a report, one chunk of
+    inputs at a time, so neither side ever holds the whole report.
+    """
+    calculator = SavingsCalculator()
+    with open_report(path, format, chunk_size, calculator) as report:
+        for start in range(0, rows, chunk_size):
+            fleet = make_fleet(min(chunk_size, rows - start), seed=start)
+            report.write_columns({**fleet, **calculator.calculate_batch_savings(**fleet)})
+    return report.rows
+
+
+def peak_memory(function, *args):
+    """
+    Return: (peak bytes allocated while running function, its result)
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        return tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def format_results_in_memory(rows):
+    """
+    The old way: every row rendered with format_results and kept in a list.
+    """
+    calculator = SavingsCalculator()
+    fleet = make_fleet(rows)
+    columns = [fleet[key].tolist() for key in ('words_spoken', 'speaking_wpm', 'typing_wpm',
+                                              'subscription_type', 'hourly_rate', 'daily_words')]
+    output = []
+    for words, speaking, typing, subscription_type, rate, daily in zip(*columns):
+        results = calculator.calculate_complete_savings(words, speaking, typing, subscription_type, rate, daily)
+        output.append(calculator.format_results(results, rate, calculator.subscription_costs[subscription_type],
+                                                words, speaking, typing, daily))
+    return len(output)
+
+
+def benchmark(rows):
+    small = max(rows // 10, 1)
+    with TemporaryDirectory() as root:
+        print(f"📊 Streaming {rows:,} result rows")
+        for format, name in FORMATS:
+            path = join(root, name)
+            start = perf_counter()
+            written = write_report(path, format, rows)
+            elapsed = perf_counter() - start
+            size = getsize(path)
+
+            small_peak, _ = peak_memory(write_report, path, format, small)
+            peak, _ = peak_memory(write_report, path, format, rows)
+            print(f"   {format:<9} {written / elapsed:>10,.0f} rows/s  {size / written:>6.1f} bytes/row  "
+                  f"peak {small_peak / 2**20:>5.1f} MiB at {small:,} rows, {peak / 2**20:>5.1f} MiB at {rows:,}")
+
+        start = perf_counter()
+        read = sum(len(chunk['words_spoken']) for chunk in read_columnar(join(root, 'report.wfr')))
+        elapsed = perf_counter() - start
+        print(f"   columnar read back {read / elapsed:>10,.0f} rows/s ({read:,} rows)")
+
+        text_rows = min(rows, 10_000)
+        start = perf_counter()
+        write_report(join(root, 'report.txt'), 'text', text_rows)
+        elapsed = perf_counter() - start
+        peak, _ = peak_memory(write_report, join(root, 'report.txt'), 'text', text_rows)
+        print(f"   text      {text_rows / elapsed:>10,.0f} rows/s  peak {peak / 2**20:.1f} MiB at {text_rows:,} rows")
+
+        start = perf_counter()
+        format_results_in_memory(text_rows)
+        elapsed = perf_counter() - start
+        peak, _ = peak_memory(format_results_in_memory, text_rows)
+        print(f"   format_results list {text_rows / elapsed:>10,.0f} rows/s  peak {peak / 2**20:.1f} MiB "
+              f"at {text_rows:,} rows (held in memory)")
+
+
+if __name__ == "__main__":
+    benchmark(rows=int(argv[1]) if len(argv) > 1 else 1_000_000)
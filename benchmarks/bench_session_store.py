@@ -0,0 +1,56 @@
+from datetime import datetime
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from sys import argv
+
+from session_store import SessionStore
+
+
+START = datetime(2025, 1, 1).timestamp()
+
+
+def minute_samples(days, start=START):
+    """
+    One cumulative snapshot per minute, with the counter reset nightly.
+    """
+    words = 0
+    for minute in range(days * 24 * 60):
+        if minute % (24 * 60) == 0:
+            words = 0
+        if 9 * 60 <= minute % (24 * 60) < 18 * 60:
+            words += 3
+        yield start + minute * 60, words, 110 + minute % 30
+
+
+def timed(label, function, repeat=100):
+    start = perf_counter()
+    for _ in range(repeat):
+        result = function()
+    print(f"   {label:<36} {(perf_counter() - start) / repeat * 1000:>8.3f} ms")
+    return result
+
+
+def benchmark(days):
+    with TemporaryDirectory() as directory:
+        store = SessionStore(join(directory, 'sessions.db'))
+
+        start = perf_counter()
+        added = store.record_many(minute_samples(days))
+        insert_seconds = perf_counter() - start
+        samples = days * 24 * 60
+
+        print(f"📊 {samples:,} minute-level samples over {days} days ({added:,} words)")
+        print(f"   Insert: {samples / insert_seconds:,.0f} samples/s ({insert_seconds:.1f} s)")
+
+        end = datetime.fromtimestamp(START + (samples - 1) * 60).date()
+        timed("daily totals for the whole range", lambda: store.totals('day'))
+        timed("weekly totals", lambda: store.totals('week'))
+        timed("monthly totals", lambda: store.totals('month'))
+        timed("30-day average daily words", lambda: store.average_daily_words(days=30, today=end))
+        timed("single record() with its own commit", lambda: store.record(5000, 120, timestamp=1e10), repeat=20)
+        store.close()
+
+
+if __name__ == "__main__":
+    benchmark(int(argv[1]) if len(argv) > 1 else 365)
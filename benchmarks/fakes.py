@@ -0,0 +1,151 @@
+from time import sleep
+import numpy as np
+
+
+class FakeScreenShot:
+    """
+    Minimal stand-in for mss.screenshot.ScreenShot.
+    """
+
+    def __init__(self, raw, width, height):
+        self.raw = raw
+        self.width = width
+        self.height = height
+
+    @property
+    def size(self):
+        return (self.width, self.height)
+
+    @property
+    def bgra(self):
+        return bytes(self.raw)
+
+
+class FakeScreen:
+    """
+    mss-like screen backed by an in-memory BGRA framebuffer.
+
+    Use as WindowCapture(screen_factory=FakeScreen(...)): calling the
+    instance returns itself as the context manager, like mss().
+    """
+
+    def __init__(self, width=2560, height=1440, framebuffer=None, seed=0, monitor_count=1):
+        """
+        monitor_count monitors of width x height are placed side by side;
+        the framebuffer covers the whole virtual screen.
+        """
+        if framebuffer is None:
+            framebuffer = np.random.default_rng(seed).integers(
+                0, 256, (height, width * monitor_count, 4), dtype=np.uint8
+            )
+        self.framebuffer = framebuffer
+        self.monitors = [{'left': 0, 'top': 0, 'width': width * monitor_count, 'height': height}] + [
+            {'left': width * i, 'top': 0, 'width': width, 'height': height} for i in range(monitor_count)
+        ]
+        self.bytes_grabbed = 0
+        self.grabs = 0
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def grab(self, monitor):
+        left, top = monitor['left'], monitor['top']
+        width, height = monitor['width'], monitor['height']
+        # Copy out of the framebuffer like a real grab does
+        raw = bytearray(self.framebuffer[top:top + height, left:left + width].tobytes())
+        self.bytes_grabbed += len(raw)
+        self.grabs += 1
+        return FakeScreenShot(raw, width, height)
+
+
+class FakeWindow:
+    """
+    pygetwindow-like window; each state change sleeps for wm_delay seconds
+    to stand in for the window-manager round-trip.
+    """
+
+    def __init__(self, title="Hub", left=0, top=0, width=2560, height=1440, minimized=False, wm_delay=0.0):
+        self.title = title
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.isMinimized = minimized
+        self.wm_delay = wm_delay
+        self.state_changes = 0
+
+    def _change_state(self, minimized):
+        if self.wm_delay:
+            sleep(self.wm_delay)
+        self.isMinimized = minimized
+        self.state_changes += 1
+
+    def activate(self):
+        self._change_state(False)
+
+    def maximize(self):
+        self._change_state(False)
+
+    def minimize(self):
+        self._change_state(True)
+
+
+class SyntheticFrameSource:
+    """
+    Frame source that renders stats crops from a schedule instead of the
+    screen. Each frame carries its true counters in image.info['metrics'].
+
+    schedule: list of (words, wpm) per poll; the last entry repeats.
+    """
+
+    def __init__(self, schedule, noise=0, seed=0, **render_options):
+        from benchmarks.synthetic import render_stats_image
+
+        self.schedule = list(schedule)
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+        self.rendered = {
+            metrics: render_stats_image(*metrics, **render_options) for metrics in set(self.schedule)
+        }
+
+    def grab(self):
+        metrics = self.schedule[min(self.position, len(self.schedule) - 1)]
+        self.position += 1
+
+        frame = self.rendered[metrics]
+        if self.noise:
+            from PIL.Image import fromarray
+
+            pixels = np.asarray(frame, dtype=np.int16)
+            pixels = pixels + self.rng.integers(-self.noise, self.noise + 1, pixels.shape)
+            frame = fromarray(pixels.clip(0, 255).astype(np.uint8))
+        else:
+            frame = frame.copy()
+
+        frame.info['metrics'] = metrics
+        return frame
+
+
+class FakeExtractor:
+    """
+    OCRExtractor stand-in for synthetic frames: returns the counters stored
+    on the frame after sleeping for latency seconds (a stand-in for
+    tesseract).
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def extract_metrics(self, image):
+        self.calls += 1
+        if self.latency:
+            sleep(self.latency)
+        return image.info.get('metrics', (None, None))
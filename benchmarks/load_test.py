@@ -0,0 +1,129 @@
+"""
+Load test for the savings service.
+
+    python main.py serve                        # in one terminal
+    python -m benchmarks.load_test --url http://127.0.0.1:8765
+
+Without --url, a service is started in-process on a free localhost port,
+with a template-trained extractor so /ocr runs without Tesseract.
+"""
+from argparse import ArgumentParser
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection
+from io import BytesIO
+from json import dumps, loads
+from statistics import median
+from tempfile import TemporaryDirectory
+from threading import Thread
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from profiler import percentile
+from benchmarks.synthetic import make_corpus
+
+
+def request(host, port, method, path, body=None, content_type='application/json'):
+    connection = HTTPConnection(host, port, timeout=30)
+    try:
+        connection.request(method, path, body=body, headers={'Content-Type': content_type})
+        response = connection.getresponse()
+        return response.status, loads(response.read())
+    finally:
+        connection.close()
+
+
+def png_bytes(image):
+    buffer = BytesIO()
+    image.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def make_requests(count, endpoint):
+    if endpoint == 'calc':
+        return [('POST', '/calc', dumps({'words': 300 + i % 700, 'wpm': 100 + i % 80, 'profile': 'computer'}),
+                 'application/json') for i in range(count)]
+
+    images = [png_bytes(image) for image, _, _ in make_corpus(min(count, 50), seed=2)]
+    return [('POST', '/ocr', images[i % len(images)], 'image/png') for i in range(count)]
+
+
+def run_load(host, port, requests, concurrency):
+    """
+    Fire requests from `concurrency` client threads.
+    Return: (latencies in seconds, failures, elapsed seconds)
+    """
+    def timed(item):
+        method, path, body, content_type = item
+        start = perf_counter()
+        status, _ = request(host, port, method, path, body, content_type)
+        return perf_counter() - start, status
+
+    start = perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(timed, requests))
+    elapsed = perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    failures = sum(status != 200 for _, status in results)
+    return latencies, failures, elapsed
+
+
+def start_local_service(workers, templates_dir):
+    from digit_recognizer import DigitRecognizer
+    from ocr_extractor import OCRExtractor
+    from service import SavingsServer, SavingsService
+
+    templates = f"{templates_dir}/digits.npz"
+    recognizer = DigitRecognizer(templates)
+    for image, words, wpm in make_corpus(30, seed=1):
+        recognizer.learn(image, words, wpm)
+
+    def extractor():
+        # Each worker thread gets its own in-memory copy of the templates
+        recognizer = DigitRecognizer(templates, autosave=False)
+        return OCRExtractor(backend='pytesseract', recognizer=recognizer)
+
+    service = SavingsService(extractor_factory=extractor)
+    server = SavingsServer(('127.0.0.1', 0), service, workers)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = ArgumentParser(description="Load-test the savings service on localhost.")
+    parser.add_argument('--url', help="running service (default: start one in-process)")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4, help="worker threads of the in-process service")
+    parser.add_argument('--endpoints', default='calc,ocr', help="comma-separated: calc, ocr")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as templates_dir:
+        server = None
+        if args.url:
+            address = urlsplit(args.url)
+            host, port = address.hostname, address.port or 80
+        else:
+            server = start_local_service(args.workers, templates_dir)
+            host, port = server.server_address
+
+        print(f"📊 Load test against http://{host}:{port}, {args.requests} requests, {args.concurrency} clients")
+        for endpoint in args.endpoints.split(','):
+            latencies, failures, elapsed = run_load(host, port, make_requests(args.requests, endpoint), args.concurrency)
+            print(f"   /{endpoint:<8} {len(latencies) / elapsed:>8.0f} req/s  "
+                  f"p50 {median(latencies) * 1000:>7.2f} ms  p99 {percentile(latencies, 0.99) * 1000:>7.2f} ms  "
+                  f"({failures} failed)")
+
+        _, stats = request(host, port, 'GET', '/stats')
+        print("🎯 Server-side latency (/stats)")
+        for endpoint, summary in stats['endpoints'].items():
+            print(f"   {endpoint:<9} {summary['requests']:>7} requests  p50 {summary['p50_ms']:>7.2f} ms  "
+                  f"p99 {summary['p99_ms']:>7.2f} ms  ({summary['errors']} errors)")
+
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Benchmark suite with regression gates.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json
+
+Every case runs offline against synthetic data (PIL-rendered stats crops,
+an in-memory screen). Cases that need the tesseract binary are skipped
+when it is missing. With --baseline, the run fails (exit code 1) when a
+case got slower than the baseline by more than its threshold from
+benchmarks/thresholds.json.
+"""
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from json import dump, load
+from os.path import dirname, join
+from platform import platform, python_version
+from statistics import median
+from sys import exit
+from timeit import Timer
+
+THRESHOLDS_PATH = join(dirname(__file__), 'thresholds.json')
+
+CASES = {}
+
+
+class SkipCase(Exception):
+    pass
+
+
+def case(name):
+    """
+    Register a case. The decorated function does the setup and returns
+    (run, ops_per_run): a zero-argument callable to time and how many
+    operations one call performs.
+    """
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+@case('calculator.scalar')
+def calculator_scalar():
+    from calculator import SavingsCalculator
+
+    calculator = SavingsCalculator()
+    return lambda: calculator.calculate_complete_savings(372, 124, 90, 'pro_monthly', 50.49, 500), 1
+
+
+@case('calculator.batch_100k')
+def calculator_batch():
+    from calculator import SavingsCalculator
+    from benchmarks.bench_batch_calculator import make_fleet
+
+    calculator = SavingsCalculator()
+    fleet = make_fleet(100_000)
+    return lambda: calculator.calculate_batch_savings(**fleet), 100_000
+
+
+def report_case(format):
+    from os import devnull
+    from calculator import SavingsCalculator
+    from report_writer import CHUNK_SIZE, open_report
+    from benchmarks.bench_batch_calculator import make_fleet
+
+    calculator = SavingsCalculator()
+    fleet = make_fleet(CHUNK_SIZE)
+    columns = {**fleet, **calculator.calculate_batch_savings(**fleet)}
+
+    def run():
+        with open_report(devnull, format, calculator=calculator) as report:
+            report.write_columns(columns)
+
+    return run, CHUNK_SIZE
+
+
+@case('report.jsonl_chunk')
+def report_jsonl():
+    return report_case('jsonl')
+
+
+@case('report.columnar_chunk')
+def report_columnar():
+    return report_case('columnar')
+
+
+@case('ocr.parse_metrics')
+def parse_metrics():
+    from ocr_extractor import OCRExtractor
+
+    extractor = OCRExtractor(backend='pytesseract')
+    return lambda: extractor.parse_metrics("372 words\n126 WPM"), 1
+
+
+@case('ocr.preprocess')
+def preprocess():
+    from preprocess import preprocess_stats_image
+    from benchmarks.synthetic import make_corpus
+
+    images = [image for image, _, _ in make_corpus(20, themes=('light', 'dark'))]
+    return lambda: [preprocess_stats_image(image) for image in images], len(images)
+
+
+@case('ocr.template_end_to_end')
+def template_end_to_end():
+    from digit_recognizer import DigitRecognizer
+    from ocr_extractor import OCRExtractor
+    from benchmarks.synthetic import make_corpus
+
+    recognizer = DigitRecognizer()
+    for image, words, wpm in make_corpus(30, seed=1):
+        recognizer.learn(image, words, wpm)
+
+    extractor = OCRExtractor(backend='pytesseract', recognizer=recognizer)
+    corpus = make_corpus(50, seed=2)
+    misreads = [(words, wpm) for image, words, wpm in corpus if extractor.recognize_fast(image) != (words, wpm)]
+    if misreads:
+        raise AssertionError(f"template recognizer misread {len(misreads)} crops, e.g. {misreads[0]}")
+
+    images = [image for image, _, _ in corpus]
+    return lambda: [extractor.extract_metrics(image) for image in images], len(images)
+
+
+@case('ocr.tesseract_end_to_end')
+def tesseract_end_to_end():
+    from ocr_extractor import OCRExtractor
+    from benchmarks.synthetic import make_corpus
+
+    extractor = OCRExtractor(backend='pytesseract', preprocess=True)
+    images = [image for image, _, _ in make_corpus(10)]
+    try:
+        extractor.extract_metrics(images[0])
+    except Exception as e:
+        raise SkipCase(f"tesseract unavailable ({type(e).__name__})")
+    return lambda: [extractor.extract_metrics(image) for image in images], len(images)
+
+
+@case('ocr.cache_hit')
+def cache_hit():
+    from ocr_cache import OCRCache
+    from benchmarks.synthetic import render_stats_image
+
+    cache = OCRCache()
+    image = render_stats_image()
+    cache.put(cache.key(image), (372, 126))
+    return lambda: cache.get(cache.key(image)), 1
+
+
+@case('capture.full_monitor')
+def capture_full_monitor():
+    from window_capture import WindowCapture
+    from benchmarks.fakes import FakeScreen, FakeWindow
+
+    window = FakeWindow(width=1920, height=1080)
+    capture = WindowCapture(FakeScreen(1920, 1080), lambda: [window])
+    capture.find_wisprflow_window()
+    return lambda: capture.capture_top_right_region(capture.capture_window_array()), 1
+
+
+@case('capture.region_only')
+def capture_region_only():
+    from window_capture import WindowCapture
+    from benchmarks.fakes import FakeScreen, FakeWindow
+
+    window = FakeWindow(width=1920, height=1080)
+    capture = WindowCapture(FakeScreen(1920, 1080), lambda: [window])
+    capture.find_wisprflow_window()
+    return capture.capture_metrics_region, 1
+
+
+@case('pipeline.replay_monitor')
+def replay_monitor():
+    from os.path import join
+    from tempfile import mkdtemp
+    from digit_recognizer import DigitRecognizer
+    from frame_archive import FrameArchive
+    from benchmarks.bench_replay import expected_readings, replay_monitor, write_archive
+    from benchmarks.synthetic import make_corpus
+
+    path = join(mkdtemp(), 'frames.wfa')
+    truth = write_archive(path, 100)
+    archive = FrameArchive(path)
+    recognizer = DigitRecognizer()
+    for image, words, wpm in make_corpus(30, seed=1):
+        recognizer.learn(image, words, wpm)
+
+    readings, _ = replay_monitor(archive, recognizer)
+    if readings != expected_readings(truth):
+        raise AssertionError(f"replayed monitor read {readings[:3]}..., recorded {truth[:3]}...")
+    return lambda: replay_monitor(archive, recognizer), len(truth)
+
+
+@case('cli.calc_startup')
+def calc_startup():
+    from subprocess import DEVNULL, run
+    from sys import executable
+    from benchmarks.bench_import_time import CALC_COMMAND
+
+    return lambda: run([executable, *CALC_COMMAND], stdout=DEVNULL, check=True), 1
+
+
+def measure(run, ops_per_run, repeat=5):
+    """
+    Time run with timeit: autorange picks a loop count worth ~0.2 s, then
+    the best and median of `repeat` rounds are reported per operation.
+    """
+    timer = Timer(run)
+    loops, _ = timer.autorange()
+    rounds = [seconds / loops / ops_per_run for seconds in timer.repeat(repeat=repeat, number=loops)]
+    return {
+        'seconds_per_op': min(rounds),
+        'median_seconds_per_op': median(rounds),
+        'ops_per_second': 1 / min(rounds),
+        'loops': loops,
+    }
+
+
+def run_suite(selected=None, repeat=5):
+    results, skipped = {}, {}
+    for name, setup in CASES.items():
+        if selected and not any(name.startswith(prefix) for prefix in selected):
+            continue
+        try:
+            run, ops_per_run = setup()
+        except SkipCase as e:
+            skipped[name] = str(e)
+            print(f"   {name:<28} skipped: {e}")
+            continue
+
+        results[name] = measure(run, ops_per_run, repeat)
+        print(f"   {name:<28} {format_seconds(results[name]['seconds_per_op']):>12}/op")
+    return results, skipped
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(results, baseline, thresholds):
+    """
+    Return: list of (name, ratio, threshold) for cases that regressed
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['seconds_per_op'] / baseline[name]['seconds_per_op']
+        threshold = thresholds.get('cases', {}).get(name, thresholds['default'])
+        status = "❌ REGRESSION" if ratio > 1 + threshold else "✅"
+        print(f"   {name:<28} {ratio:>6.2f}x baseline (limit {1 + threshold:.2f}x) {status}")
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio, threshold))
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description="Run the benchmark suite and check for regressions.")
+    parser.add_argument('cases', nargs='*', help="only run cases starting with these prefixes")
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', help="results JSON to compare against")
+    parser.add_argument('--thresholds', default=THRESHOLDS_PATH, help="allowed slowdown per case")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("📊 Benchmark suite")
+    results, skipped = run_suite(args.cases, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            dump({
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'python': python_version(),
+                'platform': platform(),
+                'results': results,
+                'skipped': skipped,
+            }, f, indent=2)
+        print(f"Results saved to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = load(f)['results']
+        with open(args.thresholds, 'r') as f:
+            thresholds = load(f)
+
+        print(f"🎯 Compared with {args.baseline}:")
+        regressions = compare(results, baseline, thresholds)
+        if regressions:
+            print(f"❌ {len(regressions)} case(s) regressed past their threshold")
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from PIL import Image, ImageDraw, ImageFont
+
+THEMES = {
+    'light': {'background': (255, 255, 255), 'text': (20, 20, 20)},
+    'dark': {'background': (32, 33, 36), 'text': (235, 235, 235)},
+}
+
+
+def load_font(size):
+    """
+    Load a scalable font, falling back to PIL's built-in bitmap font.
+    """
+    for name in ('DejaVuSans.ttf', 'arial.ttf', 'Arial.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def render_stats_image(words=372, wpm=126, scale=1.0, theme='light'):
+    """
+    Render a synthetic stats crop with the two hub lines ("372 words",
+    "126 WPM") at roughly the size they appear on a 1080p screen.
+    """
+    colors = THEMES[theme]
+    width, height = int(280 * scale), int(108 * scale)
+    font = load_font(max(8, int(22 * scale)))
+
+    image = Image.new('RGB', (width, height), colors['background'])
+    draw = ImageDraw.Draw(image)
+    draw.text((int(16 * scale), int(18 * scale)), f"{words} words", fill=colors['text'], font=font)
+    draw.text((int(16 * scale), int(58 * scale)), f"{wpm} WPM", fill=colors['text'], font=font)
+    return image
+
+
+def make_corpus(count, seed=0, scales=(1.0,), themes=('light',)):
+    """
+    Build a list of (image, words, wpm) samples with random counters.
+    """
+    from random import Random
+
+    rng = Random(seed)
+    corpus = []
+    for i in range(count):
+        words, wpm = rng.randint(1, 99999), rng.randint(40, 250)
+        scale = scales[i % len(scales)]
+        theme = themes[(i // len(scales)) % len(themes)]
+        corpus.append((render_stats_image(words, wpm, scale, theme), words, wpm))
+    return corpus
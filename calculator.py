@@ -1,3 +1,5 @@
+from profiler import span
+
 class SavingsCalculator:
     def __init__(self):
         # Subscription costs per month
@@ -88,8 +90,13 @@ class SavingsCalculator:
         value_saved_per_word = time_saved_per_word * (hourly_rate / 60)
         
         # Calculate words needed to break even
-        words_to_break_even = self.subscription_costs[subscription_type] / value_saved_per_word
-        minutes_to_break_even = words_to_break_even / speaking_wpm
+        # (speaking no faster than typing never pays for the subscription)
+        if value_saved_per_word > 0:
+            words_to_break_even = self.subscription_costs[subscription_type] / value_saved_per_word
+            minutes_to_break_even = words_to_break_even / speaking_wpm
+        else:
+            words_to_break_even = float('inf')
+            minutes_to_break_even = float('inf')
 
         # Calculate annual projections if daily words provided
         annual_data = self.calculate_annual_savings(daily_words, speaking_wpm, typing_wpm, subscription_type, hourly_rate)
@@ -109,6 +116,100 @@ class SavingsCalculator:
             }
         }
     
+    def calculate_batch_savings(self, words_spoken, speaking_wpm, typing_wpm, subscription_type, hourly_rate, daily_words):
+        """
+        Calculate session and annual savings for many rows at once.
+
+        Every argument may be a scalar or a 1-D array-like (one entry per row);
+        scalars are broadcast against the array inputs. The arithmetic mirrors
+        calculate_complete_savings step for step, so each row matches the
+        scalar result exactly (including infinite break-even values when
+        speaking is no faster than typing).
+
+        Returns:
+            dict: Column name -> NumPy array, with the same keys as the
+                  'summary' and 'annual_data' dicts of the scalar path
+                  (minus 'subscription_type').
+        """
+        # NumPy is only needed here, so scalar-only runs start faster
+        import numpy as np
+
+        words_spoken = np.asarray(words_spoken, dtype=float)
+        speaking_wpm = np.asarray(speaking_wpm, dtype=float)
+        typing_wpm = np.asarray(typing_wpm, dtype=float)
+        hourly_rate = np.asarray(hourly_rate, dtype=float)
+        daily_words = np.asarray(daily_words, dtype=float)
+        monthly_cost = self.subscription_cost_array(subscription_type)
+
+        words_spoken, speaking_wpm, typing_wpm, hourly_rate, daily_words, monthly_cost = np.broadcast_arrays(
+            words_spoken, speaking_wpm, typing_wpm, hourly_rate, daily_words, monthly_cost
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Session time and cost savings
+            speaking_time_minutes = words_spoken / speaking_wpm
+            typing_time_minutes = words_spoken / typing_wpm
+            time_saved_minutes = typing_time_minutes - speaking_time_minutes
+            cost_savings = time_saved_minutes * (monthly_cost / 60)
+
+            # Break-even requirements
+            time_saved_per_word = 1 / typing_wpm - 1 / speaking_wpm
+            value_saved_per_word = time_saved_per_word * (hourly_rate / 60)
+            breaks_even = value_saved_per_word > 0
+            words_to_break_even = np.where(breaks_even, monthly_cost / value_saved_per_word, np.inf)
+            minutes_to_break_even = np.where(breaks_even, words_to_break_even / speaking_wpm, np.inf)
+
+            # Annual projections
+            daily_time_saved = daily_words / typing_wpm - daily_words / speaking_wpm
+            daily_value_saved = daily_time_saved * (hourly_rate / 60)
+            annual_subscription_cost = monthly_cost * 12
+            annual_value_saved = daily_value_saved * 365.25
+            net_annual_savings = annual_value_saved - annual_subscription_cost
+
+        return {
+            'speaking_time_minutes': speaking_time_minutes,
+            'typing_time_minutes': typing_time_minutes,
+            'time_saved_minutes': time_saved_minutes,
+            'cost_savings': cost_savings,
+            'words_to_break_even': words_to_break_even,
+            'minutes_to_break_even': minutes_to_break_even,
+            'value_saved_per_word': value_saved_per_word,
+            'daily_time_saved_minutes': daily_time_saved,
+            'daily_value_saved': daily_value_saved,
+            'annual_words': daily_words * 365.25,
+            'annual_time_saved_hours': (daily_time_saved * 365.25) / 60,
+            'annual_value_saved': annual_value_saved,
+            'annual_subscription_cost': annual_subscription_cost,
+            'net_annual_savings': net_annual_savings,
+            'roi_percentage': (net_annual_savings / annual_subscription_cost) * 100,
+        }
+
+    def subscription_type_indices(self, subscription_type):
+        """
+        Map subscription type names (scalar or array-like) to their
+        positions in subscription_costs.
+        """
+        import numpy as np
+
+        positions = {name: index for index, name in enumerate(self.subscription_costs)}
+        types = np.asarray(subscription_type)
+        if types.ndim == 0:
+            return np.intp(positions[str(types)])
+
+        # Look up each distinct tier once instead of once per row
+        unique_types, inverse = np.unique(types, return_inverse=True)
+        indices = np.array([positions[str(t)] for t in unique_types], dtype=np.intp)
+        return indices[inverse.reshape(types.shape)]
+
+    def subscription_cost_array(self, subscription_type):
+        """
+        Map subscription type names (scalar or array-like) to monthly costs.
+        """
+        import numpy as np
+
+        costs = np.array(list(self.subscription_costs.values()), dtype=float)
+        return costs[self.subscription_type_indices(subscription_type)]
+
     def format_results(self, results, hourly_rate, monthly_subscription_cost, words_spoken, speaking_wpm, typing_wpm, daily_words):
         """
         Format results for display in CLI.
@@ -177,20 +278,22 @@ def test_calculator(words_spoken, speaking_wpm, typing_wpm, subscription_type, h
     
     calculator = SavingsCalculator()
     
-    results = calculator.calculate_complete_savings(
-        words_spoken, speaking_wpm, typing_wpm, subscription_type, hourly_rate, daily_words
-    )
+    with span('calculate.savings'):
+        results = calculator.calculate_complete_savings(
+            words_spoken, speaking_wpm, typing_wpm, subscription_type, hourly_rate, daily_words
+        )
     
     # Display results
-    formatted_output = calculator.format_results(
-        results,
-        hourly_rate,
-        calculator.subscription_costs[subscription_type],
-        words_spoken,
-        speaking_wpm,
-        typing_wpm,
-        daily_words
-    )
+    with span('calculate.format'):
+        formatted_output = calculator.format_results(
+            results,
+            hourly_rate,
+            calculator.subscription_costs[subscription_type],
+            words_spoken,
+            speaking_wpm,
+            typing_wpm,
+            daily_words
+        )
     print(formatted_output)
     
     return results
@@ -0,0 +1,186 @@
+from os.path import exists
+import numpy as np
+
+from preprocess import text_lines, to_grayscale
+
+# Size every glyph is resampled to before matching
+GLYPH_SHAPE = (24, 16)
+
+
+def grayscale(image):
+    """
+    uint8 grayscale pixels of a PIL image or RGB(A)/grayscale array.
+    """
+    if hasattr(image, 'convert'):
+        return np.asarray(image.convert('L'))
+    return to_grayscale(image).astype(np.uint8)
+
+
+def binarize(gray):
+    """
+    Global threshold halfway between the background (most common) level
+    and the strongest ink; the hub UI is flat enough that this is all it
+    needs.
+    Return: boolean ink mask (True = text)
+    """
+    # A sparse sample is plenty to find the flat background level
+    background = int(np.bincount(gray[::4, ::4].ravel(), minlength=256).argmax())
+    ink_level = int(gray.min() if background >= 128 else gray.max())
+    if abs(background - ink_level) < 32:
+        return np.zeros(gray.shape, dtype=bool)
+
+    threshold = (background + ink_level) / 2
+    return gray < threshold if background >= 128 else gray > threshold
+
+
+def glyph_runs(line):
+    """
+    Split a line into glyphs at empty columns.
+    Return: (n, 2) array of (start, end) column ranges
+    """
+    profile = np.concatenate(([0], line.any(axis=0).astype(np.int8), [0]))
+    return np.flatnonzero(np.diff(profile)).reshape(-1, 2)
+
+
+def leading_number(line, space_ratio=0.4):
+    """
+    Find the glyphs of the number at the start of a line, i.e. the glyphs
+    before the first gap wider than space_ratio * line height.
+    Return: (n, 2) array of glyph column ranges
+    """
+    runs = glyph_runs(line)
+    if len(runs) == 0:
+        return runs
+
+    gaps = runs[1:, 0] - runs[:-1, 1]
+    spaces = np.flatnonzero(gaps > space_ratio * line.shape[0])
+    return runs[:spaces[0] + 1] if spaces.size else runs
+
+
+def glyph_vectors(line, runs):
+    """
+    Resample the glyphs of a number (their common rows, each glyph's own
+    columns) to GLYPH_SHAPE in one gather, then normalize each to zero
+    mean and unit length so a dot product is a correlation coefficient.
+    Digits share one height in the hub font, so the number's rows are
+    every digit's box.
+    Return: (len(runs), height * width) float32 array
+    """
+    height, width = GLYPH_SHAPE
+    ink_rows = np.flatnonzero(line[:, runs[0, 0]:runs[-1, 1]].any(axis=1))
+    line = line[ink_rows[0]:ink_rows[-1] + 1]
+    rows = np.arange(height) * line.shape[0] // height
+    cols = runs[:, :1] + np.arange(width) * (runs[:, 1:] - runs[:, :1]) // width
+
+    vectors = line[rows[:, None], cols.ravel()].reshape(height, len(runs), width)
+    vectors = vectors.transpose(1, 0, 2).reshape(len(runs), -1).astype(np.float32)
+
+    vectors -= vectors.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms, norms, 1)
+
+
+class DigitRecognizer:
+    """
+    Tesseract-free reader for the hub's "<n> words" / "<n> WPM" lines.
+
+    Glyphs of the leading number on each line are matched against a bank
+    of per-digit templates by normalized correlation. The bank is learned
+    from crops whose values are known (e.g. frames Tesseract read).
+
+    With a path, the bank is loaded from it and saved back after each
+    learn; autosave=False keeps what is learned in memory (for copies
+    that run alongside others sharing the file).
+    """
+
+    def __init__(self, path=None, min_confidence=0.85, autosave=True):
+        self.path = path
+        self.min_confidence = min_confidence
+        self.autosave = autosave
+        self.sums = np.zeros((10, GLYPH_SHAPE[0] * GLYPH_SHAPE[1]), dtype=np.float64)
+        self.counts = np.zeros(10, dtype=np.int64)
+        self.templates = np.zeros_like(self.sums, dtype=np.float32)
+
+        if path and exists(path):
+            self.load()
+
+    @property
+    def ready(self):
+        """
+        True once every digit has at least one example.
+        """
+        return bool(self.counts.all())
+
+    def number_glyphs(self, image):
+        """
+        Segment the stats crop into its two lines and return the leading
+        number's glyph vectors for each (or None if it doesn't look right).
+        """
+        ink = binarize(grayscale(image))
+        lines = [ink[start:end] for start, end in text_lines(ink)]
+        if len(lines) != 2:
+            return None
+
+        numbers = [leading_number(line) for line in lines]
+        if not all(len(runs) for runs in numbers):
+            return None
+        return [glyph_vectors(line, runs) for line, runs in zip(lines, numbers)]
+
+    def recognize(self, image):
+        """
+        Read (words, wpm) from a stats crop.
+        Return: ((words, wpm), confidence) -- (None, None) and 0.0 when the
+                crop can't be segmented or templates are missing
+        """
+        numbers = self.number_glyphs(image) if self.ready else None
+        if numbers is None:
+            return (None, None), 0.0
+
+        # One matrix product scores every glyph against every template
+        vectors = np.concatenate(numbers)
+        scores = vectors @ self.templates.T
+        digits = scores.argmax(axis=1)
+        confidence = float(scores[np.arange(len(digits)), digits].min())
+
+        words_digits = digits[:len(numbers[0])]
+        wpm_digits = digits[len(numbers[0]):]
+        words = int(''.join(map(str, words_digits)))
+        wpm = int(''.join(map(str, wpm_digits)))
+        return (words, wpm), confidence
+
+    def learn(self, image, words, wpm):
+        """
+        Add the digits of a crop with known values to the template bank.
+        Return: True if the crop segmented into the expected digit count
+        """
+        numbers = self.number_glyphs(image)
+        expected = [str(words), str(wpm)]
+        if numbers is None or [len(vectors) for vectors in numbers] != [len(text) for text in expected]:
+            return False
+
+        for vectors, text in zip(numbers, expected):
+            digits = np.array([int(character) for character in text])
+            np.add.at(self.sums, digits, vectors)
+            np.add.at(self.counts, digits, 1)
+
+        self._refresh_templates()
+        if self.path and self.autosave:
+            self.save()
+        return True
+
+    def _refresh_templates(self):
+        seen = self.counts > 0
+        means = self.sums[seen] / self.counts[seen, None]
+        means -= means.mean(axis=1, keepdims=True)
+        norms = np.linalg.norm(means, axis=1, keepdims=True)
+        self.templates[seen] = means / np.where(norms, norms, 1)
+
+    def save(self):
+        with open(self.path, 'wb') as f:
+            np.savez(f, sums=self.sums, counts=self.counts)
+
+    def load(self):
+        with np.load(self.path) as data:
+            self.sums = data['sums']
+            self.counts = data['counts']
+        self._refresh_templates()
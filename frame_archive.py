@@ -0,0 +1,365 @@
+from os import replace
+from os.path import exists
+from struct import calcsize, pack, unpack_from
+from time import monotonic, sleep, time
+import numpy as np
+
+MAGIC = b'WFFRAMES'
+VERSION = 1
+# magic, version, slot height, slot width, channels, capacity, count
+HEADER = '<8sHIIBQQ'
+HEADER_SIZE = 64
+INDEX_DTYPE = np.dtype([('timestamp', '<f8'), ('height', '<u4'), ('width', '<u4')])
+
+
+def frame_pixels(frame):
+    """
+    RGB uint8 pixels of a PIL image or an RGB(A) array.
+    """
+    if hasattr(frame, 'convert'):
+        frame = frame.convert('RGB')
+    pixels = np.asarray(frame, dtype=np.uint8)
+    if pixels.ndim == 2:
+        pixels = np.repeat(pixels[:, :, None], 3, axis=2)
+    return pixels[:, :, :3]
+
+
+class FrameArchiveLayout:
+    """
+    One file: a 64-byte header, a timestamp index of `capacity` entries,
+    then `capacity` fixed-size frame slots (height x width x channels).
+    Frames smaller than a slot are stored in its top-left corner with
+    their real size in the index.
+    """
+
+    def __init__(self, height, width, channels, capacity, count=0):
+        self.height = height
+        self.width = width
+        self.channels = channels
+        self.capacity = capacity
+        self.count = count
+
+    @property
+    def index_offset(self):
+        return HEADER_SIZE
+
+    @property
+    def frames_offset(self):
+        # Keep frame slots page-aligned
+        end = HEADER_SIZE + self.capacity * INDEX_DTYPE.itemsize
+        return -(-end // 4096) * 4096
+
+    @property
+    def frame_size(self):
+        return self.height * self.width * self.channels
+
+    @property
+    def file_size(self):
+        return self.frames_offset + self.capacity * self.frame_size
+
+    def header(self):
+        return pack(HEADER, MAGIC, VERSION, self.height, self.width, self.channels, self.capacity,
+                    self.count).ljust(HEADER_SIZE, b'\0')
+
+    @classmethod
+    def read(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read(calcsize(HEADER))
+        magic, version, height, width, channels, capacity, count = unpack_from(HEADER, data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a frame archive")
+        return cls(height, width, channels, capacity, count)
+
+    def map(self, path, mode):
+        """
+        Return: (index, frames) memmaps over the file
+        """
+        index = np.memmap(path, INDEX_DTYPE, mode, self.index_offset, (self.capacity,))
+        frames = np.memmap(path, np.uint8, mode, self.frames_offset,
+                           (self.capacity, self.height, self.width, self.channels))
+        return index, frames
+
+
+class FrameArchiveWriter:
+    """
+    Appends captured stats regions to a frame archive.
+
+    The slot size is fixed by the first frame (or width/height); append
+    rejects larger frames, enlarge makes room for them. When the file is
+    full its capacity doubles. Both rewrite the file once. With
+    append=True an existing archive is reopened and extended instead of
+    replaced.
+    """
+
+    def __init__(self, path, width=None, height=None, capacity=1024, append=False):
+        self.path = path
+        self.capacity = capacity
+        self.layout = None
+        self.index = None
+        self.frames = None
+        if append and exists(path):
+            self.layout = FrameArchiveLayout.read(path)
+            self.capacity = self.layout.capacity
+            self.index, self.frames = self.layout.map(path, 'r+')
+        elif width and height:
+            self._create(height, width)
+
+    def _create(self, height, width):
+        self.layout = FrameArchiveLayout(height, width, 3, self.capacity)
+        with open(self.path, 'wb') as f:
+            f.write(self.layout.header())
+            f.truncate(self.layout.file_size)
+        self.index, self.frames = self.layout.map(self.path, 'r+')
+
+    def _grow(self):
+        self._rewrite(self.layout.height, self.layout.width, self.layout.capacity * 2)
+
+    def enlarge(self, height, width):
+        """
+        Make the slots at least height x width, keeping the stored frames.
+        """
+        if self.layout is None:
+            self._create(height, width)
+        elif height > self.layout.height or width > self.layout.width:
+            self._rewrite(max(height, self.layout.height), max(width, self.layout.width), self.layout.capacity)
+
+    def _rewrite(self, height, width, capacity):
+        old_layout, old_index, old_frames = self.layout, self.index, self.frames
+        count = old_layout.count
+        self.layout = FrameArchiveLayout(height, width, 3, capacity, count)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(self.layout.header())
+            f.truncate(self.layout.file_size)
+        index, frames = self.layout.map(temp_path, 'r+')
+        index[:count] = old_index[:count]
+        frames[:count, :old_layout.height, :old_layout.width] = old_frames[:count]
+        index.flush()
+        frames.flush()
+        del index, frames, old_index, old_frames
+        self.index = self.frames = None
+
+        replace(temp_path, self.path)
+        self.index, self.frames = self.layout.map(self.path, 'r+')
+
+    def append(self, frame, timestamp=None):
+        """
+        Store one frame (PIL image or RGB array).
+        Return: its position in the archive
+        """
+        pixels = frame_pixels(frame)
+        height, width = pixels.shape[:2]
+        if self.layout is None:
+            self._create(height, width)
+        if height > self.layout.height or width > self.layout.width:
+            raise ValueError(f"{width}x{height} frame is larger than the archive's "
+                             f"{self.layout.width}x{self.layout.height} slots")
+        if self.layout.count == self.layout.capacity:
+            self._grow()
+
+        position = self.layout.count
+        self.frames[position, :height, :width] = pixels
+        self.index[position] = (time() if timestamp is None else timestamp, height, width)
+        self.layout.count += 1
+        return position
+
+    def flush(self):
+        """
+        Write the frames, then the header's frame count, so a reader never
+        sees a count covering frames that aren't there yet.
+        """
+        if self.layout is None:
+            return
+        self.frames.flush()
+        self.index.flush()
+        with open(self.path, 'r+b') as f:
+            f.write(self.layout.header())
+
+    def close(self):
+        self.flush()
+        self.index = self.frames = None
+
+
+class FrameArchive:
+    """
+    Read-only, memory-mapped view of a frame archive; frames are served
+    as NumPy views straight from the page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.layout = FrameArchiveLayout.read(path)
+        index, self.frames = self.layout.map(path, 'r')
+        self.index = index[:self.layout.count]
+        self.timestamps = self.index['timestamp']
+
+    def __len__(self):
+        return self.layout.count
+
+    def frame(self, position):
+        """
+        Return: (height, width, 3) uint8 view of the frame (no copy)
+        """
+        entry = self.index[position]
+        return self.frames[position, :entry['height'], :entry['width']]
+
+    def position_at(self, timestamp):
+        """
+        Position of the last frame captured at or before timestamp.
+        """
+        return max(int(np.searchsorted(self.timestamps, timestamp, side='right')) - 1, 0)
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self.timestamps[position], self.frame(position)
+
+
+class ReplayWindow:
+    """
+    Stand-in for the pygetwindow hub window while replaying.
+    """
+
+    def __init__(self, width, height):
+        self.title = "Hub"
+        self.left = 0
+        self.top = 0
+        self.width = width
+        self.height = height
+        self.isMinimized = False
+
+    def activate(self):
+        pass
+
+    def maximize(self):
+        pass
+
+    def minimize(self):
+        pass
+
+
+class ReplayCapture:
+    """
+    Drop-in replacement for WindowCapture that serves recorded stats
+    regions from a FrameArchive instead of the screen, so the capture ->
+    OCR path runs without a display or pygetwindow.
+
+    speed: None replays as fast as frames are asked for; 1.0 paces them
+           like the recording (2.0 twice as fast, ...)
+    loop: start over at the end instead of reporting the window gone
+    """
+
+    def __init__(self, archive, speed=None, loop=False, clock=monotonic, sleep=sleep):
+        self.archive = archive if isinstance(archive, FrameArchive) else FrameArchive(archive)
+        self.speed = speed
+        self.loop = loop
+        self.clock = clock
+        self.sleep = sleep
+        self.position = 0
+        self.started = None
+        # Recording time of the frame served last
+        self.captured_at = None
+        self.wisprflow_window = None
+        self.reads = []
+
+    @property
+    def exhausted(self):
+        return not self.loop and self.position >= len(self.archive)
+
+    def find_wisprflow_window(self):
+        if self.exhausted or not len(self.archive):
+            self.wisprflow_window = None
+            return False
+        layout = self.archive.layout
+        self.wisprflow_window = ReplayWindow(layout.width, layout.height)
+        return True
+
+    def find_wisprflow_windows(self):
+        return [(self.wisprflow_window, 1)] if self.find_wisprflow_window() else []
+
+    def next_frame(self):
+        """
+        Return: the next frame as a zero-copy array view, or None at the end
+        """
+        if self.exhausted or not len(self.archive):
+            self.wisprflow_window = None
+            return None
+        if self.position >= len(self.archive):
+            self.position = 0
+            self.started = None
+
+        position = self.position
+        self.position += 1
+        if self.speed:
+            self._wait_for(position)
+        self.captured_at = float(self.archive.timestamps[position])
+        return self.archive.frame(position)
+
+    def _wait_for(self, position):
+        timestamps = self.archive.timestamps
+        if self.started is None:
+            self.started = self.clock() - (timestamps[position] - timestamps[0]) / self.speed
+        delay = self.started + (timestamps[position] - timestamps[0]) / self.speed - self.clock()
+        if delay > 0:
+            self.sleep(delay)
+
+    def capture_metrics_array(self, leave_window_state=True):
+        return self.next_frame()
+
+    def capture_metrics_region(self, leave_window_state=True):
+        """
+        Return: PIL Image of the next recorded region, or None at the end
+        """
+        from PIL.Image import fromarray
+
+        frame = self.next_frame()
+        return None if frame is None else fromarray(frame)
+
+    # The archive holds regions, so the whole "window" is the region
+    capture_window = capture_metrics_region
+    capture_window_array = capture_metrics_array
+
+    def capture_top_right_region(self, img):
+        if isinstance(img, np.ndarray):
+            from PIL.Image import fromarray
+            return fromarray(img[:, :, :3])
+        return img
+
+    def report_read(self, words, wpm):
+        self.reads.append((words, wpm))
+
+
+def record(capture, path, frames=None, interval=1.0, leave_window_state=True, append=False):
+    """
+    Record the live stats region into a frame archive every interval
+    seconds until frames were stored (or interrupted).
+    Return: number of frames recorded
+    """
+    writer = FrameArchiveWriter(path, append=append)
+    recorded = 0
+    try:
+        while frames is None or recorded < frames:
+            if capture.wisprflow_window is None and not capture.find_wisprflow_window():
+                sleep(interval)
+                continue
+            try:
+                pixels = frame_pixels(capture.capture_metrics_region(leave_window_state))
+            except Exception:
+                # The hub closed or restarted; look the window up again
+                capture.wisprflow_window = None
+                sleep(interval)
+                continue
+
+            # A resized window can calibrate to a larger region than the
+            # first frame's slots
+            writer.enlarge(*pixels.shape[:2])
+            writer.append(pixels)
+            recorded += 1
+            if recorded % 10 == 0:
+                writer.flush()
+            sleep(interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+    return recorded
@@ -1,58 +1,403 @@
-from window_capture import test_window_capture
-from ocr_extractor import OCRExtractor
-from calculator import test_calculator
+from argparse import ArgumentParser
 from json import load
 
-if __name__ == "__main__":
-    # Capture the window with the metrics
-    file_name = test_window_capture()
-    # Extract the words and WPM from the image using OCR
-    words, wpm = OCRExtractor().extract_metrics(file_name)
-    print(f"Words: {words}, WPM: {wpm}")
+from profiler import PROFILER, span
+
+# Heavy dependencies (mss, pygetwindow, PIL, pytesseract, NumPy) are only
+# imported inside the commands that use them, so `calc` and `report` start
+# without loading any of them.
+
 
-    # Load inputs from JSON file, or prompt user if file doesn't exist
+def load_inputs(path):
+    """
+    Load the settings (typing_wpm, subscription_type, hourly_rate,
+    daily_words) from a JSON file, or prompt for them if it doesn't exist.
+    """
     try:
-        with open('computer_inputs.json', 'r') as f:
+        with open(path, 'r') as f:
             inputs = load(f)
-        
-        typing_wpm = inputs['typing_wpm']
-        subscription_type = inputs['subscription_type']
-        hourly_rate = inputs['hourly_rate']
-        daily_words = inputs['daily_words']
-        print("Using inputs from computer_inputs.json")
+        print(f"Using inputs from {path}")
+        return inputs
 
     except FileNotFoundError:
-        print("inputs.json not found. Please enter your data manually.")
-        typing_wpm = int(input("Enter your typing speed in WPM: "))
-        subscription_type = input("Enter your subscription type (student, pro_monthly, pro_annually): ")
-        hourly_rate = float(input("Enter your hourly rate: "))
-        daily_words = int(input("Enter your daily words spoken per day that you would like to speak for: "))
+        print(f"{path} not found. Please enter your data manually.")
+        return {
+            'typing_wpm': int(input("Enter your typing speed in WPM: ")),
+            'subscription_type': input("Enter your subscription type (student, pro_monthly, pro_annually): "),
+            'hourly_rate': float(input("Enter your hourly rate: ")),
+            'daily_words': int(input("Enter your daily words spoken per day that you would like to speak for: ")),
+        }
+
+
+def capture_stats(save_path=None, region_only=True):
+    """
+    Capture the WisprFlow stats region (kept in memory, no PNG round-trip).
+    Return: (WindowCapture, PIL Image or None)
+    """
+    from window_capture import WindowCapture, test_window_capture
+    from region_locator import RegionLocator
+
+    with span('main.capture'):
+        capture = WindowCapture(locator=RegionLocator())
+        region = test_window_capture(save_path=save_path, region_only=region_only, capture=capture)
+    return capture, region
 
-    test_calculator(
+
+def run_calculator(words, wpm, inputs):
+    from calculator import test_calculator
+
+    return test_calculator(
         words_spoken = words,
         speaking_wpm = wpm,
-        typing_wpm = typing_wpm,
-        subscription_type = subscription_type,
-        hourly_rate = hourly_rate,
-        daily_words = daily_words
+        typing_wpm = inputs['typing_wpm'],
+        subscription_type = inputs['subscription_type'],
+        hourly_rate = inputs['hourly_rate'],
+        daily_words = inputs['daily_words']
     )
 
+
+def command_measure(args):
+    """
+    Capture, OCR, log and calculate for the computer, then calculate the
+    mobile numbers (the default when no command is given).
+    """
+    capture, region = capture_stats()
+    if region is None:
+        return 1
+
+    # Extract the words and WPM from the image using OCR
+    from ocr_extractor import OCRExtractor
+    with span('main.ocr'):
+        words, wpm = OCRExtractor().extract_metrics(region)
+    # A layout that keeps failing to read is recalibrated on a later run
+    capture.report_read(words, wpm)
+    print(f"Words: {words}, WPM: {wpm}")
+
+    inputs = load_inputs('computer_inputs.json')
+
+    # Log this reading and prefer the measured daily average when there is one
+    from session_store import SessionStore
+    with span('main.store'):
+        store = SessionStore()
+        if words is not None and wpm:
+            store.record(words, wpm, profile='computer')
+        measured_daily_words = store.average_daily_words(profile='computer')
+    if measured_daily_words:
+        inputs['daily_words'] = round(measured_daily_words)
+        print(f"Using measured average of {inputs['daily_words']} words/day from {store.path}")
+    store.close()
+
+    run_calculator(words, wpm, inputs)
+
     # Mobile inputs
     with open('mobile_inputs.json', 'r') as f:
         inputs = load(f)
-    
-    typing_wpm = inputs['typing_wpm']
-    subscription_type = inputs['subscription_type']
-    hourly_rate = inputs['hourly_rate']
-    daily_words = inputs['daily_words']
     print("Using inputs from mobile_inputs.json")
+    run_calculator(810, 116, inputs)
+    return 0
+
+
+def command_capture(args):
+    """
+    Capture the stats region and save it as an image.
+    """
+    _, region = capture_stats(save_path=args.output, region_only=not args.full_monitor)
+    return 0 if region is not None else 1
+
+
+def command_ocr(args):
+    """
+    Read words and WPM from saved stats images.
+    """
+    from ocr_extractor import OCRExtractor
+
+    extractor = OCRExtractor(backend=args.backend, preprocess=args.preprocess)
+    with span('main.ocr'):
+        if len(args.images) == 1:
+            results = [extractor.extract_metrics(args.images[0])]
+        else:
+            results = extractor.extract_metrics_batch(args.images)
+    extractor.close()
+
+    for path, (words, wpm) in zip(args.images, results):
+        print(f"{path}: Words: {words}, WPM: {wpm}")
+    return 0 if all(words is not None and wpm for words, wpm in results) else 1
+
+
+def command_calc(args):
+    """
+    Calculate savings for known numbers; needs nothing but the calculator.
+    """
+    inputs = load_inputs(args.inputs)
+    for key in ('typing_wpm', 'subscription_type', 'hourly_rate', 'daily_words'):
+        if getattr(args, key) is not None:
+            inputs[key] = getattr(args, key)
+
+    run_calculator(args.words, args.wpm, inputs)
+    return 0
+
+
+def command_report(args):
+    """
+    Print logged words and the time and money they saved, per period.
+    """
+    from calculator import SavingsCalculator
+    from session_store import SessionStore
+
+    inputs = load_inputs(args.inputs)
+    store = SessionStore(args.store)
+    rows = store.totals(args.period, args.device)
+    store.close()
+
+    if not rows:
+        print(f"No readings logged for '{args.device}' in {args.store}")
+        return 1
+
+    calculator = SavingsCalculator()
+    report = None
+    if args.output:
+        from report_writer import open_report
+        report = open_report(args.output, args.format, calculator=calculator)
 
-    test_calculator(
-        words_spoken = 810,
-        speaking_wpm = 116,
-        typing_wpm = typing_wpm,
-        subscription_type = subscription_type,
-        hourly_rate = hourly_rate,
-        daily_words = daily_words
+    print(f"📈 {args.device} savings per {args.period} ({inputs['typing_wpm']} WPM typing, ${inputs['hourly_rate']}/hour)")
+    print(f"{args.period:<12} {'words':>8} {'WPM':>6} {'min saved':>10} {'value':>9}")
+    total_minutes = total_value = 0.0
+    for row in rows:
+        if not row['wpm']:
+            continue
+        results = calculator.calculate_complete_savings(
+            row['words'], row['wpm'], inputs['typing_wpm'], inputs['subscription_type'], inputs['hourly_rate'],
+            inputs['daily_words']
+        )
+        if report is not None:
+            report.write_result(results, row['words'], row['wpm'], inputs['typing_wpm'], inputs['hourly_rate'],
+                                inputs['daily_words'])
+        summary = results['summary']
+        value = summary['time_saved_minutes'] * inputs['hourly_rate'] / 60
+        total_minutes += summary['time_saved_minutes']
+        total_value += value
+        print(f"{row['bucket']:<12} {row['words']:>8,} {row['wpm']:>6.0f} {summary['time_saved_minutes']:>10.1f} ${value:>8.2f}")
+    print(f"{'total':<12} {sum(row['words'] for row in rows):>8,} {'':>6} {total_minutes:>10.1f} ${total_value:>8.2f}")
+    if report is not None:
+        report.close()
+        print(f"Report saved to {args.output} ({report.rows} rows)")
+    return 0
+
+
+def command_batch(args):
+    """
+    Process a directory or glob of saved screenshots.
+    """
+    from batch import format_summary, read_results, run_batch, summarize
+
+    format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    settings = load_inputs(args.inputs)
+    with span('main.batch'):
+        counts = run_batch(
+            args.sources,
+            args.output,
+            settings,
+            format=format,
+            manifest_path=args.manifest,
+            workers=args.workers,
+            crop=not args.no_crop,
+            backend=args.backend,
+            preprocess=args.preprocess,
+            templates=args.templates,
+        )
+
+    # Summarize the whole output file, including rows from earlier runs
+    print(format_summary(summarize(read_results(args.output, format)), counts))
+    print(f"Results saved to {args.output}")
+    return 0 if not counts['failed'] else 1
+
+
+def command_serve(args):
+    """
+    Run the warm local HTTP/JSON savings service.
+    """
+    from service import SavingsService, serve
+
+    extractor_factory = None
+    if args.templates:
+        from digit_recognizer import DigitRecognizer
+        from ocr_extractor import OCRExtractor
+        # One copy per worker thread, learning in memory only: a shared one
+        # would be mutated and saved by several threads at once
+        extractor_factory = lambda: OCRExtractor(
+            backend=args.backend, recognizer=DigitRecognizer(args.templates, autosave=False)
+        )
+    elif args.backend != 'auto':
+        from ocr_extractor import OCRExtractor
+        extractor_factory = lambda: OCRExtractor(backend=args.backend)
+
+    serve(args.host, args.port, args.workers, SavingsService(extractor_factory=extractor_factory))
+    return 0
+
+
+def command_simulate(args):
+    """
+    Monte Carlo ROI: percentiles of net savings and ROI over many draws.
+    """
+    from monte_carlo import MonteCarloROI, format_simulation, history_inputs
+
+    inputs = load_inputs(args.inputs)
+    speaking_wpm = args.wpm
+    history = {}
+    if args.history or speaking_wpm is None:
+        from session_store import SessionStore
+        store = SessionStore(args.store)
+        speaking_wpm = speaking_wpm or store.average_wpm(args.device)
+        if args.history:
+            history = history_inputs(store, args.device, args.history_days)
+        store.close()
+        if args.history and not history:
+            print(f"No readings logged for '{args.device}' in {args.store}; using distributions instead")
+    if speaking_wpm is None:
+        print("No speaking WPM: pass --wpm or log some readings first")
+        return 1
+
+    # Point values spread by the given relative standard deviations by default
+    specs = {
+        'daily_words': {'dist': 'normal', 'mean': inputs['daily_words'], 'std': inputs['daily_words'] * args.spread},
+        'speaking_wpm': {'dist': 'normal', 'mean': speaking_wpm, 'std': speaking_wpm * args.spread / 2},
+        'typing_wpm': {'dist': 'normal', 'mean': inputs['typing_wpm'], 'std': inputs['typing_wpm'] * args.spread / 2},
+        'hourly_rate': inputs['hourly_rate'],
+    }
+    specs.update(history)
+    if args.config:
+        with open(args.config, 'r') as f:
+            specs.update(load(f))
+
+    simulation = MonteCarloROI(
+        specs['daily_words'],
+        specs['speaking_wpm'],
+        specs['typing_wpm'],
+        inputs['subscription_type'],
+        specs['hourly_rate'],
+        seed=args.seed,
+        chunk_size=args.chunk_size,
     )
-        
\ No newline at end of file
+    with span('main.simulate'):
+        result = simulation.run(args.draws)
+    print(format_simulation(result))
+    return 0
+
+
+def command_record(args):
+    """
+    Record the live stats region into a frame archive for later replay.
+    """
+    from window_capture import WindowCapture
+    from region_locator import RegionLocator
+    from frame_archive import record
+
+    recorded = record(WindowCapture(locator=RegionLocator()), args.output, args.frames, args.interval,
+                      append=args.append)
+    print(f"Recorded {recorded} frames to {args.output}")
+    return 0
+
+
+def build_parser():
+    parser = ArgumentParser(description="Measure how much time and money WisprFlow saves you.")
+    parser.add_argument('--profile', action='store_true', help="print a per-stage timing breakdown")
+    parser.add_argument('--trace', help="with --profile, also save a JSON trace (chrome://tracing format) here")
+    parser.add_argument('--prometheus', help="with --profile, also save Prometheus text-format timings here")
+    parser.set_defaults(command=command_measure)
+    commands = parser.add_subparsers(title="commands", description="run without a command to capture, read and calculate")
+
+    capture = commands.add_parser('capture', help="capture the stats region to an image")
+    capture.add_argument('--output', default='stats.png', help="where to save the image")
+    capture.add_argument('--full-monitor', action='store_true', help="grab the whole monitor and crop")
+    capture.set_defaults(command=command_capture)
+
+    record = commands.add_parser('record', help="record stats regions into a frame archive")
+    record.add_argument('--output', default='frames.wfa', help="frame archive file")
+    record.add_argument('--frames', type=int, help="stop after this many frames (default: until interrupted)")
+    record.add_argument('--interval', type=float, default=1.0, help="seconds between frames")
+    record.add_argument('--append', action='store_true', help="add to an existing archive instead of replacing it")
+    record.set_defaults(command=command_record)
+
+    ocr = commands.add_parser('ocr', help="read words and WPM from saved images")
+    ocr.add_argument('images', nargs='+', help="stats image files")
+    ocr.add_argument('--backend', default='auto', help="auto, tesserocr or pytesseract")
+    ocr.add_argument('--preprocess', action='store_true', help="binarize and join lines before OCR")
+    ocr.set_defaults(command=command_ocr)
+
+    calc = commands.add_parser('calc', help="calculate savings for known numbers")
+    calc.add_argument('--words', type=int, required=True, help="words spoken")
+    calc.add_argument('--wpm', type=int, required=True, help="speaking speed")
+    calc.add_argument('--inputs', default='computer_inputs.json', help="settings file")
+    calc.add_argument('--typing-wpm', dest='typing_wpm', type=int)
+    calc.add_argument('--subscription-type', dest='subscription_type', choices=('student', 'pro_monthly', 'pro_annually'))
+    calc.add_argument('--hourly-rate', dest='hourly_rate', type=float)
+    calc.add_argument('--daily-words', dest='daily_words', type=int)
+    calc.set_defaults(command=command_calc)
+
+    batch = commands.add_parser('batch', help="process a directory or glob of saved screenshots")
+    batch.add_argument('sources', nargs='+', help="directories, glob patterns or image files")
+    batch.add_argument('--output', default='batch_results.jsonl', help="results file (.jsonl or .csv)")
+    batch.add_argument('--format', choices=('jsonl', 'csv'), help="defaults to the output file's extension")
+    batch.add_argument('--manifest', help="hashes of processed images (default: <output>.manifest)")
+    batch.add_argument('--workers', type=int, help="worker processes (default: one per CPU)")
+    batch.add_argument('--no-crop', action='store_true', help="images are already cropped to the stats region")
+    batch.add_argument('--backend', default='auto', help="auto, tesserocr or pytesseract")
+    batch.add_argument('--preprocess', action='store_true', help="binarize and join lines before OCR")
+    batch.add_argument('--templates', help="DigitRecognizer templates for the Tesseract-free fast path")
+    batch.add_argument('--inputs', default='computer_inputs.json', help="settings file")
+    batch.set_defaults(command=command_batch)
+
+    service = commands.add_parser('serve', help="run the local HTTP/JSON savings service")
+    service.add_argument('--host', default='127.0.0.1')
+    service.add_argument('--port', type=int, default=8765)
+    service.add_argument('--workers', type=int, default=4, help="requests handled at once")
+    service.add_argument('--backend', default='auto', help="auto, tesserocr or pytesseract")
+    service.add_argument('--templates', help="DigitRecognizer templates for the Tesseract-free fast path")
+    service.set_defaults(command=command_serve)
+
+    simulate = commands.add_parser('simulate', help="Monte Carlo confidence intervals for annual ROI")
+    simulate.add_argument('--draws', type=int, default=1_000_000)
+    simulate.add_argument('--seed', type=int, help="repeat a previous run (its seed is printed)")
+    simulate.add_argument('--chunk-size', type=int, default=250_000, help="draws evaluated per NumPy batch")
+    simulate.add_argument('--wpm', type=float, help="average speaking WPM (default: measured average)")
+    simulate.add_argument('--spread', type=float, default=0.3, help="relative std of daily words (half for speeds)")
+    simulate.add_argument('--config', help="JSON of input name -> distribution spec (see monte_carlo.make_sampler)")
+    simulate.add_argument('--history', action='store_true', help="resample daily words and WPM from logged days")
+    simulate.add_argument('--history-days', type=int, default=90)
+    simulate.add_argument('--inputs', default='computer_inputs.json', help="settings file")
+    simulate.add_argument('--store', default='sessions.db', help="SQLite file readings are logged to")
+    simulate.add_argument('--device', default='computer', help="device profile the readings were logged under")
+    simulate.set_defaults(command=command_simulate)
+
+    report = commands.add_parser('report', help="savings from logged readings")
+    report.add_argument('--period', choices=('day', 'week', 'month'), default='day')
+    report.add_argument('--device', default='computer', help="device profile the readings were logged under")
+    report.add_argument('--inputs', default='computer_inputs.json', help="settings file")
+    report.add_argument('--store', default='sessions.db', help="SQLite file readings are logged to")
+    report.add_argument('--output', help="also save the full per-period results (.csv, .jsonl, .wfr or .txt)")
+    report.add_argument('--format', choices=('csv', 'jsonl', 'columnar', 'text'),
+                        help="defaults to the output file's extension")
+    report.set_defaults(command=command_report)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        PROFILER.enable()
+
+    status = args.command(args)
+
+    if args.profile:
+        print(PROFILER.format_report())
+        if args.trace:
+            PROFILER.write_trace(args.trace)
+            print(f"Trace saved to {args.trace}")
+        if args.prometheus:
+            PROFILER.write_prometheus(args.prometheus)
+            print(f"Prometheus metrics saved to {args.prometheus}")
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,270 @@
+from time import monotonic, sleep, time
+from json import load
+import numpy as np
+
+from calculator import SavingsCalculator
+
+
+class WindowFrameSource:
+    """
+    Frame source that grabs the metrics region of the live WisprFlow window.
+    """
+
+    def __init__(self, capture=None, leave_window_state=True):
+        if capture is None:
+            from window_capture import WindowCapture
+            from region_locator import RegionLocator
+            capture = WindowCapture(locator=RegionLocator())
+        self.capture = capture
+        self.leave_window_state = leave_window_state
+
+    def grab(self):
+        """
+        Return: PIL Image of the stats region, or None if the window is gone
+        """
+        if self.capture.wisprflow_window is None and not self.capture.find_wisprflow_window():
+            return None
+        try:
+            return self.capture.capture_metrics_region(self.leave_window_state)
+        except Exception:
+            # The hub closed or restarted and the handle went stale; look
+            # the window up again on the next poll
+            self.capture.wisprflow_window = None
+            return None
+
+    def report_read(self, words, wpm):
+        self.capture.report_read(words, wpm)
+
+    @property
+    def exhausted(self):
+        """
+        True when the capture is a replay that ran out of frames.
+        """
+        return getattr(self.capture, 'exhausted', False)
+
+    @property
+    def captured_at(self):
+        """
+        When a replayed frame was recorded (None for live captures).
+        """
+        return getattr(self.capture, 'captured_at', None)
+
+
+class FrameDiffer:
+    """
+    Cheap change detector: compares downscaled grayscale thumbnails of
+    consecutive frames and reports a change when any block moved by more
+    than threshold grey levels.
+    """
+
+    def __init__(self, factor=4, threshold=16):
+        self.factor = factor
+        self.threshold = threshold
+        self.previous = None
+
+    def thumbnail(self, frame):
+        return np.asarray(frame.convert('L').reduce(self.factor), dtype=np.int16)
+
+    def changed(self, frame):
+        thumbnail = self.thumbnail(frame)
+        previous, self.previous = self.previous, thumbnail
+
+        if previous is None or previous.shape != thumbnail.shape:
+            return True
+        return int(np.abs(thumbnail - previous).max()) > self.threshold
+
+    def reset(self):
+        self.previous = None
+
+
+class StatsMonitor:
+    """
+    Long-running poller: grabs the stats region at a set rate and only runs
+    OCR and the savings calculator when the pixels actually changed.
+
+    Polling backs off (interval * backoff, up to max_interval) while frames
+    stay unchanged and snaps back to interval on a change. cpu_budget caps
+    the fraction of wall time spent working: after a cycle that took w
+    seconds the monitor sleeps at least w * (1 / cpu_budget - 1). A budget
+    of None (or 1 and above) disables the cap.
+    """
+
+    def __init__(self, source, settings, extractor=None, calculator=None, differ=None, on_result=None,
+                 interval=1.0, max_interval=30.0, backoff=1.5, cpu_budget=0.1, sleep=sleep):
+        if extractor is None:
+            from ocr_extractor import OCRExtractor
+            extractor = OCRExtractor()
+        if cpu_budget is not None and cpu_budget <= 0:
+            raise ValueError(f"cpu_budget must be positive (or None for no cap), got {cpu_budget}")
+
+        self.source = source
+        self.settings = settings
+        self.extractor = extractor
+        self.calculator = calculator or SavingsCalculator()
+        self.differ = differ or FrameDiffer()
+        self.on_result = on_result or print_result
+        self.interval = interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+        self.sleep = sleep
+        self.current_interval = interval
+        self.running = False
+        self.frame_changed = False
+        self.last_metrics = None
+        self.stats = {'frames': 0, 'missing': 0, 'unchanged': 0, 'ocr_runs': 0, 'failed_reads': 0, 'results': 0}
+
+    def poll_once(self):
+        """
+        Grab one frame and process it if it changed.
+        Return: result dict when a new reading was produced, else None
+        """
+        self.frame_changed = False
+        frame = self.source.grab()
+        # Replayed frames keep the time they were recorded at
+        captured_at = getattr(self.source, 'captured_at', None) or time()
+        if frame is None:
+            self.stats['missing'] += 1
+            return None
+
+        self.stats['frames'] += 1
+        if not self.differ.changed(frame):
+            self.stats['unchanged'] += 1
+            return None
+
+        self.frame_changed = True
+        self.stats['ocr_runs'] += 1
+        words, wpm = self.extractor.extract_metrics(frame)
+        # Sources that calibrate their crop want to know how reads went
+        if hasattr(self.source, 'report_read'):
+            self.source.report_read(words, wpm)
+        if words is None or not wpm:
+            self.stats['failed_reads'] += 1
+            # Force OCR on the next frame rather than trusting this one
+            self.differ.reset()
+            return None
+
+        if (words, wpm) == self.last_metrics:
+            return None
+        self.last_metrics = (words, wpm)
+
+        savings = self.calculator.calculate_complete_savings(
+            words,
+            wpm,
+            self.settings['typing_wpm'],
+            self.settings['subscription_type'],
+            self.settings['hourly_rate'],
+            self.settings['daily_words'],
+        )
+        self.stats['results'] += 1
+        return {'timestamp': captured_at, 'words': words, 'wpm': wpm, 'savings': savings}
+
+    def next_interval(self, work_seconds):
+        if self.frame_changed:
+            self.current_interval = self.interval
+        else:
+            self.current_interval = min(self.current_interval * self.backoff, self.max_interval)
+
+        if self.cpu_budget is None or self.cpu_budget >= 1:
+            return self.current_interval
+        budget_floor = work_seconds * (1 / self.cpu_budget - 1)
+        return max(self.current_interval, budget_floor)
+
+    def run(self, max_polls=None):
+        """
+        Poll until stop() is called (or max_polls polls have been made, or
+        a replayed recording ran out of frames).
+        """
+        self.running = True
+        polls = 0
+
+        while self.running and (max_polls is None or polls < max_polls):
+            start = monotonic()
+            result = self.poll_once()
+            work_seconds = monotonic() - start
+            polls += 1
+
+            if result is not None:
+                self.on_result(result)
+            if getattr(self.source, 'exhausted', False):
+                break
+
+            self.sleep(self.next_interval(work_seconds))
+
+        self.running = False
+        return self.stats
+
+    def stop(self):
+        self.running = False
+
+
+def positive_fraction(text):
+    """
+    argparse type for --cpu-budget: a number above zero.
+    """
+    from argparse import ArgumentTypeError
+
+    value = float(text)
+    if value <= 0:
+        raise ArgumentTypeError(f"must be above 0, got {text}")
+    return value
+
+
+def print_result(result):
+    summary = result['savings']['summary']
+    print(f"[{result['timestamp']:.0f}] {result['words']} words @ {result['wpm']} WPM -> "
+          f"{summary['time_saved_minutes']:.2f} min saved (${summary['cost_savings']:.4f})")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="Track WisprFlow savings continuously.")
+    parser.add_argument('--inputs', default='computer_inputs.json', help="settings file (typing_wpm, subscription_type, ...)")
+    parser.add_argument('--interval', type=float, default=1.0, help="base polling interval in seconds")
+    parser.add_argument('--max-interval', type=float, default=30.0, help="longest interval while nothing changes")
+    parser.add_argument('--cpu-budget', type=positive_fraction, default=0.1, help="max fraction of wall time spent working")
+    parser.add_argument('--store', help="SQLite file readings are logged to (default: sessions.db, "
+                                         "or none with --replay)")
+    parser.add_argument('--device', default='computer', help="device profile readings are logged under")
+    parser.add_argument('--replay', help="read frames from a frame archive instead of the screen")
+    parser.add_argument('--speed', type=float, help="with --replay, pace frames at this multiple of real time")
+    args = parser.parse_args()
+
+    from session_store import SessionStore
+
+    # A replay only goes into a store when asked to, so it never adds to
+    # the real usage history by accident
+    store = None
+    if args.store or not args.replay:
+        store = SessionStore(args.store or 'sessions.db')
+    with open(args.inputs, 'r') as f:
+        settings = load(f)
+    if store is not None:
+        settings = store.measured_inputs(settings, args.device)
+
+    def record_result(result):
+        if store is not None:
+            store.record(result['words'], result['wpm'], args.device, result['timestamp'])
+        print_result(result)
+
+    capture = None
+    if args.replay:
+        from frame_archive import ReplayCapture
+        capture = ReplayCapture(args.replay, speed=args.speed)
+
+    monitor = StatsMonitor(
+        WindowFrameSource(capture),
+        settings,
+        on_result=record_result,
+        interval=args.interval,
+        max_interval=args.max_interval,
+        cpu_budget=args.cpu_budget,
+    )
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        print(f"\nStopped. {monitor.stats}")
+    finally:
+        if store is not None:
+            store.close()
@@ -0,0 +1,279 @@
+from numbers import Number
+import numpy as np
+
+from calculator import SavingsCalculator
+
+# Outputs tracked per draw
+SIMULATED_METRICS = ('net_annual_savings', 'roi_percentage', 'annual_time_saved_hours', 'words_to_break_even')
+
+# Heavy-tailed metrics (break-even explodes as speaking nears typing speed)
+LOG_SCALE_METRICS = ('words_to_break_even',)
+
+# Speeds and counts below these make no physical sense (and would divide by zero)
+LOWER_BOUNDS = {'daily_words': 0.0, 'speaking_wpm': 1.0, 'typing_wpm': 1.0, 'hourly_rate': 0.0}
+
+
+def make_sampler(spec, name='value'):
+    """
+    Build a function (rng, n) -> n draws from a distribution spec:
+        372                                         constant
+        {'dist': 'normal', 'mean': m, 'std': s}
+        {'dist': 'lognormal', 'mean': m, 'sigma': s}  m is the median
+        {'dist': 'uniform', 'low': a, 'high': b}
+        {'dist': 'triangular', 'low': a, 'mode': c, 'high': b}
+        {'dist': 'history', 'values': [...]}        resample observed values
+    Draws are clipped to the input's lower bound.
+    """
+    floor = LOWER_BOUNDS.get(name, -np.inf)
+
+    if isinstance(spec, Number):
+        value = max(float(spec), floor)
+        return lambda rng, n: np.full(n, value)
+
+    dist = spec.get('dist')
+    if dist == 'normal':
+        draw = lambda rng, n: rng.normal(spec['mean'], spec['std'], n)
+    elif dist == 'lognormal':
+        draw = lambda rng, n: rng.lognormal(np.log(spec['mean']), spec['sigma'], n)
+    elif dist == 'uniform':
+        draw = lambda rng, n: rng.uniform(spec['low'], spec['high'], n)
+    elif dist == 'triangular':
+        draw = lambda rng, n: rng.triangular(spec['low'], spec['mode'], spec['high'], n)
+    elif dist == 'history':
+        values = np.asarray(spec['values'], dtype=float)
+        if values.size == 0:
+            raise ValueError(f"No history to resample for {name}")
+        draw = lambda rng, n: values[rng.integers(0, values.size, n)]
+    else:
+        raise ValueError(f"Unknown distribution for {name}: {dist}")
+
+    return lambda rng, n: np.maximum(draw(rng, n), floor)
+
+
+class StreamingHistogram:
+    """
+    Constant-memory quantile estimator: a fixed number of equal-width bins
+    whose range doubles (merging bin pairs, which is exact) whenever a
+    value falls outside it. Quantiles interpolate within a bin, so their
+    error is at most one bin width (range / bins).
+
+    +/-inf values are counted separately and sort below/above every
+    finite value. log_scale bins log(value) instead, which bounds the
+    relative error for positive, heavy-tailed metrics (zero and negative
+    values then count as -inf).
+    """
+
+    def __init__(self, bins=4096, log_scale=False):
+        if bins % 2:
+            raise ValueError("bins must be even")
+        self.bins = bins
+        self.log_scale = log_scale
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.low = None
+        self.span = None
+        self.finite = 0
+        self.negative_infinite = 0
+        self.positive_infinite = 0
+        self.total = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @property
+    def count(self):
+        return self.finite + self.negative_infinite + self.positive_infinite
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if self.log_scale:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values = np.where(values > 0, np.log(values), -np.inf)
+        finite = np.isfinite(values)
+        self.positive_infinite += int(np.count_nonzero(values == np.inf))
+        self.negative_infinite += int(np.count_nonzero(values == -np.inf))
+        values = values[finite]
+        if values.size == 0:
+            return
+
+        low, high = float(values.min()), float(values.max())
+        if self.low is None:
+            # Leave headroom so later chunks rarely force a rebin
+            span = (high - low) or abs(high) or 1.0
+            self.low = low - span / 4
+            self.span = span * 1.5
+        self._cover(low, high)
+
+        width = self.span / self.bins
+        indices = np.minimum(((values - self.low) / width).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(indices, minlength=self.bins)
+        self.finite += values.size
+        self.total += float(values.sum())
+        self.minimum = min(self.minimum, low)
+        self.maximum = max(self.maximum, high)
+
+    def _cover(self, low, high):
+        """
+        Double the range (towards whichever side is short) until it
+        contains [low, high].
+        """
+        half = self.bins // 2
+        while low < self.low or high >= self.low + self.span:
+            merged = self.counts.reshape(half, 2).sum(axis=1)
+            self.counts = np.zeros(self.bins, dtype=np.int64)
+            if low < self.low:
+                self.counts[half:] = merged
+                self.low -= self.span
+            else:
+                self.counts[:half] = merged
+            self.span *= 2
+
+    def quantile(self, q):
+        """
+        Estimate the q-quantile (0 <= q <= 1) of everything seen so far.
+        """
+        if self.count == 0:
+            return np.nan
+
+        rank = q * self.count
+        if rank <= self.negative_infinite and self.negative_infinite:
+            return -np.inf
+        rank -= self.negative_infinite
+        if rank > self.finite:
+            return np.inf
+
+        cumulative = np.cumsum(self.counts)
+        index = min(int(np.searchsorted(cumulative, rank)), self.bins - 1)
+        before = cumulative[index - 1] if index else 0
+        fraction = (rank - before) / self.counts[index] if self.counts[index] else 0.0
+        value = self.low + (index + fraction) * self.span / self.bins
+        value = min(max(value, self.minimum), self.maximum)
+        return float(np.exp(value) if self.log_scale else value)
+
+    def summary(self, percentiles=(5, 50, 95)):
+        summary = {f'p{p:g}': self.quantile(p / 100) for p in percentiles}
+        if self.log_scale:
+            # The mean of a log-scale histogram is the geometric mean
+            summary['geometric_mean'] = float(np.exp(self.total / self.finite)) if self.finite else np.nan
+            summary['min'] = float(np.exp(self.minimum)) if self.finite else np.nan
+            summary['max'] = float(np.exp(self.maximum)) if self.finite else np.nan
+        else:
+            summary['mean'] = self.total / self.finite if self.finite else np.nan
+            summary['min'] = self.minimum if self.finite else np.nan
+            summary['max'] = self.maximum if self.finite else np.nan
+        summary['infinite'] = self.positive_infinite + self.negative_infinite
+        return summary
+
+
+def history_inputs(store, profile='computer', days=90):
+    """
+    Resampling specs for daily_words and speaking_wpm from a SessionStore:
+    every calendar day of the last `days` days since the profile was first
+    recorded (idle days count as zero words, see SessionStore.daily_words)
+    and the average WPM of each day with speech.
+    Return: dict of input name -> spec (empty when nothing was recorded)
+    """
+    from datetime import datetime, timedelta
+
+    daily_words = store.daily_words(profile, days)
+    if not daily_words:
+        return {}
+
+    today = datetime.now().date()
+    rows = store.totals('day', profile, (today - timedelta(days=days - 1)).isoformat(), today.isoformat())
+    inputs = {'daily_words': {'dist': 'history', 'values': [float(words) for words in daily_words]}}
+    # A window of idle days has no speaking pace to resample
+    wpm = [row['wpm'] for row in rows if row['wpm']]
+    if wpm:
+        inputs['speaking_wpm'] = {'dist': 'history', 'values': wpm}
+    return inputs
+
+
+class MonteCarloROI:
+    """
+    Monte Carlo version of calculate_annual_savings and the break-even
+    formulas: each draw is a year at a sampled average pace (daily_words,
+    speaking_wpm, typing_wpm, hourly_rate), evaluated with
+    calculate_batch_savings in chunks of chunk_size draws.
+
+    Only a StreamingHistogram per metric is kept between chunks, so
+    memory stays the same for a thousand draws or a billion. The same
+    seed and chunk_size reproduce a run exactly.
+    """
+
+    def __init__(self, daily_words, speaking_wpm, typing_wpm, subscription_type='pro_monthly', hourly_rate=25.0,
+                 seed=None, chunk_size=250_000, bins=4096, calculator=None):
+        self.calculator = calculator or SavingsCalculator()
+        if subscription_type not in self.calculator.subscription_costs:
+            raise ValueError(f"Unknown subscription type: {subscription_type}")
+
+        self.specs = {'daily_words': daily_words, 'speaking_wpm': speaking_wpm, 'typing_wpm': typing_wpm,
+                      'hourly_rate': hourly_rate}
+        self.samplers = {name: make_sampler(spec, name) for name, spec in self.specs.items()}
+        self.subscription_type = subscription_type
+        # Draw a seed when none is given, so every run can be repeated
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2**63)
+        self.chunk_size = chunk_size
+        self.bins = bins
+
+    def run(self, draws=1_000_000, percentiles=(5, 50, 95)):
+        """
+        Simulate `draws` years.
+        Return: dict with per-metric percentile summaries, the probability
+                that a year's net savings are positive, draws and seed
+        """
+        rng = np.random.default_rng(self.seed)
+        histograms = {metric: StreamingHistogram(self.bins, metric in LOG_SCALE_METRICS) for metric in SIMULATED_METRICS}
+        net_positive = 0
+
+        for start in range(0, draws, self.chunk_size):
+            n = min(self.chunk_size, draws - start)
+            inputs = {name: sampler(rng, n) for name, sampler in self.samplers.items()}
+            results = self.calculator.calculate_batch_savings(
+                inputs['daily_words'],
+                inputs['speaking_wpm'],
+                inputs['typing_wpm'],
+                self.subscription_type,
+                inputs['hourly_rate'],
+                inputs['daily_words'],
+            )
+            for metric, histogram in histograms.items():
+                histogram.update(results[metric])
+            net_positive += int(np.count_nonzero(results['net_annual_savings'] > 0))
+
+        return {
+            'draws': draws,
+            'seed': self.seed,
+            'subscription_type': self.subscription_type,
+            'probability_net_positive': net_positive / draws if draws else np.nan,
+            'metrics': {metric: histogram.summary(percentiles) for metric, histogram in histograms.items()},
+        }
+
+
+def format_simulation(result):
+    """
+    Format a MonteCarloROI.run result for display in CLI.
+    """
+    metrics = result['metrics']
+    labels = {
+        'net_annual_savings': ("Net annual savings", "${:,.2f}"),
+        'roi_percentage': ("ROI", "{:,.1f}%"),
+        'annual_time_saved_hours': ("Annual time saved", "{:,.1f} h"),
+        'words_to_break_even': ("Words to break even", "{:,.0f}"),
+    }
+    percentile_keys = [key for key in next(iter(metrics.values())) if key.startswith('p')]
+
+    output = [
+        "=" * 60,
+        f"🎲 ROI SIMULATION ({result['draws']:,} draws, seed {result['seed']})",
+        "=" * 60,
+        f"   Subscription: {result['subscription_type'].replace('_', ' ').title()}",
+        f"   Chance of positive net savings: {result['probability_net_positive']:.1%}",
+        "",
+    ]
+    for metric, (label, template) in labels.items():
+        summary = metrics[metric]
+        values = "  ".join(f"{key.upper()} {template.format(summary[key])}" for key in percentile_keys)
+        output.append(f"   {label}: {values}")
+        if summary['infinite']:
+            output.append(f"      ({summary['infinite']:,} draws never break even)")
+    output.append("=" * 60)
+    return "\n".join(output)
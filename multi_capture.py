@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from os import cpu_count
+from threading import Lock, local
+
+from mss import mss
+
+from window_capture import WindowCapture
+
+
+class MultiWindowCapture:
+    """
+    Captures and OCRs every WisprFlow window at once, one thread-pool task
+    per window, and labels each result with its window and monitor.
+
+    Grabs run in parallel (each task opens its own screen handle, since
+    mss handles are per thread). Minimized windows have to be brought up
+    to be grabbed, and those window-manager round-trips are serialized so
+    two hubs never fight over focus.
+
+    The thread pool lives as long as the instance, so each worker keeps
+    its warm extractor between capture_all calls; close() shuts it down.
+    """
+
+    def __init__(self, screen_factory=mss, window_enumerator=None, extractor_factory=None, locator=None,
+                 max_workers=None):
+        if extractor_factory is None:
+            from ocr_extractor import OCRExtractor
+            extractor_factory = OCRExtractor
+
+        self.screen_factory = screen_factory
+        self.window_enumerator = window_enumerator
+        self.extractor_factory = extractor_factory
+        self.locator = locator
+        # Tasks mostly wait on tesseract subprocesses and screen grabs, so
+        # use more threads than cores (ThreadPoolExecutor's own default)
+        self.max_workers = max_workers or min(32, (cpu_count() or 1) + 4)
+        self.window_lock = Lock()
+        # One extractor per worker thread (OCR engines aren't shared safely)
+        self.thread_state = local()
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='multi_capture')
+
+    def discover(self):
+        """
+        Return: list of targets (dicts with label, window and monitor)
+        """
+        finder = WindowCapture(self.screen_factory, self.window_enumerator)
+        return [
+            {'label': f"{window.title}#{index} (monitor {monitor})", 'window': window, 'monitor': monitor}
+            for index, (window, monitor) in enumerate(finder.find_wisprflow_windows(), start=1)
+        ]
+
+    def extractor(self):
+        extractor = getattr(self.thread_state, 'extractor', None)
+        if extractor is None:
+            extractor = self.thread_state.extractor = self.extractor_factory()
+        return extractor
+
+    def capture_target(self, target, leave_window_state=True):
+        """
+        Grab and OCR one window.
+        Return: labelled result dict (error is set if anything failed)
+        """
+        result = {'label': target['label'], 'monitor': target['monitor'], 'words': None, 'wpm': None, 'error': None}
+        capture = WindowCapture(self.screen_factory, self.window_enumerator, self.locator)
+        capture.wisprflow_window = target['window']
+
+        try:
+            needs_window_manager = not leave_window_state or target['window'].isMinimized
+            with self.window_lock if needs_window_manager else nullcontext():
+                region = capture.capture_metrics_region(leave_window_state)
+
+            result['words'], result['wpm'] = self.extractor().extract_metrics(region)
+            capture.report_read(result['words'], result['wpm'])
+        except Exception as e:
+            result['error'] = f"{type(e).__name__}: {e}"
+
+        return result
+
+    def capture_all(self, targets=None, leave_window_state=True):
+        """
+        Capture and OCR every target (discovering them if not given)
+        concurrently.
+        Return: list of result dicts, in target order
+        """
+        targets = self.discover() if targets is None else targets
+        if not targets:
+            return []
+
+        return list(self.pool.map(lambda target: self.capture_target(target, leave_window_state), targets))
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    from region_locator import RegionLocator
+
+    with MultiWindowCapture(locator=RegionLocator()) as multi_capture:
+        results = multi_capture.capture_all()
+    if not results:
+        print("No WisprFlow windows found.")
+    for result in results:
+        if result['error']:
+            print(f"{result['label']}: ❌ {result['error']}")
+        else:
+            print(f"{result['label']}: {result['words']} words, {result['wpm']} WPM")
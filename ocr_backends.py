@@ -0,0 +1,210 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from os import cpu_count
+from os.path import exists
+from queue import Empty, Queue
+from threading import Lock
+
+WINDOWS_TESSERACT = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+
+
+def configure_tesseract():
+    """
+    Point pytesseract at the default Windows install location when it is
+    there (elsewhere tesseract is expected on PATH). Called when an engine
+    is created, never at import time.
+    """
+    from pytesseract import pytesseract
+
+    if exists(WINDOWS_TESSERACT):
+        pytesseract.tesseract_cmd = WINDOWS_TESSERACT
+
+
+class PytesseractBackend:
+    """
+    Default backend: one tesseract subprocess per image via pytesseract.
+
+    Batches run through a thread pool (the work happens in the subprocess,
+    so threads are enough to keep every core busy).
+    """
+
+    name = 'pytesseract'
+
+    def __init__(self, config='--oem 3 --psm 6', workers=None):
+        from pytesseract import Output, image_to_data, image_to_string
+
+        configure_tesseract()
+        self.image_to_string = image_to_string
+        self._image_to_data = image_to_data
+        self.output_dict = Output.DICT
+        self.config = config
+        self.workers = workers or cpu_count() or 1
+
+    def image_to_text(self, image):
+        return self.image_to_string(image, config=self.config).strip()
+
+    def image_to_data(self, image):
+        """
+        Word-level results: dict of lists (text, left, top, width, height,
+        conf, block_num, par_num, line_num), as pytesseract's image_to_data.
+        """
+        return self._image_to_data(image, config=self.config, output_type=self.output_dict)
+
+    def batch_to_text(self, images):
+        images = list(images)
+        if len(images) <= 1:
+            return [self.image_to_text(image) for image in images]
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(images))) as pool:
+            return list(pool.map(self.image_to_text, images))
+
+    def close(self):
+        pass
+
+
+class TesserocrBackend:
+    """
+    Warm backend: keeps Tesseract engines (and their language model)
+    loaded in-process via tesserocr, so each call skips process startup,
+    temp files and model loading.
+
+    An engine can only be used by one thread at a time, so callers borrow
+    one from a pool of at most `workers` engines (created as they are
+    first needed and kept until close()). Batches run on one persistent
+    thread pool; tesserocr releases the GIL while recognizing.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, psm=6, lang='eng', tessdata_path=None, workers=None, whitelist=None):
+        from tesserocr import PyTessBaseAPI
+
+        self.api_class = PyTessBaseAPI
+        self.psm = psm
+        self.whitelist = whitelist
+        self.lang = lang
+        self.tessdata_path = tessdata_path
+        self.workers = workers or cpu_count() or 1
+        self.engines = []
+        self.idle = Queue()
+        self.lock = Lock()
+        self.executor = None
+        # First engine created up front, so missing language data fails here
+        self.idle.put(self._new_engine())
+
+    def _new_engine(self):
+        kwargs = {'lang': self.lang, 'psm': self.psm}
+        if self.tessdata_path:
+            kwargs['path'] = self.tessdata_path
+        api = self.api_class(**kwargs)
+        if self.whitelist:
+            api.SetVariable('tessedit_char_whitelist', self.whitelist)
+        self.engines.append(api)
+        return api
+
+    @contextmanager
+    def _engine(self):
+        """
+        Borrow an idle engine, creating one while fewer than `workers`
+        exist, otherwise waiting for one to be returned.
+        """
+        try:
+            api = self.idle.get_nowait()
+        except Empty:
+            with self.lock:
+                api = self._new_engine() if len(self.engines) < self.workers else None
+            if api is None:
+                api = self.idle.get()
+        try:
+            yield api
+        finally:
+            self.idle.put(api)
+
+    def image_to_text(self, image):
+        with self._engine() as api:
+            api.SetImage(image)
+            return api.GetUTF8Text().strip()
+
+    def image_to_data(self, image):
+        """
+        Word-level results in the same dict-of-lists shape as
+        PytesseractBackend.image_to_data.
+        """
+        from tesserocr import RIL, iterate_level
+
+        fields = ('text', 'left', 'top', 'width', 'height', 'conf', 'block_num', 'par_num', 'line_num')
+        data = {field: [] for field in fields}
+        block = paragraph = line = 0
+        with self._engine() as api:
+            api.SetImage(image)
+            api.Recognize()
+            for word in iterate_level(api.GetIterator(), RIL.WORD):
+                if word.IsAtBeginningOf(RIL.BLOCK):
+                    block, paragraph, line = block + 1, 0, 0
+                if word.IsAtBeginningOf(RIL.PARA):
+                    paragraph, line = paragraph + 1, 0
+                if word.IsAtBeginningOf(RIL.TEXTLINE):
+                    line += 1
+                box = word.BoundingBox(RIL.WORD)
+                if box is None:
+                    continue
+                left, top, right, bottom = box
+                for field, value in zip(fields, (word.GetUTF8Text(RIL.WORD) or '', left, top, right - left,
+                                                 bottom - top, word.Confidence(RIL.WORD), block, paragraph, line)):
+                    data[field].append(value)
+        return data
+
+    def batch_to_text(self, images):
+        images = list(images)
+        if len(images) <= 1:
+            return [self.image_to_text(image) for image in images]
+
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='tesserocr')
+        return list(self.executor.map(self.image_to_text, images))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        for api in self.engines:
+            api.End()
+        self.engines = []
+        self.idle = Queue()
+
+
+BACKENDS = {
+    PytesseractBackend.name: PytesseractBackend,
+    TesserocrBackend.name: TesserocrBackend,
+}
+
+
+def tesseract_config(psm=6, whitelist=None):
+    """
+    Build the pytesseract config string for a page segmentation mode and
+    optional character whitelist.
+    """
+    config = f'--oem 3 --psm {psm}'
+    if whitelist:
+        config += f' -c tessedit_char_whitelist={whitelist}'
+    return config
+
+
+def get_backend(name='auto', workers=None, tessdata_path=None, psm=6, whitelist=None):
+    """
+    Create an OCR backend by name.
+
+    'auto' prefers the warm tesserocr engine and falls back to pytesseract
+    when tesserocr (or its language data) is not available.
+    """
+    if name in ('auto', TesserocrBackend.name):
+        try:
+            return TesserocrBackend(psm=psm, tessdata_path=tessdata_path, workers=workers, whitelist=whitelist)
+        except (ImportError, RuntimeError):
+            if name != 'auto':
+                raise
+
+    if name not in BACKENDS and name != 'auto':
+        raise ValueError(f"Unknown OCR backend: {name}")
+    return PytesseractBackend(config=tesseract_config(psm, whitelist), workers=workers)
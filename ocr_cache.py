@@ -0,0 +1,177 @@
+from collections import OrderedDict
+from hashlib import blake2b
+from json import dump, load
+from os import replace
+from os.path import exists
+from threading import Lock
+import numpy as np
+
+
+class CacheKey(str):
+    """
+    A cache key. In perceptual mode it also carries the (size, bitmap)
+    signature it was computed from, for near-match lookups.
+    """
+
+    signature = None
+
+
+class OCRCache:
+    """
+    LRU cache of OCR results keyed by the pixels of the stats region.
+
+    Modes:
+        'exact':      hash of the raw pixel bytes; only a pixel-for-pixel
+                      identical crop is a hit.
+        'perceptual': the crop is converted to grayscale and binarized; a
+                      lookup also matches a cached crop of the same size
+                      whose bitmap differs in at most max_pixel_diff
+                      pixels. Antialiasing noise only flips the odd edge
+                      pixel, while a changed digit flips dozens.
+    """
+
+    def __init__(self, max_entries=256, mode='exact', path=None, threshold=128, max_pixel_diff=6):
+        if mode not in ('exact', 'perceptual'):
+            raise ValueError(f"Unknown cache mode: {mode}")
+
+        self.max_entries = max_entries
+        self.mode = mode
+        self.path = path
+        self.threshold = threshold
+        self.max_pixel_diff = max_pixel_diff
+        self.entries = OrderedDict()
+        # Perceptual mode only: key -> (size, packed bitmap)
+        self.signatures = {}
+        # Extractors on several pipeline threads may share one cache
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path and exists(path):
+            self.load()
+
+    def key(self, image):
+        """
+        Compute the cache key for a PIL image (a CacheKey, usable as a str).
+        """
+        if self.mode == 'exact':
+            digest = blake2b(image.tobytes(), digest_size=16)
+            digest.update(f"{image.mode}:{image.size}".encode())
+            return digest.hexdigest()
+
+        bitmap = np.packbits(np.asarray(image.convert('L')) >= self.threshold)
+        digest = blake2b(bitmap.tobytes(), digest_size=16)
+        digest.update(f"perceptual:{image.size}".encode())
+        key = CacheKey(digest.hexdigest())
+        key.signature = (image.size, bitmap)
+        return key
+
+    def get(self, key):
+        """
+        Return the cached (words, wpm) for key, or None on a miss.
+        """
+        with self.lock:
+            if key not in self.entries and self.mode == 'perceptual':
+                key = self._find_similar(key)
+
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, metrics):
+        """
+        Store (words, wpm) for key, evicting the least recently used entry.
+        """
+        signature = getattr(key, 'signature', None)
+        # Store a plain str, so the bitmap is only kept in self.signatures
+        key = str(key)
+        with self.lock:
+            if self.mode == 'perceptual' and signature is not None:
+                self.signatures[key] = signature
+
+            self.entries[key] = tuple(metrics)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                evicted, _ = self.entries.popitem(last=False)
+                self.signatures.pop(evicted, None)
+
+            if self.path:
+                self.save()
+
+    def _find_similar(self, key):
+        """
+        Find a cached key whose bitmap is within max_pixel_diff of the
+        bitmap that produced key.
+        """
+        signature = getattr(key, 'signature', None)
+        if signature is None:
+            return key
+
+        size, bitmap = signature
+        for cached_key, (cached_size, cached_bitmap) in reversed(self.signatures.items()):
+            if cached_size != size:
+                continue
+            if int(np.unpackbits(bitmap ^ cached_bitmap).sum()) <= self.max_pixel_diff:
+                return cached_key
+
+        return key
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.signatures.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Return hit/miss counters and current size.
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'entries': len(self.entries),
+            'max_entries': self.max_entries,
+        }
+
+    def load(self):
+        """
+        Load persisted entries (oldest first) from self.path.
+        """
+        with open(self.path, 'r') as f:
+            data = load(f)
+
+        if data.get('mode') != self.mode:
+            return
+
+        for key, metrics, *signature in data.get('entries', []):
+            self.entries[key] = tuple(metrics)
+            if signature:
+                size, bitmap = signature[0]
+                self.signatures[key] = (tuple(size), np.frombuffer(bytes.fromhex(bitmap), dtype=np.uint8))
+        while len(self.entries) > self.max_entries:
+            evicted, _ = self.entries.popitem(last=False)
+            self.signatures.pop(evicted, None)
+
+    def save(self):
+        """
+        Persist entries to self.path (written atomically via a temp file).
+        """
+        entries = []
+        for key, metrics in self.entries.items():
+            entry = [key, list(metrics)]
+            if key in self.signatures:
+                size, bitmap = self.signatures[key]
+                entry.append([list(size), bitmap.tobytes().hex()])
+            entries.append(entry)
+
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as f:
+            dump({'mode': self.mode, 'entries': entries}, f)
+        replace(temp_path, self.path)
@@ -1,19 +1,69 @@
-from pytesseract import image_to_string, pytesseract
-from PIL.Image import open
+from PIL.Image import Image, fromarray, open
 from re import search, IGNORECASE
+from ocr_backends import get_backend
+from preprocess import STATS_WHITELIST, preprocess_stats_image
+from profiler import span
 
 class OCRExtractor:
-    def __init__(self):
-        # Specify the path to the Tesseract executable
-        pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+    def __init__(self, cache=None, backend='auto', preprocess=False, recognizer=None):
+        # OCR engine: a backend name ('auto', 'tesserocr', 'pytesseract')
+        # or a backend object. 'auto' keeps a warm tesserocr engine when
+        # available and falls back to one pytesseract process per image.
+        # With preprocess=True crops are binarized and joined into a single
+        # line, so the engine runs single-line mode (psm 7) with a whitelist.
+        self.preprocess = preprocess
+        if isinstance(backend, str):
+            if preprocess:
+                backend = get_backend(backend, psm=7, whitelist=STATS_WHITELIST)
+            else:
+                backend = get_backend(backend)
+        self.backend = backend
 
-    def extract_text_from_image(self, image_path):
+        # Optional OCRCache; unchanged stats regions skip Tesseract entirely
+        self.cache = cache
+
+        # Optional DigitRecognizer tried before Tesseract; low-confidence
+        # reads fall back to Tesseract, whose good reads refresh its templates
+        self.recognizer = recognizer
+        self.last_confidence = None
+
+    def load_image(self, image):
+        """
+        Accept a PIL image, a NumPy RGB/grayscale array or a file path.
+        Return: PIL Image object
+        """
+        if isinstance(image, Image):
+            return image
+        if hasattr(image, '__array_interface__'):
+            return fromarray(image)
+        return open(image)
+
+    def extract_text_from_image(self, image):
+        """
+        Extract all text from the image (PIL image, array or path) using OCR.
+        """
+        return self.ocr_image(self.load_image(image))
+
+    def ocr_image(self, image):
+        """
+        Run Tesseract on an already loaded PIL image.
         """
-        Extract all text from the image using OCR.
+        if self.preprocess:
+            with span('ocr.preprocess'):
+                image = preprocess_stats_image(image)
+        with span('ocr.tesseract'):
+            return self.backend.image_to_text(image)
+
+    def extract_text_batch(self, images):
+        """
+        Run OCR on many images (PIL images, arrays or paths), spread across
+        the backend's workers.
+        Return: list of texts in the same order as images
         """
-        image = open(image_path)
-        text = image_to_string(image, config='--oem 3 --psm 6')
-        return text.strip()
+        images = [self.load_image(image) for image in images]
+        if self.preprocess:
+            images = [preprocess_stats_image(image) for image in images]
+        return self.backend.batch_to_text(images)
 
     def parse_metrics(self, text):
         words = search(r'(\d+)\s*words?', text, IGNORECASE)
@@ -26,16 +76,109 @@ class OCRExtractor:
 
         return words, wpm
 
-    def extract_metrics(self, image_path):
+    def extract_metrics(self, image):
         """
         Extract the words and WPM from the image using OCR.
+        The image may be a PIL image, a NumPy array or a file path.
         Return: tuple (words, wpm)
         """
-        
-        text = self.extract_text_from_image(image_path)
-        words, wpm = self.parse_metrics(text)
+        with span('ocr.load'):
+            image = self.load_image(image)
+
+        if self.cache is None:
+            return self.read_metrics(image)
+
+        with span('ocr.cache'):
+            key = self.cache.key(image)
+            metrics = self.cache.get(key)
+        if metrics is not None:
+            return metrics
+
+        words, wpm = self.read_metrics(image)
+        # Only remember complete reads so a bad frame is retried next time
+        if words is not None and wpm is not None:
+            self.cache.put(key, (words, wpm))
+        return words, wpm
+
+    def recognize_fast(self, image):
+        """
+        Try the template recognizer.
+        Return: (words, wpm) if it is confident, else None
+        """
+        if self.recognizer is None:
+            return None
+
+        with span('ocr.template'):
+            metrics, self.last_confidence = self.recognizer.recognize(image)
+        if self.last_confidence >= self.recognizer.min_confidence:
+            return metrics
+        return None
+
+    def learn(self, image, words, wpm):
+        """
+        Feed a complete Tesseract read back into the template recognizer.
+        """
+        if self.recognizer is not None and words is not None and wpm is not None:
+            self.recognizer.learn(image, words, wpm)
+
+    def read_metrics(self, image):
+        """
+        Read (words, wpm) from a loaded image: template fast path first,
+        Tesseract otherwise.
+        """
+        metrics = self.recognize_fast(image)
+        if metrics is not None:
+            return metrics
+
+        text = self.ocr_image(image)
+        with span('ocr.parse'):
+            words, wpm = self.parse_metrics(text)
+        self.learn(image, words, wpm)
         return words, wpm
 
+    def extract_metrics_batch(self, images):
+        """
+        Extract the words and WPM from many images.
+        Return: list of (words, wpm) tuples
+        """
+        images = [self.load_image(image) for image in images]
+        results = [None] * len(images)
+        keys = list(range(len(images)))
+        if self.cache is not None:
+            with span('ocr.cache'):
+                keys = [self.cache.key(image) for image in images]
+                results = [self.cache.get(key) for key in keys]
+
+        # Each distinct missed crop is read once, even if it repeats in the batch
+        first_miss = {}
+        for i, metrics in enumerate(results):
+            if metrics is None:
+                first_miss.setdefault(keys[i], i)
+        misses = list(first_miss.values())
+        for i in misses:
+            results[i] = self.recognize_fast(images[i])
+
+        # Only the crops the recognizer wasn't sure about go to Tesseract
+        pending = [i for i in misses if results[i] is None]
+        texts = self.extract_text_batch([images[i] for i in pending])
+        for i, text in zip(pending, texts):
+            results[i] = self.parse_metrics(text)
+            self.learn(images[i], *results[i])
+
+        if self.cache is not None:
+            for i in misses:
+                words, wpm = results[i]
+                # Only remember complete reads so a bad frame is retried next time
+                if words is not None and wpm is not None:
+                    self.cache.put(keys[i], (words, wpm))
+        return [results[first_miss[keys[i]]] if results[i] is None else results[i] for i in range(len(images))]
+
+    def close(self):
+        """
+        Release the OCR engine(s) held by the backend.
+        """
+        self.backend.close()
+
 if __name__ == "__main__":
     words, wpm = OCRExtractor().extract_metrics("stats.png")
     print(f"Words: {words}, WPM: {wpm}")
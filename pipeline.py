@@ -0,0 +1,231 @@
+from collections import deque
+from asyncio import Queue, QueueEmpty, gather, get_running_loop, run, sleep
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, time
+
+from calculator import SavingsCalculator
+
+# Marks the end of the stream; never dropped by backpressure
+STOP = object()
+
+
+class StageStats:
+    """
+    Counters for one pipeline stage and the queue feeding it.
+    """
+
+    def __init__(self, name, queue=None):
+        self.name = name
+        self.queue = queue
+        self.processed = 0
+        self.dropped = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self.started = None
+        self.finished = None
+
+    def observe_depth(self):
+        if self.queue is not None:
+            self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    def as_dict(self):
+        elapsed = ((self.finished or monotonic()) - self.started) if self.started else 0.0
+        return {
+            'processed': self.processed,
+            'dropped_stale': self.dropped,
+            'throughput_per_second': self.processed / elapsed if elapsed else 0.0,
+            'mean_busy_ms': self.busy_seconds / self.processed * 1000 if self.processed else 0.0,
+            'queue_depth': self.queue.qsize() if self.queue is not None else 0,
+            'max_queue_depth': self.max_depth,
+        }
+
+
+def put_latest(queue, item, stats):
+    """
+    Put item without waiting; if the queue is full, drop the oldest queued
+    item so consumers always see the freshest frame.
+    """
+    while queue.full():
+        try:
+            queue.get_nowait()
+            stats.dropped += 1
+        except QueueEmpty:
+            break
+    queue.put_nowait(item)
+    stats.observe_depth()
+
+
+class CapturePipeline:
+    """
+    capture -> preprocess -> OCR -> calculate, as asyncio stages joined by
+    small bounded queues.
+
+    Blocking work (screen grabs, preprocessing, tesseract) runs in a thread
+    pool so a slow OCR call never holds up the next capture. When a
+    downstream stage falls behind, the oldest queued frame is dropped
+    instead of building a backlog.
+
+    source: anything with grab() returning a PIL image (or None)
+    preprocess: optional function image -> image run before OCR
+    extractor_factory: creates one extractor per OCR worker, since OCR
+                       engines can't be shared between threads; a single
+                       `extractor` only serves ocr_workers=1
+    """
+
+    def __init__(self, source, settings, extractor=None, calculator=None, preprocess=None, on_result=None,
+                 queue_size=2, ocr_workers=1, capture_interval=0.0, executor=None, keep_results=1000,
+                 extractor_factory=None):
+        if extractor is not None:
+            if ocr_workers > 1:
+                raise ValueError("One extractor can't serve several OCR workers; pass extractor_factory instead")
+            extractors = [extractor]
+        else:
+            if extractor_factory is None:
+                from ocr_extractor import OCRExtractor
+                extractor_factory = OCRExtractor
+            extractors = [extractor_factory() for _ in range(ocr_workers)]
+
+        self.source = source
+        self.settings = settings
+        # Each OCR worker only ever runs one extraction at a time, on its own extractor
+        self.extractors = extractors
+        self.extractor = extractors[0]
+        self.calculator = calculator or SavingsCalculator()
+        self.preprocess = preprocess
+        self.on_result = on_result
+        self.ocr_workers = ocr_workers
+        self.capture_interval = capture_interval
+        self.executor = executor or ThreadPoolExecutor(max_workers=ocr_workers + 2)
+        # Most recent results only, so long runs stay bounded in memory
+        self.results = deque(maxlen=keep_results)
+        self.ocr_running = 0
+
+        self.preprocess_queue = Queue(maxsize=queue_size)
+        self.ocr_queue = Queue(maxsize=queue_size)
+        self.calculate_queue = Queue(maxsize=queue_size)
+        self.stage_stats = {
+            'capture': StageStats('capture'),
+            'preprocess': StageStats('preprocess', self.preprocess_queue),
+            'ocr': StageStats('ocr', self.ocr_queue),
+            'calculate': StageStats('calculate', self.calculate_queue),
+        }
+
+    async def _blocking(self, stats, function, *args):
+        start = monotonic()
+        result = await get_running_loop().run_in_executor(self.executor, function, *args)
+        stats.busy_seconds += monotonic() - start
+        return result
+
+    async def _capture(self, max_frames, duration):
+        stats = self.stage_stats['capture']
+        deadline = monotonic() + duration if duration else None
+
+        while (max_frames is None or stats.processed < max_frames) and (deadline is None or monotonic() < deadline):
+            frame = await self._blocking(stats, self.source.grab)
+            if frame is not None:
+                stats.processed += 1
+                put_latest(self.preprocess_queue, (time(), frame), self.stage_stats['preprocess'])
+            elif getattr(self.source, 'exhausted', False):
+                # A replayed recording ran out of frames
+                break
+            await sleep(self.capture_interval)
+
+        stats.finished = monotonic()
+        await self.preprocess_queue.put(STOP)
+
+    async def _preprocess(self):
+        stats = self.stage_stats['preprocess']
+        while (item := await self.preprocess_queue.get()) is not STOP:
+            captured_at, frame = item
+            if self.preprocess is not None:
+                frame = await self._blocking(stats, self.preprocess, frame)
+            stats.processed += 1
+            put_latest(self.ocr_queue, (captured_at, frame), self.stage_stats['ocr'])
+
+        stats.finished = monotonic()
+        for _ in range(self.ocr_workers):
+            await self.ocr_queue.put(STOP)
+
+    async def _ocr(self, extractor):
+        stats = self.stage_stats['ocr']
+        while (item := await self.ocr_queue.get()) is not STOP:
+            captured_at, frame = item
+            words, wpm = await self._blocking(stats, extractor.extract_metrics, frame)
+            stats.processed += 1
+            if words is not None and wpm:
+                put_latest(self.calculate_queue, (captured_at, words, wpm), self.stage_stats['calculate'])
+
+        # The last OCR worker to finish ends the stream, so STOP is never
+        # queued ahead of (and dropped by) another worker's put_latest
+        self.ocr_running -= 1
+        if not self.ocr_running:
+            stats.finished = monotonic()
+            await self.calculate_queue.put(STOP)
+
+    async def _calculate(self):
+        stats = self.stage_stats['calculate']
+        while (item := await self.calculate_queue.get()) is not STOP:
+            captured_at, words, wpm = item
+            start = monotonic()
+            savings = self.calculator.calculate_complete_savings(
+                words,
+                wpm,
+                self.settings['typing_wpm'],
+                self.settings['subscription_type'],
+                self.settings['hourly_rate'],
+                self.settings['daily_words'],
+            )
+            stats.busy_seconds += monotonic() - start
+            stats.processed += 1
+
+            result = {'timestamp': captured_at, 'latency': time() - captured_at, 'words': words, 'wpm': wpm,
+                      'savings': savings}
+            self.results.append(result)
+            if self.on_result is not None:
+                self.on_result(result)
+
+        stats.finished = monotonic()
+
+    async def run(self, max_frames=None, duration=None):
+        """
+        Run all stages until max_frames frames were captured or duration
+        seconds passed, then drain the queues.
+        Return: per-stage stats (see stats())
+        """
+        started = monotonic()
+        for stats in self.stage_stats.values():
+            stats.started = started
+        self.ocr_running = self.ocr_workers
+
+        await gather(
+            self._capture(max_frames, duration),
+            self._preprocess(),
+            *(self._ocr(extractor) for extractor in self.extractors),
+            self._calculate(),
+        )
+        return self.stats()
+
+    def stats(self):
+        return {name: stats.as_dict() for name, stats in self.stage_stats.items()}
+
+
+if __name__ == "__main__":
+    from json import load
+    from monitor import WindowFrameSource
+
+    with open('computer_inputs.json', 'r') as f:
+        settings = load(f)
+
+    pipeline = CapturePipeline(
+        WindowFrameSource(),
+        settings,
+        capture_interval=1.0,
+        on_result=lambda result: print(f"{result['words']} words @ {result['wpm']} WPM "
+                                       f"({result['latency'] * 1000:.0f} ms capture-to-result)"),
+    )
+    try:
+        run(pipeline.run())
+    except KeyboardInterrupt:
+        pass
+    for name, stats in pipeline.stats().items():
+        print(f"{name}: {stats}")
@@ -0,0 +1,122 @@
+from math import ceil
+from PIL.Image import fromarray
+import numpy as np
+
+# ITU-R 601 luma weights, as used by PIL's convert('L')
+LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+# Characters that can appear in "372 words" / "126 WPM"
+STATS_WHITELIST = "0123456789wordsWPM"
+
+
+def to_grayscale(pixels):
+    """
+    Convert an RGB(A) or grayscale array to float32 grayscale.
+    """
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        return pixels.astype(np.float32)
+    return pixels[..., :3].astype(np.float32) @ LUMA
+
+
+def local_mean(gray, block):
+    """
+    Mean over a block x block window around every pixel, via an integral
+    image (edges are padded by replication).
+    """
+    before = block // 2
+    after = block - 1 - before
+    padded = np.pad(gray, ((before, after), (before, after)), mode='edge')
+
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), dtype=np.float64)
+    integral[1:, 1:] = padded.cumsum(0).cumsum(1)
+
+    sums = integral[block:, block:] - integral[:-block, block:] - integral[block:, :-block] + integral[:-block, :-block]
+    return sums / (block * block)
+
+
+def adaptive_threshold(gray, block=25, offset=8):
+    """
+    Mark text pixels by comparing each pixel with its local mean.
+    Handles both dark-on-light and light-on-dark themes.
+    Return: boolean ink mask (True = text)
+    """
+    mean = local_mean(gray, block)
+    if np.median(gray) >= 128:
+        return gray < mean - offset
+    return gray > mean + offset
+
+
+def autocrop(ink, margin=0):
+    """
+    Crop an ink mask to the bounding box of its text pixels.
+    """
+    rows = np.flatnonzero(ink.any(axis=1))
+    cols = np.flatnonzero(ink.any(axis=0))
+    if rows.size == 0:
+        return ink
+
+    top, bottom = max(rows[0] - margin, 0), min(rows[-1] + 1 + margin, ink.shape[0])
+    left, right = max(cols[0] - margin, 0), min(cols[-1] + 1 + margin, ink.shape[1])
+    return ink[top:bottom, left:right]
+
+
+def text_lines(ink):
+    """
+    Find horizontal bands of text rows.
+    Return: list of (start, end) row ranges
+    """
+    profile = np.concatenate(([0], ink.any(axis=1).astype(np.int8), [0]))
+    edges = np.flatnonzero(np.diff(profile))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def join_lines(ink):
+    """
+    Lay the text lines of an ink mask side by side, so a two-line stats
+    crop can be read with single-line page segmentation in one call.
+    """
+    lines = [autocrop(ink[start:end]) for start, end in text_lines(ink)]
+    if len(lines) <= 1:
+        return autocrop(ink)
+
+    height = max(line.shape[0] for line in lines)
+    gap = np.zeros((height, height), dtype=bool)
+    padded = [np.pad(line, ((0, height - line.shape[0]), (0, 0))) for line in lines]
+
+    pieces = [padded[0]]
+    for line in padded[1:]:
+        pieces.extend((gap, line))
+    return np.hstack(pieces)
+
+
+def upscale(ink, factor):
+    """
+    Integer nearest-neighbour upscale.
+    """
+    if factor <= 1:
+        return ink
+    return np.repeat(np.repeat(ink, factor, axis=0), factor, axis=1)
+
+
+def preprocess_stats_image(image, scale=None, target_height=32, max_scale=4, single_line=True, margin=6,
+                           block=25, offset=8):
+    """
+    Prepare a stats crop for Tesseract: grayscale, adaptive threshold,
+    tight crop around the text (optionally joined into one line), integer
+    upscale, and black text on a white margin.
+
+    scale: upscale factor; None picks the smallest factor that makes the
+           tallest text line at least target_height pixels (up to max_scale).
+    Return: PIL 'L' image
+    """
+    ink = adaptive_threshold(to_grayscale(image), block, offset)
+    ink = join_lines(ink) if single_line else autocrop(ink)
+
+    if scale is None:
+        lines = text_lines(ink)
+        line_height = max((end - start for start, end in lines), default=target_height)
+        scale = min(max(1, ceil(target_height / line_height)), max_scale)
+
+    pixels = np.where(upscale(ink, scale), 0, 255).astype(np.uint8)
+    return fromarray(np.pad(pixels, margin, constant_values=255))
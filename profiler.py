@@ -0,0 +1,167 @@
+from json import dump
+from os import getpid, replace
+from threading import get_ident
+from time import perf_counter_ns
+
+
+class NullSpan:
+    """
+    Shared do-nothing span handed out while profiling is disabled, so an
+    instrumented call costs one attribute check and two empty calls.
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.profiler.spans.append((self.name, self.start, perf_counter_ns() - self.start, get_ident()))
+        return False
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class Profiler:
+    """
+    Collects timing spans for the stages of a run (window search, grab,
+    crop, OCR, calculation, ...).
+
+    Disabled by default: span() then returns NULL_SPAN and nothing is
+    recorded. Enabled, every span is kept as (name, start, duration,
+    thread) with perf_counter_ns timestamps.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.spans = []
+
+    def span(self, name):
+        """
+        Context manager timing the block under name.
+        """
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name)
+
+    def durations(self):
+        """
+        Return: dict of stage name -> list of durations in seconds, in
+                the order the stages first ran
+        """
+        durations = {}
+        for name, _, duration, _ in self.spans:
+            durations.setdefault(name, []).append(duration / 1e9)
+        return durations
+
+    def summary(self):
+        """
+        Return: dict of stage name -> count, total, mean, p50, p95, p99 and
+                max (seconds)
+        """
+        summary = {}
+        for name, values in self.durations().items():
+            values.sort()
+            summary[name] = {
+                'count': len(values),
+                'total': sum(values),
+                'mean': sum(values) / len(values),
+                'p50': percentile(values, 0.50),
+                'p95': percentile(values, 0.95),
+                'p99': percentile(values, 0.99),
+                'max': values[-1],
+            }
+        return summary
+
+    def format_report(self):
+        """
+        Per-stage breakdown as a printable table.
+        """
+        summary = self.summary()
+        if not summary:
+            return "⏱️  No profiling spans recorded"
+
+        width = max(len(name) for name in summary)
+        output = [
+            "⏱️  Stage timings (ms)",
+            f"{'stage':<{width}}  {'count':>6}  {'total':>10}  {'mean':>9}  {'p50':>9}  {'p95':>9}  {'p99':>9}",
+        ]
+        for name, stats in summary.items():
+            output.append(
+                f"{name:<{width}}  {stats['count']:>6}  {stats['total'] * 1000:>10.2f}  {stats['mean'] * 1000:>9.3f}  "
+                f"{stats['p50'] * 1000:>9.3f}  {stats['p95'] * 1000:>9.3f}  {stats['p99'] * 1000:>9.3f}"
+            )
+        return "\n".join(output)
+
+    def write_trace(self, path):
+        """
+        Save the spans in Chrome trace-event format (chrome://tracing,
+        Perfetto), plus the per-stage summary.
+        """
+        pid = getpid()
+        origin = min((start for _, start, _, _ in self.spans), default=0)
+        events = [
+            {'name': name, 'cat': name.split('.')[0], 'ph': 'X', 'pid': pid, 'tid': thread,
+             'ts': (start - origin) / 1000, 'dur': duration / 1000}
+            for name, start, duration, thread in self.spans
+        ]
+        write_atomic(path, lambda f: dump({'traceEvents': events, 'summary': self.summary()}, f, indent=1))
+
+    def write_prometheus(self, path, metric='wisprflow_stage_seconds'):
+        """
+        Save the per-stage latencies as a Prometheus text-format summary,
+        e.g. for node_exporter's textfile collector.
+        """
+        lines = [
+            f"# HELP {metric} Time spent in each measurement stage.",
+            f"# TYPE {metric} summary",
+        ]
+        for name, stats in self.summary().items():
+            for quantile, key in (('0.5', 'p50'), ('0.95', 'p95'), ('0.99', 'p99')):
+                lines.append(f'{metric}{{stage="{name}",quantile="{quantile}"}} {stats[key]:.9f}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {stats["total"]:.9f}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {stats["count"]}')
+        write_atomic(path, lambda f: f.write("\n".join(lines) + "\n"))
+
+
+def write_atomic(path, write):
+    # Scrapers may read the file at any time; never expose a partial one
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as f:
+        write(f)
+    replace(temp_path, path)
+
+
+# Process-wide profiler used by the instrumented modules
+PROFILER = Profiler()
+span = PROFILER.span
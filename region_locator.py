@@ -0,0 +1,203 @@
+from json import dump, load
+from os import replace
+from os.path import exists
+from re import fullmatch
+from threading import Lock
+from time import time
+
+
+def display_scale(monitor=None):
+    """
+    Return a display's scaling factor (1.0 = 100%): the one showing the
+    given mss monitor dict, or the primary display.
+    Only Windows reports one; elsewhere this is 1.0.
+    """
+    try:
+        from ctypes import byref, c_int, c_void_p, windll
+        from ctypes.wintypes import POINT
+        if monitor is None:
+            return windll.shcore.GetScaleFactorForDevice(0) / 100
+
+        center = POINT(monitor['left'] + monitor['width'] // 2, monitor['top'] + monitor['height'] // 2)
+        windll.user32.MonitorFromPoint.restype = c_void_p
+        # MONITOR_DEFAULTTOPRIMARY
+        handle = windll.user32.MonitorFromPoint(center, 1)
+        scale = c_int()
+        windll.shcore.GetScaleFactorForMonitor(c_void_p(handle), byref(scale))
+        return scale.value / 100
+    except (ImportError, AttributeError, OSError):
+        return 1.0
+
+
+# Full-page OCR engine for calibration, created on first use
+_backend = None
+_backend_lock = Lock()
+
+
+def tesseract_words(image):
+    """
+    Word-level Tesseract output for an image (a whole window, so automatic
+    page segmentation), as a pytesseract-style data dict. Goes through
+    ocr_backends, so either tesserocr or pytesseract will do.
+    """
+    global _backend
+    from ocr_backends import get_backend
+
+    with _backend_lock:
+        if _backend is None:
+            _backend = get_backend('auto', workers=1, psm=3)
+    return _backend.image_to_data(image)
+
+
+class RegionLocator:
+    """
+    Finds the tight rectangle around "<n> words" and "<n> WPM" once, with
+    Tesseract's word bounding boxes, and caches it per layout key (screen
+    resolution, display scale and window size).
+
+    A cached layout is dropped after max_failures consecutive captures that
+    did not produce a valid read, so the next capture recalibrates. A
+    calibration that finds nothing (or fails, e.g. without Tesseract) is
+    not retried for retry_seconds, across runs; captures use the fixed
+    fractions meanwhile.
+    """
+
+    def __init__(self, path='layout_cache.json', padding=0.5, max_failures=3, retry_seconds=60.0, ocr_data=tesseract_words):
+        self.path = path
+        self.padding = padding
+        self.max_failures = max_failures
+        self.retry_seconds = retry_seconds
+        self.ocr_data = ocr_data
+        self.layouts = {}
+        self.failures = {}
+        # Layout key -> time of the last calibration that found nothing
+        self.failed_calibrations = {}
+        self.last_error = None
+        self.save_lock = Lock()
+
+        if path and exists(path):
+            with open(path, 'r') as f:
+                data = load(f)
+            self.layouts = {key: tuple(box) for key, box in data.get('layouts', {}).items()}
+            self.failures = data.get('failures', {})
+            self.failed_calibrations = data.get('failed_calibrations', {})
+
+    def layout_key(self, screen_size, scale, window_size):
+        return f"{screen_size[0]}x{screen_size[1]}@{scale:g}:{window_size[0]}x{window_size[1]}"
+
+    def get(self, key):
+        """
+        Return the cached (left, top, right, bottom) box for key, or None.
+        """
+        return self.layouts.get(key)
+
+    def should_calibrate(self, key):
+        """
+        True when key has no layout and wasn't just tried without success.
+        """
+        if key in self.layouts:
+            return False
+        failed_at = self.failed_calibrations.get(key)
+        return failed_at is None or not 0 <= time() - failed_at < self.retry_seconds
+
+    def locate(self, image):
+        """
+        Find the metrics rectangle in an image of the whole window.
+        Return: (left, top, right, bottom) box, or None if not found
+        """
+        data = self.ocr_data(image)
+        boxes = []
+
+        for label in ('words', 'wpm'):
+            box = self._token_with_number(data, label)
+            if box is None:
+                return None
+            boxes.append(box)
+
+        left = min(box[0] for box in boxes)
+        top = min(box[1] for box in boxes)
+        right = max(box[2] for box in boxes)
+        bottom = max(box[3] for box in boxes)
+
+        # Pad by a fraction of the line height so antialiasing isn't clipped
+        pad = int(max(box[3] - box[1] for box in boxes) * self.padding)
+        width, height = image.size
+        return (max(left - pad, 0), max(top - pad, 0), min(right + pad, width), min(bottom + pad, height))
+
+    def _token_with_number(self, data, label):
+        """
+        Bounding box of the label token together with the number just
+        before it on the same line.
+        """
+        texts = [text.strip().lower() for text in data['text']]
+        for i in range(1, len(texts)):
+            if not texts[i].startswith(label) or not fullmatch(r'[\d,]+', texts[i - 1]):
+                continue
+            same_line = all(data[field][i] == data[field][i - 1] for field in ('block_num', 'par_num', 'line_num'))
+            if not same_line:
+                continue
+
+            left = data['left'][i - 1]
+            top = min(data['top'][i - 1], data['top'][i])
+            right = data['left'][i] + data['width'][i]
+            bottom = max(data['top'][i - 1] + data['height'][i - 1], data['top'][i] + data['height'][i])
+            return (left, top, right, bottom)
+
+        return None
+
+    def calibrate(self, key, image, offset=(0, 0)):
+        """
+        Locate the metrics in image and cache the box under key, shifted by
+        offset (the image's position inside the window).
+        Return: the box, or None if the metrics weren't found
+        """
+        try:
+            box = self.locate(image)
+        except Exception as e:
+            self.calibration_failed(key, e)
+            return None
+        if box is None:
+            self.calibration_failed(key)
+            return None
+
+        box = (box[0] + offset[0], box[1] + offset[1], box[2] + offset[0], box[3] + offset[1])
+        self.layouts[key] = box
+        self.failures[key] = 0
+        self.failed_calibrations.pop(key, None)
+        self.save()
+        return box
+
+    def calibration_failed(self, key, error=None):
+        """
+        Remember that calibrating key found nothing (or raised error), so it
+        isn't retried for retry_seconds.
+        """
+        self.last_error = error
+        self.failed_calibrations[key] = time()
+        self.save()
+
+    def record_read(self, key, valid):
+        """
+        Track whether a capture with key's layout produced a valid read;
+        too many failures in a row invalidate the layout.
+        """
+        if key not in self.layouts:
+            return
+
+        failures = 0 if valid else self.failures.get(key, 0) + 1
+        if failures != self.failures.get(key, 0):
+            self.failures[key] = failures
+            if failures >= self.max_failures:
+                del self.layouts[key]
+                self.failures[key] = 0
+            self.save()
+
+    def save(self):
+        if not self.path:
+            return
+        with self.save_lock:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as f:
+                dump({'layouts': dict(self.layouts), 'failures': dict(self.failures),
+                      'failed_calibrations': dict(self.failed_calibrations)}, f)
+            replace(temp_path, self.path)
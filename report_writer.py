@@ -0,0 +1,289 @@
+from abc import ABC, abstractmethod
+from json import dumps, loads
+from math import isfinite
+from struct import calcsize, pack, unpack
+import numpy as np
+
+from calculator import SavingsCalculator
+from profiler import span
+
+# Inputs of calculate_batch_savings, in argument order
+INPUT_COLUMNS = ('words_spoken', 'speaking_wpm', 'typing_wpm', 'subscription_type', 'hourly_rate', 'daily_words')
+SUMMARY_COLUMNS = ('speaking_time_minutes', 'typing_time_minutes', 'time_saved_minutes', 'cost_savings',
+                   'words_to_break_even', 'minutes_to_break_even', 'value_saved_per_word')
+ANNUAL_COLUMNS = ('daily_time_saved_minutes', 'daily_value_saved', 'annual_words', 'annual_time_saved_hours',
+                  'annual_value_saved', 'annual_subscription_cost', 'net_annual_savings', 'roi_percentage')
+
+# Every report has these columns, in this order; subscription_type is
+# stored as a code into the calculator's subscription types
+COLUMNS = INPUT_COLUMNS + SUMMARY_COLUMNS + ANNUAL_COLUMNS
+DTYPES = {name: np.dtype('<f8') for name in COLUMNS}
+DTYPES['subscription_type'] = np.dtype('u1')
+
+MAGIC = b'WFREPORT'
+VERSION = 1
+# magic, version, schema length
+HEADER = '<8sHI'
+CHUNK_HEADER = '<I'
+
+# Rows per chunk; a chunk formatted as text takes about 2 KiB per row
+CHUNK_SIZE = 16384
+
+FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.wfr': 'columnar', '.txt': 'text'}
+
+
+def format_for(path):
+    """
+    Report format implied by a file's extension (JSONL when unknown).
+    """
+    for extension, format in FORMATS.items():
+        if path.lower().endswith(extension):
+            return format
+    return 'jsonl'
+
+
+class ReportWriter(ABC):
+    """
+    Streams calculator results to a file in bounded-size chunks.
+
+    Rows come in either as columns (the dict calculate_batch_savings
+    returns plus the inputs it was called with, scalars broadcast) via
+    write_columns, or one calculate_complete_savings result at a time via
+    write_result; scalar rows are buffered until chunk_size of them can be
+    written together. Subclasses only implement write_chunk, which gets a
+    dict of column -> array of at most chunk_size rows.
+    """
+
+    format = None
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, calculator=None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.calculator = calculator or SavingsCalculator()
+        self.subscription_types = list(self.calculator.subscription_costs)
+        self.codes = {name: code for code, name in enumerate(self.subscription_types)}
+        self.pending = []
+        self.rows = 0
+        self.file = self.open()
+
+    def open(self):
+        return open(self.path, 'w', newline='')
+
+    def type_codes(self, subscription_type, rows):
+        # Codes are positions in the calculator's subscription types
+        codes = self.calculator.subscription_type_indices(subscription_type)
+        return np.broadcast_to(codes, (rows,)).astype(DTYPES['subscription_type'])
+
+    def write_columns(self, columns):
+        """
+        Write a batch of rows given as columns, in chunks of at most
+        chunk_size rows.
+        """
+        self.flush_pending()
+        rows = max(np.size(columns[name]) for name in SUMMARY_COLUMNS + ANNUAL_COLUMNS)
+        table = {}
+        for name in COLUMNS:
+            if name == 'subscription_type':
+                table[name] = self.type_codes(columns[name], rows)
+            else:
+                table[name] = np.broadcast_to(np.asarray(columns[name], dtype=DTYPES[name]), (rows,))
+
+        for start in range(0, rows, self.chunk_size):
+            self._write({name: values[start:start + self.chunk_size] for name, values in table.items()})
+
+    def write_result(self, results, words_spoken, speaking_wpm, typing_wpm, hourly_rate, daily_words):
+        """
+        Buffer one calculate_complete_savings result (and its inputs).
+        """
+        summary, annual = results['summary'], results['annual_data']
+        self.pending.append((
+            words_spoken, speaking_wpm, typing_wpm, self.codes[summary['subscription_type']], hourly_rate, daily_words,
+            *(summary[name] for name in SUMMARY_COLUMNS),
+            *(annual[name] for name in ANNUAL_COLUMNS),
+        ))
+        if len(self.pending) >= self.chunk_size:
+            self.flush_pending()
+
+    def flush_pending(self):
+        if not self.pending:
+            return
+        columns = zip(*self.pending)
+        self.pending = []
+        self._write({name: np.array(values, dtype=DTYPES[name]) for name, values in zip(COLUMNS, columns)})
+
+    def _write(self, chunk):
+        with span(f'report.{self.format}'):
+            self.write_chunk(chunk)
+        self.rows += len(chunk['words_spoken'])
+
+    @abstractmethod
+    def write_chunk(self, chunk):
+        """
+        Write one chunk: dict of column -> array, at most chunk_size rows.
+        """
+
+    def subscription_names(self, codes):
+        return np.array(self.subscription_types)[codes]
+
+    def close(self):
+        self.flush_pending()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def text_columns(chunk, subscription_names, null):
+    """
+    Each column of a chunk as a list of strings, formatted once per column
+    (floats as repr, so they read back exactly); non-finite values become
+    `null`.
+    """
+    columns = []
+    for name in COLUMNS:
+        values = chunk[name]
+        if name == 'subscription_type':
+            columns.append(subscription_names(values).tolist())
+            continue
+        text = list(map(repr, values.tolist()))
+        for i in np.flatnonzero(~np.isfinite(values)).tolist():
+            text[i] = null
+        columns.append(text)
+    return columns
+
+
+class CSVReportWriter(ReportWriter):
+    format = 'csv'
+
+    def open(self):
+        f = super().open()
+        f.write(",".join(COLUMNS) + "\n")
+        return f
+
+    def write_chunk(self, chunk):
+        # No value can contain a comma or quote, so rows need no quoting;
+        # an unreachable break-even reads back as float('inf')
+        rows = zip(*text_columns(chunk, self.subscription_names, 'inf'))
+        self.file.write("\n".join(map(",".join, rows)) + "\n")
+
+
+class JSONLReportWriter(ReportWriter):
+    """
+    One JSON object per row; inf (an unreachable break-even) is written as
+    null, since it isn't valid JSON.
+    """
+
+    format = 'jsonl'
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE, calculator=None):
+        super().__init__(path, chunk_size, calculator)
+        self.template = "{" + ", ".join(f"{dumps(name)}: %s" for name in COLUMNS) + "}\n"
+        self.quoted = np.array([dumps(name) for name in self.subscription_types])
+
+    def write_chunk(self, chunk):
+        columns = text_columns(chunk, self.quoted.__getitem__, 'null')
+        template = self.template
+        self.file.writelines(template % row for row in zip(*columns))
+
+
+class ColumnarReportWriter(ReportWriter):
+    """
+    Compact binary columnar file: a header with the schema (column names,
+    dtypes and the subscription type names the codes refer to), then one
+    block per chunk holding its row count and each column's raw values.
+    Read it back with read_columnar.
+    """
+
+    format = 'columnar'
+
+    def open(self):
+        schema = dumps({
+            'columns': [[name, DTYPES[name].str] for name in COLUMNS],
+            'subscription_types': self.subscription_types,
+        }).encode()
+        f = open(self.path, 'wb')
+        f.write(pack(HEADER, MAGIC, VERSION, len(schema)))
+        f.write(schema)
+        return f
+
+    def write_chunk(self, chunk):
+        self.file.write(pack(CHUNK_HEADER, len(chunk['words_spoken'])))
+        for name in COLUMNS:
+            self.file.write(np.ascontiguousarray(chunk[name], dtype=DTYPES[name]).tobytes())
+
+
+class TextReportWriter(ReportWriter):
+    """
+    The human-readable format_results analysis, one per row. Meant for a
+    handful of sessions; the other formats are for bulk reports.
+    """
+
+    format = 'text'
+
+    def write_chunk(self, chunk):
+        types = self.subscription_names(chunk['subscription_type']).tolist()
+        columns = {name: chunk[name].tolist() for name in COLUMNS if name != 'subscription_type'}
+
+        for i, subscription_type in enumerate(types):
+            row = {name: values[i] for name, values in columns.items()}
+            results = {
+                'summary': {**{name: row[name] for name in SUMMARY_COLUMNS}, 'subscription_type': subscription_type},
+                'annual_data': {name: row[name] for name in ANNUAL_COLUMNS},
+            }
+            words_spoken, speaking_wpm, typing_wpm, daily_words = (
+                int(value) if isfinite(value) and value.is_integer() else value
+                for value in (row['words_spoken'], row['speaking_wpm'], row['typing_wpm'], row['daily_words'])
+            )
+            self.file.write(self.calculator.format_results(
+                results,
+                row['hourly_rate'],
+                self.calculator.subscription_costs[subscription_type],
+                words_spoken,
+                speaking_wpm,
+                typing_wpm,
+                daily_words,
+            ) + "\n\n")
+
+
+WRITERS = {
+    'csv': CSVReportWriter,
+    'jsonl': JSONLReportWriter,
+    'columnar': ColumnarReportWriter,
+    'text': TextReportWriter,
+}
+
+
+def open_report(path, format=None, chunk_size=CHUNK_SIZE, calculator=None):
+    """
+    Open a report writer; the format defaults to the file's extension
+    (.csv, .jsonl, .wfr for columnar, .txt for text).
+    """
+    format = format or format_for(path)
+    if format not in WRITERS:
+        raise ValueError(f"Unknown report format: {format}")
+    return WRITERS[format](path, chunk_size, calculator)
+
+
+def read_columnar(path):
+    """
+    Stream a columnar report back one chunk at a time.
+    Yield: dict of column -> array (subscription_type as names)
+    """
+    with open(path, 'rb') as f:
+        magic, version, schema_size = unpack(HEADER, f.read(calcsize(HEADER)))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a columnar report")
+        schema = loads(f.read(schema_size))
+        columns = [(name, np.dtype(dtype)) for name, dtype in schema['columns']]
+        subscription_types = np.array(schema['subscription_types'])
+
+        while header := f.read(calcsize(CHUNK_HEADER)):
+            (rows,) = unpack(CHUNK_HEADER, header)
+            chunk = {}
+            for name, dtype in columns:
+                chunk[name] = np.frombuffer(f.read(rows * dtype.itemsize), dtype=dtype)
+            chunk['subscription_type'] = subscription_types[chunk['subscription_type']]
+            yield chunk
@@ -0,0 +1,333 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from json import dumps, load, loads
+from math import isfinite
+from threading import BoundedSemaphore, Lock, local
+from time import perf_counter
+from urllib.parse import parse_qs, urlsplit
+
+from calculator import SavingsCalculator
+from profiler import percentile
+
+PROFILE_FILES = {'computer': 'computer_inputs.json', 'mobile': 'mobile_inputs.json'}
+
+# Settings a request may override, and their types (query strings arrive as text)
+SETTING_TYPES = {'typing_wpm': float, 'subscription_type': str, 'hourly_rate': float, 'daily_words': float}
+
+
+def load_profiles(files=PROFILE_FILES):
+    """
+    Load every settings profile that exists on disk, once.
+    """
+    profiles = {}
+    for name, path in files.items():
+        try:
+            with open(path, 'r') as f:
+                profiles[name] = load(f)
+        except FileNotFoundError:
+            pass
+    return profiles
+
+
+def json_safe(value):
+    """
+    Replace inf/nan (e.g. an unreachable break-even) with None, since they
+    aren't valid JSON.
+    """
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, float) and not isfinite(value):
+        return None
+    return value
+
+
+class RequestError(Exception):
+    """
+    A request the client got wrong; carries the HTTP status to send.
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyTracker:
+    """
+    Per-endpoint request counts and the latencies of the most recent
+    `window` requests, for p50/p99 reporting.
+    """
+
+    def __init__(self, window=10000):
+        self.window = window
+        self.latencies = {}
+        self.counts = {}
+        self.errors = {}
+        self.lock = Lock()
+
+    def record(self, endpoint, seconds, error=False):
+        with self.lock:
+            if endpoint not in self.latencies:
+                self.latencies[endpoint] = deque(maxlen=self.window)
+                self.counts[endpoint] = 0
+                self.errors[endpoint] = 0
+            self.latencies[endpoint].append(seconds)
+            self.counts[endpoint] += 1
+            self.errors[endpoint] += error
+
+    def summary(self):
+        with self.lock:
+            snapshot = {endpoint: sorted(values) for endpoint, values in self.latencies.items()}
+            counts, errors = dict(self.counts), dict(self.errors)
+
+        return {
+            endpoint: {
+                'requests': counts[endpoint],
+                'errors': errors[endpoint],
+                'p50_ms': percentile(values, 0.50) * 1000,
+                'p99_ms': percentile(values, 0.99) * 1000,
+                'max_ms': values[-1] * 1000,
+            }
+            for endpoint, values in snapshot.items()
+        }
+
+
+class SavingsService:
+    """
+    Keeps the calculator, OCR engines and settings profiles loaded between
+    requests, so a lookup costs only the work itself.
+
+    OCR engines aren't shared safely between threads, so each worker
+    thread gets its own extractor (created on its first OCR request).
+    Captures are serialized: there is only one screen and hub window.
+    """
+
+    def __init__(self, profiles=None, extractor_factory=None, capture=None):
+        if extractor_factory is None:
+            from ocr_extractor import OCRExtractor
+            extractor_factory = OCRExtractor
+
+        self.profiles = load_profiles() if profiles is None else profiles
+        self.calculator = SavingsCalculator()
+        self.extractor_factory = extractor_factory
+        self.capture_device = capture
+        self.capture_lock = Lock()
+        self.thread_state = local()
+        self.latency = LatencyTracker()
+
+    def extractor(self):
+        extractor = getattr(self.thread_state, 'extractor', None)
+        if extractor is None:
+            extractor = self.thread_state.extractor = self.extractor_factory()
+        return extractor
+
+    def settings(self, request):
+        """
+        The named profile's settings with any overrides from the request.
+        """
+        name = request.get('profile', 'computer')
+        if name not in self.profiles:
+            raise RequestError(400, f"Unknown profile: {name}")
+
+        settings = dict(self.profiles[name])
+        try:
+            settings.update({key: kind(request[key]) for key, kind in SETTING_TYPES.items()
+                             if request.get(key) is not None})
+        except ValueError as e:
+            raise RequestError(400, f"Invalid setting: {e}")
+        return settings
+
+    def savings(self, words, wpm, request):
+        settings = self.settings(request)
+        if settings['subscription_type'] not in self.calculator.subscription_costs:
+            raise RequestError(400, f"Unknown subscription type: {settings['subscription_type']}")
+        # Written as `not ... > 0` so NaN is rejected too
+        if not settings['typing_wpm'] > 0:
+            raise RequestError(400, "typing_wpm must be positive")
+        for key in ('hourly_rate', 'daily_words'):
+            if not settings[key] >= 0:
+                raise RequestError(400, f"{key} must not be negative")
+
+        savings = self.calculator.calculate_complete_savings(
+            words,
+            wpm,
+            settings['typing_wpm'],
+            settings['subscription_type'],
+            settings['hourly_rate'],
+            settings['daily_words'],
+        )
+        return {'words': words, 'wpm': wpm, 'profile': request.get('profile', 'computer'), 'savings': savings}
+
+    def calc(self, request):
+        """
+        POST /calc {"words": 372, "wpm": 124, "profile": "computer", ...}
+        """
+        try:
+            words, wpm = int(request['words']), int(request['wpm'])
+        except (KeyError, TypeError, ValueError):
+            raise RequestError(400, "words and wpm must be given as integers")
+        if wpm <= 0:
+            raise RequestError(400, "wpm must be positive")
+        return self.savings(words, wpm, request)
+
+    def ocr(self, image_bytes, request):
+        """
+        POST /ocr with the stats image as the body (?profile=... to pick
+        the settings the savings are calculated with).
+        """
+        from PIL.Image import open
+        from PIL import UnidentifiedImageError
+
+        try:
+            image = open(BytesIO(image_bytes))
+            image.load()
+        except UnidentifiedImageError:
+            raise RequestError(400, "body is not an image")
+
+        words, wpm = self.extractor().extract_metrics(image)
+        if words is None or not wpm:
+            raise RequestError(422, "metrics not found in image")
+        return self.savings(words, wpm, request)
+
+    def capture(self, request):
+        """
+        POST /capture: grab the hub's stats region, read it and calculate.
+        """
+        with self.capture_lock:
+            if self.capture_device is None:
+                from window_capture import WindowCapture
+                from region_locator import RegionLocator
+                self.capture_device = WindowCapture(locator=RegionLocator())
+
+            capture = self.capture_device
+            if capture.wisprflow_window is None and not capture.find_wisprflow_window():
+                raise RequestError(404, "WisprFlow window not found")
+            try:
+                region = capture.capture_metrics_region()
+            except Exception:
+                # The hub closed or restarted since it was found; the old
+                # handle is stale, so look it up again and retry once
+                capture.wisprflow_window = None
+                if not capture.find_wisprflow_window():
+                    raise RequestError(404, "WisprFlow window not found")
+                region = capture.capture_metrics_region()
+
+        words, wpm = self.extractor().extract_metrics(region)
+        capture.report_read(words, wpm)
+        if words is None or not wpm:
+            raise RequestError(422, "metrics not found in capture")
+        return self.savings(words, wpm, request)
+
+    def stats(self, request):
+        return {'endpoints': self.latency.summary(), 'profiles': sorted(self.profiles)}
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    ROUTES = {
+        ('POST', '/calc'): 'calc',
+        ('POST', '/ocr'): 'ocr',
+        ('POST', '/capture'): 'capture',
+        ('GET', '/stats'): 'stats',
+        ('GET', '/health'): None,
+    }
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def dispatch(self, method):
+        start = perf_counter()
+        url = urlsplit(self.path)
+        service = self.server.service
+        if (method, url.path) not in self.ROUTES:
+            self.send_json(404, {'error': f"No route for {method} {url.path}"})
+            return
+
+        status = 200
+        try:
+            request = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            name = self.ROUTES[(method, url.path)]
+
+            if name is None:
+                response = {'status': 'ok'}
+            elif name == 'ocr':
+                response = service.ocr(body, request)
+            else:
+                if body:
+                    payload = loads(body)
+                    if not isinstance(payload, dict):
+                        raise RequestError(400, "JSON body must be an object")
+                    request.update(payload)
+                response = getattr(service, name)(request)
+        except RequestError as e:
+            status, response = e.status, {'error': str(e)}
+        except ValueError as e:
+            status, response = 400, {'error': f"Invalid JSON: {e}"}
+        except Exception as e:
+            status, response = 500, {'error': f"{type(e).__name__}: {e}"}
+
+        # Recorded before replying so /stats never lags behind a client
+        service.latency.record(url.path, perf_counter() - start, error=status >= 400)
+        self.send_json(status, response)
+
+    def send_json(self, status, response):
+        payload = dumps(json_safe(response)).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Per-request logging would dominate the cost of a /calc call
+        pass
+
+
+class SavingsServer(HTTPServer):
+    """
+    HTTP server that hands connections to a fixed pool of worker threads.
+    Once `workers + backlog` requests are in flight, the accept loop stops
+    taking new connections until one finishes, so overload queues in the
+    OS listen backlog instead of spawning threads without bound.
+    """
+
+    def __init__(self, address, service, workers=4, backlog=16):
+        self.service = service
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='savings')
+        self.slots = BoundedSemaphore(workers + backlog)
+        super().__init__(address, ServiceHandler)
+
+    def process_request(self, request, client_address):
+        self.slots.acquire()
+        self.pool.submit(self.process_request_worker, request, client_address)
+
+    def process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+def serve(host='127.0.0.1', port=8765, workers=4, service=None):
+    """
+    Run the service until interrupted.
+    """
+    server = SavingsServer((host, port), service or SavingsService(), workers)
+    print(f"🚀 Savings service on http://{host}:{server.server_address[1]} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,204 @@
+from datetime import datetime, timedelta
+from sqlite3 import connect
+from time import time
+
+PERIODS = ('day', 'week', 'month')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    timestamp REAL NOT NULL,
+    profile TEXT NOT NULL,
+    words INTEGER NOT NULL,
+    delta INTEGER NOT NULL,
+    wpm INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_by_profile ON observations (profile, timestamp);
+CREATE TABLE IF NOT EXISTS profiles (
+    profile TEXT PRIMARY KEY,
+    last_timestamp REAL NOT NULL,
+    last_words INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    profile TEXT NOT NULL,
+    period TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    words INTEGER NOT NULL,
+    wpm_words INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    PRIMARY KEY (profile, period, bucket)
+);
+"""
+
+UPSERT_TOTAL = """
+INSERT INTO totals (profile, period, bucket, words, wpm_words, samples) VALUES (?, ?, ?, ?, ?, 1)
+ON CONFLICT (profile, period, bucket) DO UPDATE SET
+    words = words + excluded.words,
+    wpm_words = wpm_words + excluded.wpm_words,
+    samples = samples + 1
+"""
+
+
+def period_buckets(timestamp):
+    """
+    Map a timestamp to its (day, week, month) bucket keys in local time.
+    Weeks start on Monday and are keyed by that Monday's date.
+    """
+    moment = datetime.fromtimestamp(timestamp)
+    day = moment.date()
+    return {
+        'day': day.isoformat(),
+        'week': (day - timedelta(days=day.weekday())).isoformat(),
+        'month': day.strftime('%Y-%m'),
+    }
+
+
+class SessionStore:
+    """
+    Append-only SQLite log of WisprFlow counter snapshots.
+
+    WisprFlow shows a cumulative word counter, so each snapshot is turned
+    into a delta against the previous snapshot of the same profile (a
+    counter that went down is treated as a reset). Daily, weekly and
+    monthly totals are updated in place on every insert, so queries read
+    a few hundred aggregate rows instead of rescanning observations.
+    """
+
+    def __init__(self, path='sessions.db'):
+        self.path = path
+        self.connection = connect(path)
+        self.connection.executescript(SCHEMA)
+
+    def record(self, words, wpm, profile='computer', timestamp=None):
+        """
+        Store one (words, wpm) snapshot.
+        Return: words added since the previous snapshot
+        """
+        with self.connection:
+            return self._record(words, wpm, profile, time() if timestamp is None else timestamp)
+
+    def record_many(self, observations, profile='computer'):
+        """
+        Store many (timestamp, words, wpm) snapshots in one transaction.
+        Return: total words added
+        """
+        with self.connection:
+            return sum(self._record(words, wpm, profile, timestamp) for timestamp, words, wpm in observations)
+
+    def _record(self, words, wpm, profile, timestamp):
+        row = self.connection.execute(
+            "SELECT last_words FROM profiles WHERE profile = ?", (profile,)
+        ).fetchone()
+
+        if row is None:
+            # First snapshot only sets the baseline
+            delta = 0
+        elif words >= row[0]:
+            delta = words - row[0]
+        else:
+            # Counter reset (new session or app restart)
+            delta = words
+
+        self.connection.execute(
+            "INSERT INTO observations (timestamp, profile, words, delta, wpm) VALUES (?, ?, ?, ?, ?)",
+            (timestamp, profile, words, delta, wpm),
+        )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO profiles (profile, last_timestamp, last_words) VALUES (?, ?, ?)",
+            (profile, timestamp, words),
+        )
+
+        if delta:
+            for period, bucket in period_buckets(timestamp).items():
+                self.connection.execute(UPSERT_TOTAL, (profile, period, bucket, delta, delta * wpm))
+
+        return delta
+
+    def totals(self, period='day', profile='computer', start=None, end=None):
+        """
+        Return the rolling totals for one period type, oldest first.
+        start/end are bucket keys (e.g. '2025-01-01', or '2025-01' for months).
+        Return: list of dicts with bucket, words, average wpm and samples
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+
+        query = "SELECT bucket, words, wpm_words, samples FROM totals WHERE profile = ? AND period = ?"
+        params = [profile, period]
+        if start is not None:
+            query += " AND bucket >= ?"
+            params.append(start)
+        if end is not None:
+            query += " AND bucket <= ?"
+            params.append(end)
+
+        rows = self.connection.execute(query + " ORDER BY bucket", params).fetchall()
+        return [
+            {'bucket': bucket, 'words': words, 'wpm': wpm_words / words if words else None, 'samples': samples}
+            for bucket, words, wpm_words, samples in rows
+        ]
+
+    def first_day(self, profile='computer'):
+        """
+        Local date of the profile's first snapshot (when tracking started).
+        Return: date, or None when nothing has been recorded
+        """
+        row = self.connection.execute(
+            "SELECT MIN(timestamp) FROM observations WHERE profile = ?", (profile,)
+        ).fetchone()
+        return datetime.fromtimestamp(row[0]).date() if row[0] is not None else None
+
+    def daily_words(self, profile='computer', days=30, today=None):
+        """
+        Words spoken on each calendar day of the last `days` days, oldest
+        first, with idle days as zero. A profile first recorded inside the
+        window only covers the days since its first snapshot.
+        Return: list of words per day (empty when nothing has been recorded)
+        """
+        today = today or datetime.now().date()
+        first_day = self.first_day(profile)
+        if first_day is None or first_day > today:
+            return []
+
+        start = max(today - timedelta(days=days - 1), first_day)
+        words = [0] * ((today - start).days + 1)
+        for row in self.totals('day', profile, start.isoformat(), today.isoformat()):
+            words[(datetime.strptime(row['bucket'], '%Y-%m-%d').date() - start).days] = row['words']
+        return words
+
+    def average_daily_words(self, profile='computer', days=30, today=None):
+        """
+        Average words per calendar day over the last `days` days, counting
+        idle days as zero (see daily_words).
+        Return: float, or None when nothing has been recorded
+        """
+        words = self.daily_words(profile, days, today)
+        return sum(words) / len(words) if words else None
+
+    def average_wpm(self, profile='computer', days=30, today=None):
+        """
+        Word-weighted average speaking WPM over the last `days` days.
+        Return: float, or None when nothing has been recorded
+        """
+        today = today or datetime.now().date()
+        start = today - timedelta(days=days - 1)
+        row = self.connection.execute(
+            "SELECT SUM(words), SUM(wpm_words) FROM totals "
+            "WHERE profile = ? AND period = 'day' AND bucket >= ? AND bucket <= ?",
+            (profile, start.isoformat(), today.isoformat()),
+        ).fetchone()
+        return row[1] / row[0] if row[0] else None
+
+    def measured_inputs(self, inputs, profile='computer', days=30):
+        """
+        Return a copy of an inputs dict (as in computer_inputs.json) with
+        daily_words replaced by the measured average (rounded to whole
+        words), when there is one.
+        """
+        measured = dict(inputs)
+        daily_words = self.average_daily_words(profile, days)
+        if daily_words:
+            measured['daily_words'] = round(daily_words)
+        return measured
+
+    def close(self):
+        self.connection.close()
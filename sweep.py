@@ -0,0 +1,147 @@
+from csv import writer
+from os.path import join
+import numpy as np
+
+from calculator import SavingsCalculator
+
+GRID_METRICS = ('words_to_break_even', 'minutes_to_break_even', 'net_annual_savings')
+
+
+class SavingsSweep:
+    """
+    Dense parameter sweep of break-even and annual savings over
+    typing WPM x speaking WPM x hourly rate x subscription type.
+
+    Grids are indexed [typing, speaking, hourly_rate, subscription].
+    """
+
+    def __init__(self, typing_wpm, speaking_wpm, hourly_rate, subscription_types=None, daily_words=500, calculator=None):
+        self.calculator = calculator or SavingsCalculator()
+        self.typing_wpm = np.asarray(typing_wpm, dtype=float).ravel()
+        self.speaking_wpm = np.asarray(speaking_wpm, dtype=float).ravel()
+        self.hourly_rate = np.asarray(hourly_rate, dtype=float).ravel()
+        self.subscription_types = list(subscription_types or self.calculator.subscription_costs)
+        self.daily_words = float(daily_words)
+
+        # Per-axis terms, computed once and broadcast for every chunk
+        self.monthly_cost = np.array([self.calculator.subscription_costs[t] for t in self.subscription_types])
+        self.rate_per_minute = self.hourly_rate / 60
+        self.speaking_minutes_per_word = 1 / self.speaking_wpm
+        self.daily_speaking_minutes = self.daily_words / self.speaking_wpm
+
+    @property
+    def shape(self):
+        return (len(self.typing_wpm), len(self.speaking_wpm), len(self.hourly_rate), len(self.subscription_types))
+
+    def compute(self):
+        """
+        Compute the full grid in one go.
+        Return: dict of metric name -> array of shape self.shape
+        """
+        return self._compute_rows(slice(None))
+
+    def iter_chunks(self, max_cells=1_000_000):
+        """
+        Yield (typing_slice, grid_chunk) pairs covering the whole grid.
+
+        Chunks split the typing axis so each holds at most max_cells cells
+        (but always at least one typing row), keeping memory bounded.
+        """
+        _, n_speaking, n_rates, n_types = self.shape
+        rows_per_chunk = max(1, max_cells // max(1, n_speaking * n_rates * n_types))
+
+        for start in range(0, len(self.typing_wpm), rows_per_chunk):
+            rows = slice(start, min(start + rows_per_chunk, len(self.typing_wpm)))
+            yield rows, self._compute_rows(rows)
+
+    def _compute_rows(self, rows):
+        typing_wpm = self.typing_wpm[rows][:, None, None, None]
+        speaking_wpm = self.speaking_wpm[None, :, None, None]
+        rate_per_minute = self.rate_per_minute[None, None, :, None]
+        monthly_cost = self.monthly_cost[None, None, None, :]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # (typing, speaking) plane, shared by every rate and tier
+            time_saved_per_word = 1 / typing_wpm - self.speaking_minutes_per_word[None, :, None, None]
+            daily_time_saved = self.daily_words / typing_wpm - self.daily_speaking_minutes[None, :, None, None]
+
+            value_saved_per_word = time_saved_per_word * rate_per_minute
+            breaks_even = value_saved_per_word > 0
+            words_to_break_even = np.where(breaks_even, monthly_cost / value_saved_per_word, np.inf)
+            minutes_to_break_even = np.where(breaks_even, words_to_break_even / speaking_wpm, np.inf)
+
+            annual_value_saved = daily_time_saved * rate_per_minute * 365.25
+            net_annual_savings = annual_value_saved - monthly_cost * 12
+
+        return {
+            'words_to_break_even': words_to_break_even,
+            'minutes_to_break_even': minutes_to_break_even,
+            'net_annual_savings': net_annual_savings,
+        }
+
+    def export_npy(self, directory, max_cells=1_000_000):
+        """
+        Stream the grid into one .npy file per metric, plus the axis values,
+        so heatmaps can np.load(..., mmap_mode='r') without recomputing.
+        Return: list of written file paths
+        """
+        paths = {metric: join(directory, f"{metric}.npy") for metric in GRID_METRICS}
+        outputs = {
+            metric: np.lib.format.open_memmap(path, mode='w+', dtype=float, shape=self.shape)
+            for metric, path in paths.items()
+        }
+
+        for rows, chunk in self.iter_chunks(max_cells):
+            for metric, values in chunk.items():
+                outputs[metric][rows] = values
+
+        for output in outputs.values():
+            output.flush()
+        del outputs
+
+        axes_path = join(directory, "axes.npz")
+        np.savez(
+            axes_path,
+            typing_wpm=self.typing_wpm,
+            speaking_wpm=self.speaking_wpm,
+            hourly_rate=self.hourly_rate,
+            subscription_type=np.array(self.subscription_types),
+        )
+        return list(paths.values()) + [axes_path]
+
+    def export_csv(self, path, max_cells=1_000_000):
+        """
+        Stream the grid to a long-format CSV (one row per grid cell).
+        """
+        _, n_speaking, n_rates, n_types = self.shape
+        types = np.array(self.subscription_types)
+
+        with open(path, 'w', newline='') as f:
+            csv_writer = writer(f)
+            csv_writer.writerow(['typing_wpm', 'speaking_wpm', 'hourly_rate', 'subscription_type', *GRID_METRICS])
+
+            for rows, chunk in self.iter_chunks(max_cells):
+                n_rows = len(self.typing_wpm[rows])
+                t, s, h, k = np.indices((n_rows, n_speaking, n_rates, n_types)).reshape(4, -1)
+                csv_writer.writerows(zip(
+                    self.typing_wpm[rows][t].tolist(),
+                    self.speaking_wpm[s].tolist(),
+                    self.hourly_rate[h].tolist(),
+                    types[k].tolist(),
+                    *(chunk[metric].ravel().tolist() for metric in GRID_METRICS),
+                ))
+
+
+if __name__ == "__main__":
+    sweep = SavingsSweep(
+        typing_wpm = np.arange(30, 131, 5),
+        speaking_wpm = np.arange(80, 201, 5),
+        hourly_rate = np.arange(15, 151, 5),
+    )
+    grid = sweep.compute()
+    print(f"Grid shape {sweep.shape} ({np.prod(sweep.shape):,} cells)")
+
+    best = np.unravel_index(np.argmax(grid['net_annual_savings']), sweep.shape)
+    print(f"Best case: typing {sweep.typing_wpm[best[0]]:.0f} WPM, speaking {sweep.speaking_wpm[best[1]]:.0f} WPM, "
+          f"${sweep.hourly_rate[best[2]]:.2f}/h on {sweep.subscription_types[best[3]]}: "
+          f"${grid['net_annual_savings'][best]:,.2f} net per year")
@@ -0,0 +1,58 @@
+from os import makedirs
+
+from batch import iter_images, read_results, run_batch, summarize
+from digit_recognizer import DigitRecognizer
+from benchmarks.synthetic import make_corpus
+
+SETTINGS = {'typing_wpm': 90, 'subscription_type': 'student', 'hourly_rate': 50.49, 'daily_words': 500}
+
+
+def make_archive(root):
+    """
+    Two readable stats crops, one corrupt image, a non-image file and a
+    directory whose name matches the glob.
+    Return: (archive directory, templates path, {file name: (words, wpm)})
+    """
+    archive = root / 'archive'
+    makedirs(archive / 'nested.png')
+    truth = {}
+    for i, (image, words, wpm) in enumerate(make_corpus(2, seed=5)):
+        image.save(archive / f'shot{i}.png')
+        truth[f'shot{i}.png'] = (words, wpm)
+    (archive / 'broken.png').write_bytes(b'not an image')
+    (archive / 'notes.txt').write_text('not an image either')
+
+    templates = root / 'digits.npz'
+    recognizer = DigitRecognizer(str(templates))
+    for image, words, wpm in make_corpus(30, seed=1):
+        recognizer.learn(image, words, wpm)
+    return archive, str(templates), truth
+
+
+def test_iter_images_skips_directories_and_other_files(tmp_path):
+    archive, _, _ = make_archive(tmp_path)
+
+    names = [path.rsplit('/', 1)[-1] for path in iter_images([str(archive / '*')])]
+    assert sorted(names) == ['broken.png', 'shot0.png', 'shot1.png']
+    assert [path.rsplit('/', 1)[-1] for path in iter_images([str(archive)])] == ['broken.png', 'shot0.png', 'shot1.png']
+
+
+def test_resume_skips_processed_images_and_counts_failures_once(tmp_path):
+    archive, templates, truth = make_archive(tmp_path)
+    output = str(tmp_path / 'results.jsonl')
+    sources = [str(archive / '*.png'), str(tmp_path / 'missing.png')]
+
+    counts = run_batch(sources, output, SETTINGS, workers=1, crop=False, templates=templates)
+    assert counts == {'processed': 2, 'skipped': 0, 'failed': 2}
+
+    counts = run_batch(sources, output, SETTINGS, workers=1, crop=False, templates=templates)
+    assert counts == {'processed': 0, 'skipped': 2, 'failed': 2}
+
+    rows = list(read_results(output))
+    read = {row['path'].rsplit('/', 1)[-1]: (row['words'], row['wpm']) for row in rows if not row['error']}
+    assert read == truth
+
+    summary = summarize(rows)
+    assert summary['images'] == 2
+    assert summary['failed'] == 2
+    assert summary['words'] == sum(words for words, _ in truth.values())
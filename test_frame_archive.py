@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from frame_archive import FrameArchive, FrameArchiveWriter, ReplayCapture, record
+
+
+def frame(value, height=6, width=8):
+    return np.full((height, width, 3), value, dtype=np.uint8)
+
+
+def write(path, count, capacity=2, start=0, append=False):
+    writer = FrameArchiveWriter(str(path), capacity=capacity, append=append)
+    for i in range(start, start + count):
+        writer.append(frame(i), timestamp=1000.0 + i)
+    writer.close()
+    return writer
+
+
+def test_writer_grows_past_its_capacity(tmp_path):
+    path = tmp_path / 'frames.wfa'
+    writer = write(path, 5, capacity=2)
+    assert writer.layout.capacity == 8
+
+    archive = FrameArchive(str(path))
+    assert len(archive) == 5
+    assert [int(pixels[0, 0, 0]) for _, pixels in archive] == [0, 1, 2, 3, 4]
+    assert list(archive.timestamps) == [1000.0, 1001.0, 1002.0, 1003.0, 1004.0]
+
+
+def test_smaller_frames_keep_their_size(tmp_path):
+    path = tmp_path / 'frames.wfa'
+    writer = FrameArchiveWriter(str(path))
+    writer.append(frame(1))
+    writer.append(frame(2, height=4, width=5))
+    with pytest.raises(ValueError):
+        writer.append(frame(3, height=7))
+    writer.close()
+
+    archive = FrameArchive(str(path))
+    assert archive.frame(0).shape == (6, 8, 3)
+    assert archive.frame(1).shape == (4, 5, 3)
+
+
+def test_enlarged_slots_keep_earlier_frames(tmp_path):
+    path = tmp_path / 'frames.wfa'
+    writer = FrameArchiveWriter(str(path))
+    writer.append(frame(1))
+    writer.enlarge(7, 10)
+    writer.append(frame(2, height=7, width=10))
+    writer.close()
+
+    archive = FrameArchive(str(path))
+    assert (archive.layout.height, archive.layout.width) == (7, 10)
+    assert archive.frame(0).shape == (6, 8, 3) and int(archive.frame(0)[5, 7, 0]) == 1
+    assert archive.frame(1).shape == (7, 10, 3)
+
+
+def test_reopened_writer_appends(tmp_path):
+    path = tmp_path / 'frames.wfa'
+    write(path, 3, capacity=2)
+    write(path, 3, start=3, append=True)
+
+    archive = FrameArchive(str(path))
+    assert len(archive) == 6
+    assert [int(archive.frame(i)[0, 0, 0]) for i in range(6)] == [0, 1, 2, 3, 4, 5]
+    assert archive.position_at(1003.5) == 3
+
+    write(path, 1)
+    assert len(FrameArchive(str(path))) == 1
+
+
+def test_replay_serves_frames_with_their_recording_time(tmp_path):
+    path = tmp_path / 'frames.wfa'
+    write(path, 3)
+
+    replay = ReplayCapture(str(path))
+    assert replay.find_wisprflow_window()
+    values = []
+    while (pixels := replay.capture_metrics_array()) is not None:
+        values.append((int(pixels[0, 0, 0]), replay.captured_at))
+    assert values == [(0, 1000.0), (1, 1001.0), (2, 1002.0)]
+    assert replay.exhausted and not replay.find_wisprflow_window()
+
+    looped = ReplayCapture(str(path), loop=True)
+    assert [int(looped.capture_metrics_array()[0, 0, 0]) for _ in range(4)] == [0, 1, 2, 0]
+
+
+class FlakyCapture:
+    """
+    Live-capture stand-in: the window's handle goes stale once, then it
+    comes back larger (as after a resize).
+    """
+
+    def __init__(self):
+        self.wisprflow_window = None
+        self.sizes = [(6, 8), None, (9, 12)]
+
+    def find_wisprflow_window(self):
+        self.wisprflow_window = object()
+        return True
+
+    def capture_metrics_region(self, leave_window_state=True):
+        size = self.sizes.pop(0) if len(self.sizes) > 1 else self.sizes[0]
+        if size is None:
+            raise RuntimeError("stale window handle")
+        return frame(len(self.sizes), *size)
+
+
+def test_record_survives_stale_windows_and_resizes(tmp_path):
+    path = tmp_path / 'frames.wfa'
+    assert record(FlakyCapture(), str(path), frames=3, interval=0) == 3
+
+    archive = FrameArchive(str(path))
+    assert [archive.frame(i).shape for i in range(3)] == [(6, 8, 3), (9, 12, 3), (9, 12, 3)]
@@ -0,0 +1,88 @@
+import numpy as np
+from PIL.Image import fromarray
+
+from ocr_cache import OCRCache
+
+
+def stats_image(value, noise=()):
+    """
+    Black image with `value` white columns, plus optional flipped pixels.
+    """
+    pixels = np.zeros((20, 40), dtype=np.uint8)
+    pixels[:, :value] = 255
+    for row, column in noise:
+        pixels[row, column] = 255 - pixels[row, column]
+    return fromarray(pixels)
+
+
+def test_exact_hit_and_miss():
+    cache = OCRCache()
+    cache.put(cache.key(stats_image(5)), (372, 124))
+
+    assert cache.get(cache.key(stats_image(5))) == (372, 124)
+    assert cache.get(cache.key(stats_image(6))) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_evicts_least_recently_used():
+    cache = OCRCache(max_entries=2)
+    first, second, third = (cache.key(stats_image(value)) for value in (1, 2, 3))
+    cache.put(first, (1, 1))
+    cache.put(second, (2, 2))
+    cache.get(first)
+    cache.put(third, (3, 3))
+
+    assert cache.get(second) is None
+    assert cache.get(first) == (1, 1)
+    assert cache.get(third) == (3, 3)
+
+
+def test_perceptual_near_match_survives_interleaved_keys():
+    cache = OCRCache(mode='perceptual', max_pixel_diff=2)
+    original = cache.key(stats_image(10))
+    # Another frame keyed between key() and put() must not matter
+    cache.key(stats_image(30))
+    cache.put(original, (372, 124))
+
+    near = cache.key(stats_image(10, noise=[(3, 20)]))
+    cache.key(stats_image(30))
+    assert cache.get(near) == (372, 124)
+    assert cache.get(cache.key(stats_image(20))) is None
+
+
+def test_perceptual_entries_persist(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = OCRCache(mode='perceptual', path=str(path))
+    cache.put(cache.key(stats_image(10)), (372, 124))
+
+    reloaded = OCRCache(mode='perceptual', path=str(path))
+    assert reloaded.get(reloaded.key(stats_image(10, noise=[(0, 0)]))) == (372, 124)
+
+
+class CountingBackend:
+    """
+    OCR backend stand-in that reads the white column count back and
+    remembers how many images it was given.
+    """
+
+    def __init__(self):
+        self.images = 0
+
+    def batch_to_text(self, images):
+        self.images += len(images)
+        return [f"{int((np.asarray(image)[0] > 0).sum())} words\n124 WPM" for image in images]
+
+
+def test_batch_reads_only_cache_misses():
+    from ocr_extractor import OCRExtractor
+
+    backend = CountingBackend()
+    extractor = OCRExtractor(cache=OCRCache(), backend=backend)
+    extractor.cache.put(extractor.cache.key(stats_image(5)), (5, 124))
+
+    images = [stats_image(5), stats_image(7), stats_image(7), stats_image(9)]
+    assert extractor.extract_metrics_batch(images) == [(5, 124), (7, 124), (7, 124), (9, 124)]
+    assert backend.images == 2
+
+    assert extractor.extract_metrics_batch(images) == [(5, 124), (7, 124), (7, 124), (9, 124)]
+    assert backend.images == 2
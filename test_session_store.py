@@ -0,0 +1,59 @@
+from datetime import date, datetime, timedelta
+
+from session_store import SessionStore
+
+
+def noon(day):
+    return datetime(day.year, day.month, day.day, 12).timestamp()
+
+
+TODAY = date(2025, 3, 10)
+
+
+def test_deltas_and_totals():
+    store = SessionStore(':memory:')
+    assert store.record(100, 120, timestamp=noon(TODAY)) == 0
+    assert store.record(250, 130, timestamp=noon(TODAY) + 60) == 150
+    # The counter went down: a new session started from zero
+    assert store.record(40, 110, timestamp=noon(TODAY) + 120) == 40
+
+    (day,) = store.totals('day')
+    assert day['bucket'] == TODAY.isoformat()
+    assert day['words'] == 190
+    assert day['wpm'] == (150 * 130 + 40 * 110) / 190
+    assert store.totals('month')[0]['bucket'] == '2025-03'
+    assert store.totals('day', 'mobile') == []
+
+
+def test_average_counts_idle_days_in_the_whole_window():
+    store = SessionStore(':memory:')
+    store.record(0, 120, timestamp=noon(TODAY - timedelta(days=20)))
+    store.record(1000, 120, timestamp=noon(TODAY - timedelta(days=2)))
+
+    assert store.daily_words(days=6, today=TODAY) == [0, 0, 0, 1000, 0, 0]
+    assert store.average_daily_words(days=6, today=TODAY) == 1000 / 6
+
+
+def test_average_of_a_new_profile_starts_at_its_first_snapshot():
+    store = SessionStore(':memory:')
+    store.record(0, 120, timestamp=noon(TODAY - timedelta(days=1)))
+    store.record(600, 120, timestamp=noon(TODAY - timedelta(days=1)) + 60)
+
+    assert store.daily_words(days=30, today=TODAY) == [600, 0]
+    assert store.average_daily_words(days=30, today=TODAY) == 300
+
+
+def test_average_without_readings():
+    store = SessionStore(':memory:')
+    assert store.average_daily_words(today=TODAY) is None
+    assert store.average_wpm(today=TODAY) is None
+
+
+def test_measured_inputs_prefers_the_measured_average():
+    store = SessionStore(':memory:')
+    inputs = {'typing_wpm': 90, 'daily_words': 500}
+    assert store.measured_inputs(inputs) == inputs
+
+    store.record(0, 120)
+    store.record(700, 120)
+    assert store.measured_inputs(inputs)['daily_words'] == 700
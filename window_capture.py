@@ -1,18 +1,52 @@
 from mss import mss
-from pygetwindow import getAllWindows
 from PIL.Image import frombytes
+import numpy as np
+
+from profiler import span
+
+def monitor_for(window, monitors):
+    """
+    Index of the mss monitor (1-based; 0 is the whole virtual screen) that
+    contains the window's centre, falling back to the primary monitor.
+    """
+    center_x = window.left + window.width // 2
+    center_y = window.top + window.height // 2
+
+    for index, monitor in enumerate(monitors[1:], start=1):
+        if (monitor['left'] <= center_x < monitor['left'] + monitor['width']
+                and monitor['top'] <= center_y < monitor['top'] + monitor['height']):
+            return index
+    return 1
 
 class WindowCapture:
-    def __init__(self):
+    def __init__(self, screen_factory=mss, window_enumerator=None, locator=None):
         self.wisprflow_window = None
+        # Returns an mss-like context manager; swap in a fake for tests/benchmarks
+        self.screen_factory = screen_factory
+        # Returns the on-screen windows; defaults to pygetwindow.getAllWindows,
+        # imported on first use since pygetwindow only supports Windows/macOS
+        self.window_enumerator = window_enumerator
+        # Optional RegionLocator; calibrated boxes replace the fixed fractions
+        self.locator = locator
+        # Size and scaling of the monitor the window was last captured on
+        self.screen_size = None
+        self.scale = None
+        # Scaling factor per mss monitor index, looked up once each
+        self.scales = {}
+        self.last_layout_key = None
     
     def find_wisprflow_window(self):
         """
         Find the WisprFlow window by searchign for windows
         that contain 'Wispr Flow' in the title.
         """
+        if self.window_enumerator is None:
+            from pygetwindow import getAllWindows
+            self.window_enumerator = getAllWindows
+
         # Get all of the windows on the screen
-        windows = getAllWindows()
+        with span('capture.find_window'):
+            windows = self.window_enumerator()
 
         for window in windows:
             if window.title == "Hub": # This is WisprFlow's window title
@@ -20,29 +54,93 @@ class WindowCapture:
                 return True
     
         return False
+
+    def find_wisprflow_windows(self):
+        """
+        Find every WisprFlow window, not just the first.
+        Return: list of (window, monitor index) pairs, where the index is
+                into mss's monitors list (1 = primary)
+        """
+        if self.window_enumerator is None:
+            from pygetwindow import getAllWindows
+            self.window_enumerator = getAllWindows
+
+        windows = [window for window in self.window_enumerator() if window.title == "Hub"]
+        if not windows:
+            return []
+
+        with self.screen_factory() as sct:
+            monitors = sct.monitors
+        return [(window, monitor_for(window, monitors)) for window in windows]
     
-    def capture_window(self):
+    def grab_screen(self):
         """
-        Capture a screenshot of the WisprFlow window.
-        Return: PIL Image object
+        Bring the WisprFlow window up and grab the monitor it is on.
+        Return: mss ScreenShot (raw BGRA buffer)
         """
-        self.wisprflow_window.activate()
-        self.wisprflow_window.maximize()
+        with span('capture.activate'):
+            self.wisprflow_window.activate()
+            self.wisprflow_window.maximize()
 
-        with mss() as sct:
+        with span('capture.grab'), self.screen_factory() as sct:
             monitor = sct.monitors[1]
             screenshot = sct.grab(monitor)
-            img = frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
         
-        self.wisprflow_window.minimize()
+        with span('capture.minimize'):
+            self.wisprflow_window.minimize()
 
-        return img
-    
-    def capture_top_right_region(self, img):
+        return screenshot
+
+    def capture_window(self):
         """
-        Extract the top-right region where the metrics are displayed.
+        Capture a screenshot of the WisprFlow window.
+        Return: PIL Image object
+        """
+        screenshot = self.grab_screen()
+        with span('capture.frombytes'):
+            return frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+
+    def capture_window_array(self):
+        """
+        Capture a screenshot of the WisprFlow window without converting it.
+        Return: (height, width, 4) uint8 BGRA NumPy view over the mss buffer
+        """
+        screenshot = self.grab_screen()
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+
+    def layout_key(self, width, height):
         """
-        width, height = img.size
+        Layout cache key for a window (or screenshot) of the given size on
+        the monitor it was last captured on, or None before that is known.
+        """
+        if self.screen_size is None:
+            return None
+        return self.locator.layout_key(self.screen_size, self.scale, (width, height))
+
+    def use_monitor(self, monitors):
+        """
+        Take the screen size and scaling of the monitor the window is on,
+        so each monitor's resolution and DPI get their own layouts.
+        """
+        index = monitor_for(self.wisprflow_window, monitors)
+        monitor = monitors[index]
+        if index not in self.scales:
+            from region_locator import display_scale
+            self.scales[index] = display_scale(monitor)
+        self.screen_size = (monitor['width'], monitor['height'])
+        self.scale = self.scales[index]
+
+    def metrics_box(self, width, height):
+        """
+        Compute the (left, top, right, bottom) box of the metrics region
+        for a screenshot of the given size: the calibrated box for this
+        layout if there is one, otherwise fixed fractions of the size.
+        """
+        if self.locator is not None:
+            self.last_layout_key = self.layout_key(width, height)
+            box = self.locator.get(self.last_layout_key)
+            if box is not None:
+                return box
 
         # Rough estimates of the top-right region
         right_start = int(width * 0.6825)
@@ -50,42 +148,144 @@ class WindowCapture:
         right_end = int(width * 0.83)
         region_height = int(height * 0.1)
 
-        # Crop the image
-        region = img.crop((
-            right_start,
-            top_start,
-            right_end,
-            top_start + region_height
-        ))
+        return (right_start, top_start, right_end, top_start + region_height)
+
+    def window_metrics_rect(self):
+        """
+        Compute the absolute screen rectangle of the metrics region from
+        the WisprFlow window's geometry.
+        Return: mss monitor dict (left, top, width, height)
+        """
+        window = self.wisprflow_window
+        left, top, right, bottom = self.metrics_box(window.width, window.height)
+
+        return {
+            'left': window.left + left,
+            'top': window.top + top,
+            'width': right - left,
+            'height': bottom - top,
+        }
+
+    def capture_metrics_region(self, leave_window_state=True):
+        """
+        Grab only the metrics region instead of the whole monitor.
+
+        If the window is already on screen and leave_window_state is True,
+        it is not activated, maximized or minimized (it should be
+        unobstructed). Otherwise it is brought up maximized, grabbed and
+        minimized again, like capture_window.
+        Return: PIL Image object
+        """
+        window = self.wisprflow_window
+        toggle_window = not leave_window_state or window.isMinimized
+
+        if toggle_window:
+            with span('capture.activate'):
+                window.activate()
+                window.maximize()
+
+        with self.screen_factory() as sct:
+            if self.locator is not None:
+                self.use_monitor(sct.monitors)
+                key = self.layout_key(window.width, window.height)
+                if self.locator.should_calibrate(key):
+                    with span('capture.calibrate'):
+                        try:
+                            self.calibrate(sct)
+                        except Exception as e:
+                            # Fall back to the fixed fractions for now
+                            self.locator.calibration_failed(key, e)
+
+            with span('capture.grab'):
+                screenshot = sct.grab(self.window_metrics_rect())
+
+        if toggle_window:
+            with span('capture.minimize'):
+                window.minimize()
+
+        with span('capture.frombytes'):
+            return frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+
+    def calibrate(self, sct):
+        """
+        Grab the whole (visible) window and let the locator find the metrics
+        in it; the box is cached relative to the window for this layout.
+        Return: the box, or None if the metrics weren't found
+        """
+        window = self.wisprflow_window
+        bounds = sct.monitors[0]
+
+        # Keep the grab on screen (maximized windows overhang the edges)
+        left = max(window.left, bounds['left'])
+        top = max(window.top, bounds['top'])
+        right = min(window.left + window.width, bounds['left'] + bounds['width'])
+        bottom = min(window.top + window.height, bounds['top'] + bounds['height'])
+
+        screenshot = sct.grab({'left': left, 'top': top, 'width': right - left, 'height': bottom - top})
+        image = frombytes("RGB", screenshot.size, screenshot.bgra, "raw", "BGRX")
+
+        key = self.layout_key(window.width, window.height)
+        return self.locator.calibrate(key, image, offset=(left - window.left, top - window.top))
+
+    def report_read(self, words, wpm):
+        """
+        Tell the locator whether the last capture produced a valid read, so
+        a layout that stopped working gets recalibrated.
+        """
+        if self.locator is not None and self.last_layout_key is not None:
+            self.locator.record_read(self.last_layout_key, words is not None and bool(wpm))
+
+    def capture_top_right_region(self, img):
+        """
+        Extract the top-right region where the metrics are displayed.
+        Accepts a PIL Image or a BGRA array from capture_window_array;
+        only the cropped pixels are converted to RGB.
+        Return: PIL Image object
+        """
+        with span('capture.crop'):
+            if isinstance(img, np.ndarray):
+                height, width = img.shape[:2]
+                left, top, right, bottom = self.metrics_box(width, height)
+                region = np.ascontiguousarray(img[top:bottom, left:right])
+                return frombytes("RGB", (right - left, bottom - top), region, "raw", "BGRX")
+
+            width, height = img.size
+
+            # Crop the image
+            region = img.crop(self.metrics_box(width, height))
 
         return region
     
-def test_window_capture():
-    """Test the window capture functionality."""
-    capture = WindowCapture()
+def test_window_capture(save_path=None, region_only=True, capture=None):
+    """
+    Test the window capture functionality.
+    region_only grabs just the metrics rectangle (see capture_metrics_region);
+    otherwise the full monitor is grabbed and cropped.
+    Return: PIL Image of the stats region (or None if the window is missing)
+    """
+    capture = capture or WindowCapture()
 
     if capture.find_wisprflow_window():
         print("WisprFlow window found.")
-        # Capture the screenshot
-        screenshot = capture.capture_window()
+        if region_only:
+            region = capture.capture_metrics_region()
+        else:
+            # Capture the screenshot straight into memory
+            screenshot = capture.capture_window_array()
 
-        # # Save for debugging
-        # screenshot.save("debug_screenshot.png")
-        # print("Debug screenshot saved to debug_screenshot.png")
+            # Extract top-right region
+            region = capture.capture_top_right_region(screenshot)
 
-        # Extract top-right region
-        region = capture.capture_top_right_region(screenshot)
-
-        # Save for debugging
-        filename = "stats.png"
-        region.save(filename)
-        print(f"Stats region saved to {filename}")
+        # Save for debugging (opt-in; OCR works on the in-memory region)
+        if save_path:
+            with span('capture.save_png'):
+                region.save(save_path)
+            print(f"Stats region saved to {save_path}")
         
-        return filename
+        return region
 
     print("WisprFlow window not found.")
     return None
 
 if __name__ == "__main__":
-    test_window_capture()
-    
\ No newline at end of file
+    test_window_capture(save_path="stats.png")